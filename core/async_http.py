@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Minimal asyncio HTTP/1.1 client
+Keep-alive connection pool with per-host concurrency and rate limits
+"""
+
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) netrunner"
+
+class AsyncResponse:
+    __slots__ = ('url', 'status', 'reason', 'headers', 'body', 'length', 'elapsed')
+
+    def __init__(self, url, status, reason, headers, body, length, elapsed):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers      # lower-cased names
+        self.body = body            # first max_body bytes only
+        self.length = length        # total body bytes received
+        self.elapsed = elapsed
+
+class RateLimiter:
+    """Token bucket - at most rate requests per second, bursting to burst"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AsyncHTTPPool:
+    def __init__(self, per_host=32, timeout=10, rate_limit=None, headers=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.headers = {'User-Agent': USER_AGENT, 'Accept': '*/*'}
+        self.headers.update(headers or {})
+
+        self._idle = {}         # (scheme, host, port) -> [(reader, writer)]
+        self._slots = {}        # (scheme, host, port) -> Semaphore
+        self._limiters = {}     # (scheme, host, port) -> RateLimiter
+        self._ssl = ssl.create_default_context()
+        self._ssl.check_hostname = False
+        self._ssl.verify_mode = ssl.CERT_NONE
+
+        self.stats = {'requests': 0, 'errors': 0, 'connections': 0, 'bytes': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def fetch(self, method, url, headers=None, max_body=65536, on_chunk=None, on_headers=None, body=None):
+        """Send one request, reusing an idle keep-alive connection where possible
+
+        on_headers(status, headers) runs before the body is read; on_chunk sees every body chunk.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots.setdefault(key, asyncio.Semaphore(self.per_host))
+
+        async with slots:
+            if self.rate_limit:
+                limiter = self._limiters.get(key)
+                if limiter is None:
+                    limiter = self._limiters.setdefault(key, RateLimiter(self.rate_limit))
+                await limiter.wait()
+
+            request = self._build_request(method, path, parts.netloc, headers, body)
+
+            # A pooled connection may have been closed by the server - retry once on a fresh one
+            for attempt in range(2):
+                reused, conn = await self._connect(key)
+                started = time.monotonic()
+                try:
+                    response, keep = await asyncio.wait_for(
+                        self._exchange(conn, request, method, max_body, on_chunk, on_headers), self.timeout
+                    )
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                    conn[1].close()
+                    if reused and attempt == 0:
+                        continue
+                    self.stats['errors'] += 1
+                    raise
+
+                status, reason, resp_headers, body, length = response
+                self.stats['requests'] += 1
+                self.stats['bytes'] += length
+
+                if keep:
+                    self._idle.setdefault(key, []).append(conn)
+                else:
+                    conn[1].close()
+
+                return AsyncResponse(url, status, reason, resp_headers, body, length,
+                                     time.monotonic() - started)
+
+    def _build_request(self, method, path, host, headers, body=None):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        if body is not None:
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            merged['Content-Length'] = len(body)
+        lines.extend(f"{name}: {value}" for name, value in merged.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+    async def _connect(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return True, (reader, writer)
+            writer.close()
+
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host, port,
+                ssl=self._ssl if scheme == 'https' else None,
+                server_hostname=host if scheme == 'https' else None
+            ),
+            self.timeout
+        )
+        self.stats['connections'] += 1
+        return False, (reader, writer)
+
+    async def _exchange(self, conn, request, method, max_body, on_chunk, on_headers):
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+
+        head = await reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        version, status, *reason = status_line.split(' ', 2)
+        status = int(status)
+
+        headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if on_headers:
+            on_headers(status, headers)
+
+        kept = bytearray()
+        received = 0
+
+        def _consume(chunk):
+            nonlocal received
+            received += len(chunk)
+            if len(kept) < max_body:
+                kept.extend(chunk[:max_body - len(kept)])
+            if on_chunk:
+                on_chunk(chunk)
+
+        keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size_line = await reader.readuntil(b'\r\n')
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Skip trailers
+                    while (await reader.readuntil(b'\r\n')) != b'\r\n':
+                        pass
+                    break
+                _consume(await reader.readexactly(size))
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, 65536))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+                _consume(chunk)
+                remaining -= len(chunk)
+        else:
+            # Body delimited by connection close
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                _consume(chunk)
+            keep_alive = False
+
+        return (status, reason[0] if reason else '', headers, bytes(kept), received), keep_alive
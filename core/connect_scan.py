@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Native TCP connect scanner
+asyncio backend for hosts without nmap, with adaptive concurrency
+"""
+
+import asyncio
+import time
+from core.scan_model import Host, Port, Service, ScanResult
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Widest probe window, and file descriptors kept free for everything else in the process
+DEFAULT_MAX_CONCURRENCY = 4000
+FD_HEADROOM = 256
+
+# nmap's -F port set (top 100 TCP ports)
+TOP_PORTS = [
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113,
+    119, 135, 139, 143, 144, 179, 199, 389, 427, 443, 444, 445, 465, 513, 514,
+    515, 543, 544, 548, 554, 587, 631, 646, 873, 990, 993, 995, 1025, 1026,
+    1027, 1028, 1029, 1110, 1433, 1720, 1723, 1755, 1900, 2000, 2001, 2049,
+    2121, 2717, 3000, 3128, 3306, 3389, 3986, 4899, 5000, 5009, 5051, 5060,
+    5101, 5190, 5357, 5432, 5631, 5666, 5800, 5900, 6000, 6001, 6646, 7070,
+    8000, 8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999, 10000, 32768, 49152,
+    49153, 49154, 49155, 49156, 49157
+]
+
+# Port -> service guesses, matching nmap's names so analysis rules still apply
+SERVICE_NAMES = {
+    21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp', 53: 'domain', 80: 'http',
+    81: 'http', 88: 'kerberos-sec', 110: 'pop3', 111: 'rpcbind', 135: 'msrpc',
+    139: 'netbios-ssn', 143: 'imap', 389: 'ldap', 443: 'https', 445: 'microsoft-ds',
+    465: 'smtps', 587: 'submission', 873: 'rsync', 993: 'imaps', 995: 'pop3s',
+    1433: 'ms-sql-s', 2049: 'nfs', 2121: 'ftp', 3000: 'ppp', 3128: 'squid-http',
+    3306: 'mysql', 3389: 'ms-wbt-server', 5432: 'postgresql', 5900: 'vnc',
+    6379: 'redis', 8000: 'http-alt', 8008: 'http', 8080: 'http-proxy',
+    8443: 'https-alt', 8888: 'sun-answerbook', 9200: 'http', 27017: 'mongod'
+}
+
+class AdaptiveLimiter:
+    """AIMD concurrency window driven by probe outcomes"""
+
+    def __init__(self, initial, minimum, maximum, window=200):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.in_flight = 0
+        self._samples = 0
+        self._timeouts = 0
+        self._resets = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            while self.in_flight >= self.limit:
+                await self._cond.wait()
+            self.in_flight += 1
+
+    async def release(self, outcome):
+        async with self._cond:
+            self.in_flight -= 1
+            self._record(outcome)
+            self._cond.notify_all()
+
+    def _record(self, outcome):
+        self._samples += 1
+        if outcome == 'filtered':
+            self._timeouts += 1
+        elif outcome == 'closed':
+            self._resets += 1
+
+        if self._samples < self.window:
+            return
+
+        timeout_rate = self._timeouts / self._samples
+        reset_rate = self._resets / self._samples
+
+        if timeout_rate > 0.25:
+            # Silent drops - back off hard, the path or the target is saturating
+            self.limit = max(self.minimum, int(self.limit * 0.5))
+        elif reset_rate > 0.5 and timeout_rate < 0.05:
+            # Target answers everything quickly - open the window up
+            self.limit = min(self.maximum, int(self.limit * 1.5))
+        elif timeout_rate < 0.05:
+            self.limit = min(self.maximum, self.limit + self.window // 4)
+
+        self._samples = self._timeouts = self._resets = 0
+
+def raise_fd_limit(concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Lift the soft open-file limit towards what a scan of this width needs, as far as the hard limit allows"""
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = concurrency + FD_HEADROOM
+    if hard != resource.RLIM_INFINITY:
+        target = min(target, hard)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    return soft
+
+class ConnectScanner:
+    def __init__(self, timeout=1.5, max_concurrency=DEFAULT_MAX_CONCURRENCY, min_concurrency=64, initial_concurrency=512):
+        self.timeout = timeout
+        self.max_concurrency = self._fd_budget(max_concurrency)
+        self.min_concurrency = min(min_concurrency, self.max_concurrency)
+        self.initial_concurrency = max(self.min_concurrency, min(initial_concurrency, self.max_concurrency))
+        self.stats = {}
+
+    @staticmethod
+    def _fd_budget(wanted):
+        """Concurrency that fits the current open-file limit, with headroom for everything else"""
+        if resource is None:
+            return wanted
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft == resource.RLIM_INFINITY:
+            return wanted
+        return max(16, min(wanted, soft - FD_HEADROOM))
+
+    def scan(self, hosts, ports=None, on_host=None):
+        """Connect-scan every host/port pair, returning a ScanResult"""
+        return asyncio.run(self._scan(list(hosts), list(ports or TOP_PORTS), on_host))
+
+    async def _scan(self, hosts, ports, on_host):
+        limiter = AdaptiveLimiter(self.initial_concurrency, self.min_concurrency, self.max_concurrency)
+        result = ScanResult()
+        counts = {'open': 0, 'closed': 0, 'filtered': 0}
+        # Enough hosts in flight to fill the widest window, no more
+        host_slots = asyncio.Semaphore(max(4, self.max_concurrency // len(ports) + 1))
+        started = time.perf_counter()
+
+        async def _scan_host(address):
+            responsive = False
+            open_ports = []
+            tasks = []
+
+            async def _probe(port):
+                nonlocal responsive
+                state = await self._probe(address, port)
+                counts[state] += 1
+                if state != 'filtered':
+                    responsive = True
+                if state == 'open':
+                    open_ports.append(port)
+                await limiter.release(state)
+
+            async with host_slots:
+                for port in ports:
+                    await limiter.acquire()
+                    tasks.append(asyncio.create_task(_probe(port)))
+                await asyncio.gather(*tasks)
+
+            if responsive:
+                host = Host(address)
+                for port in sorted(open_ports):
+                    host.add_port(Port(port, 'tcp', 'open', Service.get(SERVICE_NAMES.get(port, 'unknown'))))
+                result.add_host(host)
+                if on_host:
+                    on_host(host)
+
+        await asyncio.gather(*(_scan_host(address) for address in hosts))
+
+        elapsed = time.perf_counter() - started
+        probes = sum(counts.values())
+        self.stats = {
+            'probes': probes,
+            'open': counts['open'],
+            'closed': counts['closed'],
+            'filtered': counts['filtered'],
+            'elapsed': elapsed,
+            'rate': probes / elapsed if elapsed else 0.0,
+            'final_concurrency': limiter.limit
+        }
+        return result
+
+    async def _probe(self, address, port):
+        """Single connect attempt: open, closed (RST) or filtered (no answer)"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.timeout)
+        except ConnectionRefusedError:
+            return 'closed'
+        except (asyncio.TimeoutError, OSError):
+            return 'filtered'
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return 'open'
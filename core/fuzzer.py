@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Parameter fuzzer
+Fires catalog payloads at URL and form parameters over pooled connections
+"""
+
+import asyncio
+import json
+import math
+import re
+import statistics
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from core.async_http import AsyncHTTPPool
+from core.payload_catalog import get_catalog
+
+DEFAULT_TYPES = ('sqli', 'xss', 'lfi', 'command_injection')
+
+# Response bytes kept for evidence matching
+MAX_BODY = 256 * 1024
+
+# Latency samples for the benign baseline, and per payload when a timing candidate is confirmed
+BASELINE_SAMPLES = 10
+CONFIRM_SAMPLES = 5
+
+# One-sided significance level for the Welch t-test
+ALPHA = 0.01
+
+# Smallest latency shift (seconds) that counts when the payload's delay can't be read off it
+MIN_EFFECT = 1.0
+
+TIME_DELAY = re.compile(r"sleep(?:\(\s*|\s+)(\d+(?:\.\d+)?)|waitfor\s+delay\s+'(\d+):(\d+):(\d+)'|ping\s+-[nc]\s*(\d+)", re.I)
+
+# Response content that proves a payload ran - ignored when the benign response already has it
+EVIDENCE = {
+    'sqli': re.compile(
+        r"you have an error in your sql syntax|warning: mysql|unclosed quotation mark|"
+        r"quoted string not properly terminated|pg_query\(\)|syntax error at or near|"
+        r"ora-\d{5}|sqlite3?\.\w*error|sqlstate\[|odbc [a-z ]*driver", re.I),
+    'lfi': re.compile(
+        r"root:[x*]:0:0:|\[boot loader\]|\[fonts\]|for 16-bit app support|"
+        r"PD9waHA|DOCUMENT_ROOT=|HTTP_USER_AGENT=", re.I),
+    'command_injection': re.compile(
+        r"uid=\d+\([^)]*\)\s+gid=|root:[x*]:0:0:|volume serial number|directory of [a-z]:\\|"
+        r"nt authority\\|\bwww-data\b|^total \d+\s*$|^[d-][rwx-]{9}[.+@]?\s+\d+\s|"
+        r"copyright \(c\) 1993-\d{4} microsoft corp", re.I | re.M)
+}
+
+# (payload type, detection) -> (title, severity)
+FINDINGS = {
+    ('sqli', 'time'): ('Time-based SQL injection', 'HIGH'),
+    ('sqli', 'error'): ('Error-based SQL injection', 'HIGH'),
+    ('xss', 'reflection'): ('Reflected cross-site scripting', 'MEDIUM'),
+    ('lfi', 'file'): ('Local file inclusion', 'HIGH'),
+    ('command_injection', 'exec'): ('OS command injection', 'CRITICAL'),
+    ('command_injection', 'time'): ('Blind OS command injection', 'CRITICAL')
+}
+
+DETECTIONS = {'sqli': 'error', 'xss': 'reflection', 'lfi': 'file', 'command_injection': 'exec'}
+
+def _betacf(a, b, x):
+    """Continued fraction for the incomplete beta function (Lentz)"""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+def betainc(a, b, x):
+    """Regularized incomplete beta I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1 - x) / b
+
+def t_sf(t, df):
+    """P(T > t) for Student's t with df degrees of freedom"""
+    tail = 0.5 * betainc(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1.0 - tail
+
+def welch_test(sample, baseline):
+    """(t, df, p) for the one-sided hypothesis mean(sample) > mean(baseline)"""
+    n1, n2 = len(sample), len(baseline)
+    if n1 < 2 or n2 < 2:
+        return 0.0, 0.0, 1.0
+    m1, m2 = statistics.fmean(sample), statistics.fmean(baseline)
+    v1, v2 = statistics.variance(sample) / n1, statistics.variance(baseline) / n2
+    if v1 + v2 == 0:
+        return (math.inf, 0.0, 0.0) if m1 > m2 else (0.0, 0.0, 1.0)
+    t = (m1 - m2) / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    return t, df, t_sf(t, df)
+
+def expected_delay(payload):
+    """Seconds a time-based payload asks the backend to stall, if it says"""
+    match = TIME_DELAY.search(payload)
+    if not match:
+        return None
+    if match.group(1):
+        return float(match.group(1))
+    if match.group(5):
+        # ping -n N waits a second between echoes
+        return max(int(match.group(5)) - 1, 0) or None
+    hours, minutes, seconds = (int(g) for g in match.groups()[1:4])
+    return hours * 3600 + minutes * 60 + seconds
+
+class FuzzTarget:
+    """One endpoint - parameters come from the query string and, for POST, the form body"""
+
+    def __init__(self, url, data=None, method=None):
+        parts = urlsplit(url)
+        self.method = (method or ('POST' if data is not None else 'GET')).upper()
+        self.base = urlunsplit((parts.scheme, parts.netloc, parts.path or '/', '', ''))
+        self.query = parse_qsl(parts.query, keep_blank_values=True)
+        self.form = parse_qsl(data or '', keep_blank_values=True)
+
+    def points(self, names=None):
+        """(location, name, original value) for every injectable parameter"""
+        found = {}
+        for location, pairs in (('query', self.query), ('form', self.form)):
+            for name, value in pairs:
+                if (not names or name in names) and (location, name) not in found:
+                    found[(location, name)] = value
+        return [(location, name, value) for (location, name), value in found.items()]
+
+    def build(self, point=None, value=None):
+        """(url, headers, body) with one parameter's value replaced"""
+        def _fill(location, pairs):
+            if point is None or point[0] != location:
+                return pairs
+            return [(name, value if name == point[1] else v) for name, v in pairs]
+
+        query = _fill('query', self.query)
+        url = f"{self.base}?{urlencode(query)}" if query else self.base
+        if self.method == 'GET':
+            return url, None, None
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return url, headers, urlencode(_fill('form', self.form))
+
+class FuzzHit:
+    __slots__ = ('url', 'method', 'param', 'payload', 'type', 'detection', 'evidence', 'p_value')
+
+    def __init__(self, url, method, param, payload, type, detection, evidence, p_value=None):
+        self.url = url
+        self.method = method
+        self.param = param
+        self.payload = payload
+        self.type = type
+        self.detection = detection
+        self.evidence = evidence
+        self.p_value = p_value
+
+    @property
+    def title(self):
+        return FINDINGS.get((self.type, self.detection), (f"Injection ({self.type})", 'HIGH'))[0]
+
+    @property
+    def severity(self):
+        return FINDINGS.get((self.type, self.detection), (None, 'HIGH'))[1]
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'method': self.method,
+            'param': self.param,
+            'payload': self.payload,
+            'type': self.type,
+            'detection': self.detection,
+            'evidence': self.evidence,
+            'p_value': self.p_value
+        }
+
+class Fuzzer:
+    def __init__(self, concurrency=20, rate_limit=None, timeout=15, catalog=None,
+                 baseline_samples=BASELINE_SAMPLES, confirm_samples=CONFIRM_SAMPLES, alpha=ALPHA):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.catalog = catalog or get_catalog()
+        self.baseline_samples = baseline_samples
+        self.confirm_samples = confirm_samples
+        self.alpha = alpha
+        self.stats = {}
+
+    def payloads(self, types=DEFAULT_TYPES, dbms=None, tag=None):
+        selected = []
+        for payload_type in types:
+            selected.extend(self.catalog.query(type=payload_type, dbms=dbms if payload_type == 'sqli' else None,
+                                               tags=(tag,) if tag else ()))
+        return selected
+
+    def run(self, url, data=None, method=None, params=None, types=DEFAULT_TYPES, dbms=None, tag=None,
+            output_file=None, on_hit=None):
+        """Fuzz every parameter of one endpoint, writing one JSON line per hit"""
+        target = FuzzTarget(url, data, method)
+        points = target.points(params)
+        if not points:
+            raise ValueError(f"no parameters to fuzz in {url}")
+        payloads = self.payloads(types, dbms, tag)
+        out = open(output_file, 'w') if output_file else None
+        try:
+            return asyncio.run(self._run(target, points, payloads, out, on_hit))
+        finally:
+            if out:
+                out.close()
+
+    async def _run(self, target, points, payloads, out, on_hit):
+        hits = []
+        baseline = []           # benign latencies, sampled throughout the run under the same load
+        candidates = {}         # (point, payload) -> [latencies] for time-based payloads
+        counts = {'errors': 0, 'confirmed': 0, 'repeats': 0}
+        found = set()           # (point, type, detection) already reported
+        started = time.perf_counter()
+
+        def _record(point, hit):
+            """Report the first hit per parameter and detection - later payloads only prove it again"""
+            key = (point, hit.type, hit.detection)
+            if key in found:
+                counts['repeats'] += 1
+                return
+            found.add(key)
+            hits.append(hit)
+            if out:
+                out.write(json.dumps(hit.to_dict()) + '\n')
+                out.flush()
+            if on_hit:
+                on_hit(hit)
+
+        async with AsyncHTTPPool(per_host=self.concurrency, timeout=self.timeout,
+                                 rate_limit=self.rate_limit) as pool:
+
+            async def _send(point=None, value=None, timing=False):
+                """(latency, body) - a time-based payload that times out is a full-length sample"""
+                url, headers, body = target.build(point, value)
+                try:
+                    response = await pool.fetch(target.method, url, headers=headers, body=body, max_body=MAX_BODY)
+                except asyncio.TimeoutError:
+                    counts['errors'] += 1
+                    return (float(self.timeout), b'') if timing else (None, None)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    counts['errors'] += 1
+                    return None, None
+                return response.elapsed, response.body
+
+            async def _drain(jobs, handle):
+                jobs = iter(jobs)
+
+                async def _worker():
+                    for job in jobs:
+                        await handle(*job)
+
+                await asyncio.gather(*(_worker() for _ in range(self.concurrency)))
+
+            # Warm the pool and learn what the benign page already contains
+            _, reference = await _send()
+            if reference is None:
+                raise OSError(f"{target.base} is not answering")
+            reference = reference.decode('utf-8', 'replace')
+            preexisting = {name for name, pattern in EVIDENCE.items() if pattern.search(reference)}
+
+            def _value(point, payload):
+                # Traversal replaces the value, everything else is appended to it
+                return payload.value if payload.type == 'lfi' else point[2] + payload.value
+
+            async def _handle(kind, point=None, payload=None):
+                if kind == 'baseline':
+                    latency, _ = await _send()
+                    if latency is not None:
+                        baseline.append(latency)
+                    return
+
+                timing = 'time' in payload.tags
+                detection = DETECTIONS.get(payload.type)
+                if kind == 'probe' and not timing and (point, payload.type, detection) in found:
+                    counts['repeats'] += 1
+                    return
+                latency, body = await _send(point, _value(point, payload), timing)
+                if latency is None:
+                    return
+                if timing:
+                    candidates.setdefault((point, payload), []).append(latency)
+                if kind == 'confirm' or not body:
+                    return
+
+                text = body.decode('utf-8', 'replace')
+                evidence = None
+                if payload.type == 'xss':
+                    evidence = payload.value if payload.value in text else None
+                elif payload.type in EVIDENCE and payload.type not in preexisting:
+                    match = EVIDENCE[payload.type].search(text)
+                    evidence = match.group(0) if match else None
+                if evidence:
+                    url, _, _ = target.build(point, _value(point, payload))
+                    _record(point, FuzzHit(url, target.method, point[1], payload.value, payload.type, detection, evidence))
+
+            def _interleave(jobs, samples):
+                """Spread baseline requests evenly through the payload jobs"""
+                jobs = list(jobs)
+                every = max(1, len(jobs) // samples) if samples else 0
+                placed = 0
+                for i, job in enumerate(jobs):
+                    if every and i % every == 0 and placed < samples:
+                        placed += 1
+                        yield ('baseline',)
+                    yield job
+                for _ in range(samples - placed):
+                    yield ('baseline',)
+
+            # Pass 1: every payload once, with the baseline sampled alongside it
+            jobs = (('probe', point, payload) for point in points for payload in payloads)
+            await _drain(_interleave(jobs, self.baseline_samples), _handle)
+
+            # Pass 2: re-test time-based payloads that looked slow against a fresh baseline
+            def _needed(payload):
+                delay = expected_delay(payload.value)
+                return delay / 2 if delay else MIN_EFFECT
+
+            mean = statistics.fmean(baseline) if baseline else 0.0
+            suspects = [key for key, latencies in candidates.items()
+                        if latencies[0] - mean >= _needed(key[1])]
+            counts['confirmed'] = len(suspects)
+            if suspects:
+                confirm = (('confirm', point, payload)
+                           for point, payload in suspects for _ in range(self.confirm_samples))
+                await _drain(_interleave(confirm, len(suspects) * self.confirm_samples), _handle)
+
+            mean = statistics.fmean(baseline) if baseline else 0.0
+            for point, payload in suspects:
+                latencies = candidates[(point, payload)]
+                _, _, p_value = welch_test(latencies, baseline)
+                shift = statistics.fmean(latencies) - mean
+                if p_value < self.alpha and shift >= _needed(payload):
+                    url, _, _ = target.build(point, _value(point, payload))
+                    evidence = f"+{shift:.2f}s over {len(baseline)} baseline samples (p={p_value:.2g})"
+                    _record(point, FuzzHit(url, target.method, point[1], payload.value, payload.type, 'time',
+                                           evidence, p_value))
+
+            requests = pool.stats['requests']
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'requests': requests,
+            'errors': counts['errors'],
+            'params': len(points),
+            'payloads': len(payloads),
+            'hits': len(hits),
+            'repeats': counts['repeats'],
+            'timing_candidates': counts['confirmed'],
+            'baseline_mean': statistics.fmean(baseline) if baseline else 0.0,
+            'baseline_stdev': statistics.stdev(baseline) if len(baseline) > 1 else 0.0,
+            'elapsed': elapsed,
+            'rate': requests / elapsed if elapsed else 0.0
+        }
+        return hits
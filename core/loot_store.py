@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Content-addressed loot storage
+Streams downloads to disk in binary, keeping identical files once
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+class LootRecord:
+    __slots__ = ('url', 'name', 'sha256', 'size', 'truncated', 'content_type', 'path', 'fetched_at')
+
+    def __init__(self, url, name, sha256, size, truncated, content_type, path, fetched_at=None):
+        self.url = url
+        self.name = name
+        self.sha256 = sha256
+        self.size = size
+        self.truncated = truncated
+        self.content_type = content_type
+        self.path = path
+        self.fetched_at = fetched_at or time.time()
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'name': self.name,
+            'sha256': self.sha256,
+            'size': self.size,
+            'truncated': self.truncated,
+            'content_type': self.content_type,
+            'path': str(self.path),
+            'fetched_at': self.fetched_at
+        }
+
+class LootStore:
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.index_file = self.root / "index.jsonl"
+        self.max_bytes = max_bytes
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest):
+        return self.blobs / digest[:2] / digest
+
+    def save(self, url, chunks, name=None, content_type=None, max_bytes=None):
+        """Stream chunks into a blob, stopping at the size cap, and index it under url"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        digest = hashlib.sha256()
+        size = 0
+        truncated = False
+
+        fd, tmp = tempfile.mkstemp(dir=self.blobs, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if limit and size + len(chunk) > limit:
+                        chunk = chunk[:limit - size]
+                        truncated = True
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if truncated:
+                        break
+
+            path = self.blob_path(digest.hexdigest())
+            path.parent.mkdir(exist_ok=True)
+            if path.exists():
+                # Already holding these bytes from another host
+                os.unlink(tmp)
+            else:
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        record = LootRecord(url, name, digest.hexdigest(), size, truncated, content_type, path)
+        with self._lock, open(self.index_file, 'a') as f:
+            f.write(json.dumps(record.to_dict()) + '\n')
+        return record
+
+    def save_response(self, url, response, name=None, max_bytes=None):
+        """Store a streamed requests response body without loading it into memory"""
+        try:
+            return self.save(
+                url, response.iter_content(CHUNK_SIZE), name,
+                response.headers.get('Content-Type'), max_bytes
+            )
+        finally:
+            response.close()
+
+    def entries(self):
+        """Every indexed download, oldest first"""
+        try:
+            with open(self.index_file) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except OSError:
+            return
+
+    def lookup(self, url):
+        """Most recent download of url, if any"""
+        found = None
+        for entry in self.entries():
+            if entry['url'] == url:
+                found = entry
+        return found
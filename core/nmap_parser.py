@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Nmap output decoders
+Extracts host records from nmap's XML output as it is emitted, and from saved -oN logs
+"""
+
+import re
+from xml.etree.ElementTree import XMLPullParser, ParseError
+from core.scan_model import Host, Port, Service, ScriptOutput, ScanResult
+
+CHUNK_SIZE = 65536
+
+# -oN normal output, plus the "Host: <address>" blocks the native connect backend writes
+REPORT_LINE = re.compile(r"^Nmap scan report for (?:(\S+) \(([^)]+)\)|(\S+))")
+CONNECT_HOST_LINE = re.compile(r"^Host: (\S+)$")
+PORT_LINE = re.compile(r"^(\d+)/(tcp|udp|sctp)\s+(\S+)(?:\s+(\S+))?(?:\s+(.+?))?\s*$")
+
+def iter_hosts(stream, tee=None, on_progress=None):
+    """Yield host records as soon as each <host> element closes"""
+    parser = XMLPullParser(events=('start', 'end'))
+    root = None
+
+    try:
+        for chunk in iter(lambda: stream.read1(CHUNK_SIZE), b''):
+            if tee:
+                tee.write(chunk)
+            parser.feed(chunk)
+
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                elif elem.tag == 'host':
+                    yield parse_host(elem)
+                    # Drop the finished subtree so memory stays flat
+                    elem.clear()
+                    root.remove(elem)
+                elif elem.tag == 'taskprogress':
+                    if on_progress:
+                        on_progress(float(elem.get('percent', 0)), _int(elem.get('remaining')))
+                    if elem in root:
+                        root.remove(elem)
+    except ParseError:
+        # Truncated document - nmap was killed mid-write
+        return
+
+def parse_file(path):
+    """Decode a saved - possibly truncated - XML file into a ScanResult"""
+    result = ScanResult()
+    with open(path, 'rb') as f:
+        for host in iter_hosts(f):
+            result.add_host(host)
+    return result
+
+def is_normal_output(path):
+    """Whether a text file is nmap -oN output or a connect-scan log, judging by its first line"""
+    try:
+        with open(path, 'r', errors='replace') as f:
+            first = f.readline()
+    except OSError:
+        return False
+    return first.startswith('# Nmap') or bool(CONNECT_HOST_LINE.match(first.rstrip('\n')))
+
+def parse_normal(path):
+    """Decode a saved -oN (or connect-scan) text file into a ScanResult - versions land in the product field"""
+    result = ScanResult()
+    host = None
+    with open(path, 'r', errors='replace') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            report = REPORT_LINE.match(line)
+            connect = None if report else CONNECT_HOST_LINE.match(line)
+            if report or connect:
+                if connect:
+                    hostname, address = None, connect.group(1)
+                elif report.group(3):
+                    hostname, address = None, report.group(3)
+                else:
+                    hostname, address = report.group(1), report.group(2)
+                host = result.add_host(Host(address, hostname, 'down' if line.endswith('[host down]') else 'up'))
+                continue
+            match = PORT_LINE.match(line) if host is not None else None
+            if match:
+                number, protocol, state, name, banner = match.groups()
+                host.add_port(Port(number, protocol, state, Service.get(name or '', banner or '')))
+    return result
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_host(elem):
+    """Decode a single <host> element into a Host record"""
+    address = None
+    for addr in elem.iter('address'):
+        if addr.get('addrtype') in ('ipv4', 'ipv6'):
+            address = addr.get('addr')
+            break
+
+    hostname = None
+    name = elem.find('hostnames/hostname')
+    if name is not None:
+        hostname = name.get('name')
+
+    status = elem.find('status')
+    host = Host(address, hostname, status.get('state') if status is not None else 'unknown')
+
+    for port in elem.iter('port'):
+        state = port.find('state')
+        service = port.find('service')
+        host.add_port(Port(
+            port.get('portid'),
+            port.get('protocol'),
+            state.get('state') if state is not None else 'unknown',
+            Service.get(
+                service.get('name', ''),
+                service.get('product', ''),
+                service.get('version', ''),
+                service.get('extrainfo', '')
+            ) if service is not None else None,
+            _parse_scripts(port)
+        ))
+
+    hostscript = elem.find('hostscript')
+    if hostscript is not None:
+        host.scripts = _parse_scripts(hostscript)
+
+    return host
+
+def _parse_scripts(elem):
+    """Collect NSE script output attached directly to an element"""
+    return tuple(
+        ScriptOutput(script.get('id', ''), script.get('output', ''))
+        for script in elem.findall('script')
+    )
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Payload catalog
+Indexed view of data/payloads.json plus any merged wordlists, loaded once
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+from utils.workspace import STATE_DIR
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "payloads.json"
+
+# Bumped whenever the compiled layout changes so old cache files are ignored
+CACHE_VERSION = 1
+
+# Fingerprints that tie an SQLi payload to one database engine
+DBMS_PATTERNS = {
+    'mysql': re.compile(r"sleep\(|database\(\)|extractvalue|updatexml|information_schema|@@version_comment|#\s*$", re.I),
+    'mssql': re.compile(r"waitfor\s+delay|convert\(int|@@servername|xp_cmdshell|sysobjects", re.I),
+    'postgresql': re.compile(r"pg_sleep|::text|current_database\(|pg_catalog", re.I),
+    'oracle': re.compile(r"dbms_pipe|from\s+dual|utl_http|all_tables", re.I),
+    'sqlite': re.compile(r"sqlite_version|sqlite_master|randomblob", re.I)
+}
+
+# Tag -> pattern, applied to every payload regardless of type
+TAG_PATTERNS = {
+    'comment': re.compile(r"(--|#|/\*)"),
+    'quote': re.compile(r"['\"]"),
+    'time': re.compile(r"sleep|waitfor|pg_sleep|benchmark|ping\s+-[nc]\s*\d", re.I),
+    'union': re.compile(r"\bunion\b", re.I),
+    'script': re.compile(r"<script", re.I),
+    'event': re.compile(r"\bon[a-z]+\s*=", re.I),
+    'cookie': re.compile(r"document\.cookie", re.I),
+    'traversal': re.compile(r"\.\.[/\\]"),
+    'wrapper': re.compile(r"^[a-z]+://", re.I),
+    'null-byte': re.compile(r"%00|\\0"),
+    'exfil': re.compile(r"https?://", re.I)
+}
+
+class Payload:
+    __slots__ = ('value', 'type', 'category', 'dbms', 'tags')
+
+    def __init__(self, value, type, category, dbms=None, tags=()):
+        self.value = value
+        self.type = type
+        self.category = category
+        self.dbms = dbms
+        self.tags = tags
+
+    def to_dict(self):
+        return {
+            'value': self.value,
+            'type': self.type,
+            'category': self.category,
+            'dbms': self.dbms,
+            'tags': list(self.tags)
+        }
+
+def classify(value, payload_type, category):
+    """(dbms, tags) for a payload - DBMS only means something for SQLi"""
+    dbms = None
+    if payload_type == 'sqli':
+        dbms = next((name for name, pattern in DBMS_PATTERNS.items() if pattern.search(value)), 'generic')
+    tags = {part for part in category.split('_') if part}
+    tags.update(tag for tag, pattern in TAG_PATTERNS.items() if pattern.search(value))
+    return dbms, tuple(sorted(tags))
+
+class PayloadCatalog:
+    def __init__(self, path=DEFAULT_PATH, cache_dir=None):
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else STATE_DIR / "payload_cache"
+        self._extra = []        # (path, type, category, tags) merged on top of the main file
+        self._signature = None
+        self._entries = []
+        self._index = {}
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def merge_file(self, path, payload_type, category='external', tags=()):
+        """Add an external list - JSON in the payloads.json layout, or one payload per line"""
+        self._extra.append((str(Path(path).resolve()), payload_type, category, tuple(tags)))
+        self._signature = None
+
+    def _sources(self):
+        sources = [(str(self.path), None, None, ())] + self._extra
+        signature = []
+        for source in sources:
+            try:
+                stat = os.stat(source[0])
+                signature.append((source, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((source, None, None))
+        return sources, tuple(signature)
+
+    def _ensure_loaded(self):
+        """(Re)build the indexes when any source file changed since the last load"""
+        sources, signature = self._sources()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            entries, index = self._load_compiled(signature) or self._compile(sources, signature)
+            self._entries = entries
+            self._index = index
+            self._sets = {}
+            self._signature = signature
+
+    def _cache_file(self, signature):
+        key = hashlib.sha1(repr((CACHE_VERSION, signature)).encode()).hexdigest()[:20]
+        return self.cache_dir / f"{key}.pickle"
+
+    def _load_compiled(self, signature):
+        try:
+            with open(self._cache_file(signature), 'rb') as f:
+                rows, index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return [Payload(value, t, c, d, tags) for value, t, c, d, tags in rows], index
+
+    def _compile(self, sources, signature):
+        entries = []
+        index = {}
+        seen = set()
+
+        def _add(value, payload_type, category, extra_tags=()):
+            value = value.rstrip('\r\n')
+            if not value or (payload_type, value) in seen:
+                return
+            seen.add((payload_type, value))
+            dbms, tags = classify(value, payload_type, category)
+            if extra_tags:
+                tags = tuple(sorted(set(tags) | set(extra_tags)))
+            payload_id = len(entries)
+            entries.append(Payload(value, payload_type, category, dbms, tags))
+
+            index.setdefault(('type', payload_type), []).append(payload_id)
+            index.setdefault(('category', payload_type, category), []).append(payload_id)
+            if dbms:
+                index.setdefault(('dbms', dbms), []).append(payload_id)
+            for tag in tags:
+                index.setdefault(('tag', tag), []).append(payload_id)
+
+        for path, payload_type, category, tags in sources:
+            try:
+                if path.endswith('.json'):
+                    with open(path) as f:
+                        data = json.load(f)
+                    for kind, categories in data.items():
+                        if payload_type and kind != payload_type:
+                            continue
+                        for name, values in categories.items():
+                            for value in values:
+                                _add(value, kind, name, tags)
+                else:
+                    with open(path, encoding='utf-8', errors='ignore') as f:
+                        for line in f:
+                            if not line.startswith('#'):
+                                _add(line, payload_type, category, tags)
+            except (OSError, ValueError):
+                continue
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self._cache_file(signature)
+            tmp = cache_file.with_suffix('.tmp')
+            rows = [(p.value, p.type, p.category, p.dbms, p.tags) for p in entries]
+            with open(tmp, 'wb') as f:
+                pickle.dump((rows, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+
+        return entries, index
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def types(self):
+        self._ensure_loaded()
+        return [key[1] for key in self._index if key[0] == 'type']
+
+    def categories(self, payload_type):
+        self._ensure_loaded()
+        return [key[2] for key in self._index if key[0] == 'category' and key[1] == payload_type]
+
+    def query(self, type=None, category=None, dbms=None, tags=(), contains=None, limit=None):
+        """Payloads matching every given filter, in catalog order"""
+        self._ensure_loaded()
+
+        keys = []
+        if category and type:
+            keys.append(('category', type, category))
+        elif type:
+            keys.append(('type', type))
+        if dbms:
+            keys.append(('dbms', dbms))
+        keys.extend(('tag', tag) for tag in ([tags] if isinstance(tags, str) else tags))
+
+        if keys:
+            # Walk the smallest posting list, test membership in the rest
+            keys.sort(key=lambda key: len(self._index.get(key, ())))
+            rest = [self._posting_set(key) for key in keys[1:]]
+            ids = (i for i in self._index.get(keys[0], ()) if all(i in s for s in rest))
+        else:
+            ids = range(len(self._entries))
+
+        results = []
+        for i in ids:
+            payload = self._entries[i]
+            if category and not type and payload.category != category:
+                continue
+            if contains and contains.lower() not in payload.value.lower():
+                continue
+            results.append(payload)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def _posting_set(self, key):
+        found = self._sets.get(key)
+        if found is None:
+            found = self._sets[key] = frozenset(self._index.get(key, ()))
+        return found
+
+    def grouped(self, payload_type, **filters):
+        """{category: [values]} for one payload type - the layout payloads.json uses"""
+        groups = {}
+        for payload in self.query(type=payload_type, **filters):
+            groups.setdefault(payload.category, []).append(payload.value)
+        return groups
+
+_catalogs = {}
+
+def get_catalog(path=DEFAULT_PATH):
+    """Process-wide catalog for a payload file"""
+    key = str(Path(path).resolve())
+    if key not in _catalogs:
+        _catalogs[key] = PayloadCatalog(path)
+    return _catalogs[key]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Payload mutation engine
+Lazily composes encodings and mutations over payload sets
+"""
+
+import base64
+import random
+import re
+import urllib.parse
+from itertools import chain, combinations, permutations
+
+# Rewrites of the raw payload text - applied before any encoding
+def randomize_case(payload, rng):
+    return ''.join(c.upper() if rng.random() < 0.5 else c.lower() for c in payload)
+
+SQL_KEYWORDS = re.compile(r'\b(SELECT|UNION|FROM|WHERE|AND|OR|SLEEP|ORDER|GROUP|BY|CONCAT|NULL)\b', re.I)
+
+def inject_comments(payload, rng):
+    """SQL inline comments in place of spaces and inside keywords (UN/**/ION)"""
+    def _split(match):
+        word = match.group(0)
+        if len(word) < 4:
+            return word
+        cut = rng.randint(1, len(word) - 1)
+        return f"{word[:cut]}/**/{word[cut:]}"
+    return SQL_KEYWORDS.sub(_split, payload).replace(' ', '/**/')
+
+MUTATIONS = {
+    'case': randomize_case,
+    'comment': inject_comments
+}
+
+def url_encode(payload):
+    return urllib.parse.quote(payload, safe='')
+
+def double_url_encode(payload):
+    return url_encode(url_encode(payload))
+
+def html_entity_encode(payload):
+    return ''.join(f"&#{ord(c)};" for c in payload)
+
+def base64_encode(payload):
+    return base64.b64encode(payload.encode()).decode()
+
+def hex_encode(payload):
+    return ''.join(f"\\x{b:02x}" for b in payload.encode())
+
+def unicode_encode(payload):
+    return ''.join(f"%u{ord(c):04x}" for c in payload)
+
+ENCODINGS = {
+    'url': url_encode,
+    'double_url': double_url_encode,
+    'html': html_entity_encode,
+    'base64': base64_encode,
+    'hex': hex_encode,
+    'unicode': unicode_encode
+}
+
+# Transforms worth trying per payload type
+DEFAULT_TRANSFORMS = {
+    'sqli': ('case', 'comment', 'url', 'double_url', 'unicode'),
+    'xss': ('case', 'url', 'double_url', 'html', 'unicode'),
+    'lfi': ('url', 'double_url', 'unicode', 'hex'),
+    'command_injection': ('url', 'double_url', 'base64', 'hex')
+}
+
+class Variant:
+    __slots__ = ('value', 'original', 'chain')
+
+    def __init__(self, value, original, chain):
+        self.value = value
+        self.original = original
+        self.chain = chain
+
+    @property
+    def label(self):
+        return '+'.join(self.chain) or 'raw'
+
+def chains(transforms, depth=1):
+    """Every transform chain: any subset of mutations, then up to depth encodings in any order"""
+    mutations = [t for t in transforms if t in MUTATIONS]
+    encodings = [t for t in transforms if t in ENCODINGS]
+    unknown = set(transforms) - set(MUTATIONS) - set(ENCODINGS)
+    if unknown:
+        raise ValueError(f"unknown transform(s): {', '.join(sorted(unknown))}")
+
+    mutation_sets = chain.from_iterable(combinations(mutations, r) for r in range(len(mutations) + 1))
+    encoding_runs = [run for r in range(min(depth, len(encodings)) + 1) for run in permutations(encodings, r)]
+    for mutation_set in mutation_sets:
+        for run in encoding_runs:
+            yield mutation_set + run
+
+def apply_chain(payload, transform_chain, rng):
+    for name in transform_chain:
+        if name in MUTATIONS:
+            payload = MUTATIONS[name](payload, rng)
+        else:
+            payload = ENCODINGS[name](payload)
+    return payload
+
+def mutate(payloads, transforms=None, payload_type=None, depth=1, include_original=True, seed=None):
+    """Stream Variants of every payload - nothing is materialised beyond one payload's variants
+
+    payloads may be strings or catalog Payload objects.
+    """
+    if transforms is None:
+        transforms = DEFAULT_TRANSFORMS.get(payload_type, tuple(ENCODINGS))
+    transform_chains = [c for c in chains(transforms, depth) if c or include_original]
+    rng = random.Random(seed)
+
+    for payload in payloads:
+        value = getattr(payload, 'value', payload)
+        emitted = set()
+        for transform_chain in transform_chains:
+            variant = apply_chain(value, transform_chain, rng)
+            if variant in emitted:
+                continue
+            emitted.add(variant)
+            yield Variant(variant, value, transform_chain)
+
+def count_chains(transforms, depth=1):
+    return sum(1 for _ in chains(transforms, depth))
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Report export
+Renders every requested report format in one pass over the findings store
+"""
+
+import csv
+import html
+import io
+import json
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from string import Template
+
+# Bytes buffered before report files are flushed to disk
+WRITE_BUFFER = 1024 * 1024
+
+# Bumped whenever a cached finding block's layout changes, so stale blocks are rendered again
+RENDER_VERSION = 1
+
+EXPORT_FORMATS = ('md', 'html', 'csv', 'json', 'jsonl')
+DEFAULT_FORMATS = ('md', 'json', 'jsonl')
+
+# Uncached findings sent to a worker process per HTML job, and jobs queued before the pass waits
+HTML_BATCH = 200
+HTML_MAX_QUEUED = 32 * HTML_BATCH
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'INFO')
+
+CSV_COLUMNS = ('severity', 'title', 'affected_systems', 'cvss', 'cve', 'description',
+               'impact', 'proof_of_concept', 'remediation', 'timestamp')
+
+HTML_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$client_name - $test_type</title>
+<style>
+body { font-family: sans-serif; max-width: 1100px; margin: 2em auto; color: #222; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }
+pre, .text { white-space: pre-wrap; }
+pre { background: #f6f8fa; padding: 8px; overflow-x: auto; }
+section.finding { border-top: 1px solid #ccc; margin-top: 1.5em; }
+.severity-critical { background: #8b0000; color: #fff; }
+.severity-high { background: #d9534f; color: #fff; }
+.severity-medium { background: #f0ad4e; }
+.severity-low { background: #5bc0de; }
+.severity-info { background: #eee; }
+</style>
+</head>
+<body>
+<h1>Penetration Test Report</h1>
+<p><strong>Client:</strong> $client_name<br>
+<strong>Assessment Type:</strong> $test_type<br>
+<strong>Report Date:</strong> $report_date</p>
+<h2>Executive Summary</h2>
+<table>
+<tr><th>Severity</th><th>Findings</th></tr>
+$severity_rows</table>
+<h2>Technical Findings</h2>
+""")
+
+HTML_TABLE_HEAD = "<table>\n<tr><th>#</th><th>Severity</th><th>Vulnerability</th><th>Affected Systems</th></tr>\n"
+
+def _severity_class(severity):
+    return f"severity-{html.escape(severity.lower(), quote=True)}"
+
+def render_html(finding):
+    """(summary row, detail section) for one finding - both without the finding number"""
+    escape = html.escape
+    severity = escape(finding['severity'])
+    systems = finding['affected_systems']
+    shown = ', '.join(escape(system) for system in systems[:2])
+    if len(systems) > 2:
+        shown += f" (+{len(systems) - 2} more)"
+    row = f'<td class="{_severity_class(finding["severity"])}">{severity}</td><td>{escape(finding["title"])}</td><td>{shown}</td></tr>\n'
+
+    parts = [f'{escape(finding["title"])}</h3>\n<p><span class="{_severity_class(finding["severity"])}">{severity}</span>']
+    if finding.get('cvss'):
+        parts.append(f" CVSS {escape(str(finding['cvss']))}")
+    if finding.get('cve'):
+        parts.append(f" {escape(finding['cve'])}")
+    parts.append("</p>\n<h4>Affected Systems</h4>\n<ul>\n")
+    parts.extend(f"<li>{escape(system)}</li>\n" for system in systems)
+    parts.append("</ul>\n")
+    for heading, key in (('Description', 'description'), ('Impact', 'impact')):
+        parts.append(f'<h4>{heading}</h4>\n<p class="text">{escape(str(finding[key]))}</p>\n')
+    parts.append(f"<h4>Proof of Concept</h4>\n<pre>{escape(str(finding['proof_of_concept']))}</pre>\n")
+    parts.append(f'<h4>Remediation</h4>\n<p class="text">{escape(str(finding["remediation"]))}</p>\n</section>\n')
+    return row, ''.join(parts)
+
+def render_html_batch(findings):
+    """Worker process entry point"""
+    return [render_html(finding) for finding in findings]
+
+def render_csv(finding):
+    buffer = io.StringIO()
+    row = dict(finding, affected_systems='; '.join(finding['affected_systems']))
+    csv.writer(buffer).writerow([row[column] if row[column] is not None else '' for column in CSV_COLUMNS])
+    return buffer.getvalue()
+
+_json_encode = json.JSONEncoder(indent=2).encode
+_jsonl_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+def render_json(finding):
+    return _json_encode(finding).replace('\n', '\n    ')
+
+class ExportWriter:
+    """One output file - gets each finding's blocks in severity order, from the cache or freshly rendered"""
+    prefix = 'findings'
+    extension = None
+    keys = ()
+
+    def __init__(self, report, path, context, cache):
+        self.report = report
+        self.path = path
+        self.context = context
+        self.cache = cache      # (finding id, format, hash, block) rows for the store
+        self.f = open(path, 'w', buffering=WRITE_BUFFER, encoding='utf-8', newline='')
+
+    def render(self, finding):
+        raise NotImplementedError
+
+    def begin(self, total):
+        pass
+
+    def write(self, number, blocks):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+    def add(self, number, blocks):
+        self.write(number, blocks)
+
+    def miss(self, number, finding_id, digest, finding):
+        blocks = self.render(finding)
+        self.cache.extend((finding_id, key, digest, block) for key, block in zip(self.keys, blocks))
+        self.write(number, blocks)
+
+    def close(self):
+        self.f.close()
+
+class SpooledWriter(ExportWriter):
+    """Formats with a summary table ahead of the details - details wait in a spool file until the table is done"""
+
+    def begin(self, total):
+        self.spool = tempfile.TemporaryFile('w+', encoding='utf-8') if total else None
+
+    def finish_spool(self):
+        if self.spool:
+            self.spool.seek(0)
+            shutil.copyfileobj(self.spool, self.f)
+
+    def close(self):
+        if self.spool:
+            self.spool.close()
+        super().close()
+
+class MarkdownWriter(SpooledWriter):
+    prefix = 'pentest_report'
+    extension = 'md'
+
+    def __init__(self, report, path, context, cache):
+        super().__init__(report, path, context, cache)
+        self.keys = report.markdown_keys()
+        self.head = report.finding_template().head
+
+    def render(self, finding):
+        return self.report.render_summary_row(finding), self.report.render_finding_block(finding)
+
+    def begin(self, total):
+        super().begin(total)
+        self.f.writelines(self.report.iter_report_head(**self.context['head']))
+        self.f.writelines(self.report.iter_findings_header(total))
+
+    def write(self, number, blocks):
+        row, detail = blocks
+        self.f.write(f"| {number}{row}")
+        self.spool.write(f"{self.head}{number}{detail}")
+
+    def end(self):
+        if self.spool:
+            self.f.write("\n---\n\n")
+            self.finish_spool()
+        self.f.writelines(self.report.iter_report_tail(**self.context['tail']))
+
+class HTMLWriter(SpooledWriter):
+    """Uncached findings are rendered in worker processes, a batch at a time, while the pass moves on"""
+    prefix = 'pentest_report'
+    extension = 'html'
+    keys = (f"html-row/{RENDER_VERSION}", f"html/{RENDER_VERSION}")
+
+    def __init__(self, report, path, context, cache, workers=None):
+        super().__init__(report, path, context, cache)
+        self.workers = workers
+        self.pool = None
+        self.batch = None
+        self.queue = deque()    # (number, batch or None, index in batch or blocks)
+
+    def render(self, finding):
+        return render_html(finding)
+
+    def begin(self, total):
+        super().begin(total)
+        counts = self.report.store.severity_counts()
+        severity_rows = ''.join(
+            f'<tr><td class="{_severity_class(severity)}">{severity}</td><td>{counts.get(severity, 0)}</td></tr>\n'
+            for severity in SEVERITIES
+        )
+        head = self.context['head']
+        self.f.write(HTML_HEAD.substitute(
+            client_name=html.escape(head['client_name']), test_type=html.escape(head['test_type']),
+            report_date=datetime.now().strftime('%B %d, %Y'), severity_rows=severity_rows
+        ))
+        self.f.write(HTML_TABLE_HEAD if total else "<p>No vulnerabilities were identified during testing.</p>\n")
+
+    def write(self, number, blocks):
+        row, detail = blocks
+        self.f.write(f"<tr><td>{number}</td>{row}")
+        self.spool.write(f'<section class="finding" id="finding-{number}">\n<h3>Finding #{number}: {detail}')
+
+    def add(self, number, blocks):
+        if self.queue:
+            self.queue.append((number, None, blocks))
+        else:
+            self.write(number, blocks)
+
+    def miss(self, number, finding_id, digest, finding):
+        if self.batch is None:
+            self.batch = {'findings': [], 'keys': [], 'future': None, 'results': None}
+        self.batch['findings'].append(finding)
+        self.batch['keys'].append((finding_id, digest))
+        self.queue.append((number, self.batch, len(self.batch['keys']) - 1))
+        if len(self.batch['findings']) >= HTML_BATCH:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            self.batch['future'] = self.pool.submit(render_html_batch, self.batch['findings'])
+            self.batch['findings'] = None
+            self.batch = None
+        self._drain(wait=len(self.queue) > HTML_MAX_QUEUED)
+
+    def _drain(self, wait=False):
+        """Write queued findings up to the first batch still rendering"""
+        while self.queue:
+            number, batch, payload = self.queue[0]
+            if batch is not None:
+                if batch['results'] is None:
+                    future = batch['future']
+                    if future is None or (not wait and not future.done()):
+                        return
+                    batch['results'] = future.result()
+                blocks = batch['results'][payload]
+                finding_id, digest = batch['keys'][payload]
+                self.cache.extend((finding_id, key, digest, block) for key, block in zip(self.keys, blocks))
+            else:
+                blocks = payload
+            self.queue.popleft()
+            self.write(number, blocks)
+
+    def end(self):
+        if self.batch is not None:
+            # A short final batch is not worth a round trip to a worker
+            self.batch['results'] = render_html_batch(self.batch['findings'])
+            self.batch = None
+        self._drain(wait=True)
+        if self.spool:
+            self.f.write("</table>\n")
+            self.finish_spool()
+
+        credentials = self.report.credentials
+        if credentials:
+            self.f.write("<h2>Discovered Credentials</h2>\n<table>\n"
+                         "<tr><th>System</th><th>Service</th><th>Username</th><th>Password</th><th>Notes</th></tr>\n")
+            for cred in credentials:
+                cells = (cred['system'], cred['service'], cred['username'], cred['password'], cred['notes'])
+                self.f.write('<tr>' + ''.join(f"<td>{html.escape(str(cell or ''))}</td>" for cell in cells) + '</tr>\n')
+            self.f.write("</table>\n")
+        self.f.write("</body>\n</html>\n")
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        super().close()
+
+class CSVWriter(ExportWriter):
+    extension = 'csv'
+    keys = (f"csv/{RENDER_VERSION}",)
+
+    def render(self, finding):
+        return (render_csv(finding),)
+
+    def begin(self, total):
+        csv.writer(self.f).writerow(CSV_COLUMNS)
+
+    def write(self, number, blocks):
+        self.f.write(blocks[0])
+
+class JSONWriter(ExportWriter):
+    extension = 'json'
+    keys = (f"json/{RENDER_VERSION}",)
+
+    def render(self, finding):
+        return (render_json(finding),)
+
+    def begin(self, total):
+        self.f.write('{\n  "findings": [')
+        self.written = 0
+
+    def write(self, number, blocks):
+        self.f.write(',\n    ' if self.written else '\n    ')
+        self.f.write(blocks[0])
+        self.written += 1
+
+    def end(self):
+        self.f.write('\n  ]' if self.written else ']')
+        sections = (('targets', self.report.targets), ('credentials', self.report.credentials),
+                    ('screenshots', self.report.screenshots))
+        for name, records in sections:
+            self.f.write(f',\n  "{name}": [')
+            self.f.write(','.join(f"\n    {render_json(record)}" for record in records))
+            self.f.write('\n  ]' if records else ']')
+        self.f.write('\n}')
+
+class JSONLWriter(ExportWriter):
+    """One finding per line - appendable and greppable without parsing the whole file"""
+    extension = 'jsonl'
+    keys = (f"jsonl/{RENDER_VERSION}",)
+
+    def render(self, finding):
+        return (_jsonl_encode(finding) + '\n',)
+
+    def write(self, number, blocks):
+        self.f.write(blocks[0])
+
+WRITERS = {
+    'md': MarkdownWriter,
+    'html': HTMLWriter,
+    'csv': CSVWriter,
+    'json': JSONWriter,
+    'jsonl': JSONLWriter
+}
+
+class ReportExporter:
+    def __init__(self, report, formats=DEFAULT_FORMATS, workers=None):
+        unknown = [fmt for fmt in formats if fmt not in WRITERS]
+        if unknown:
+            raise ValueError(f"unknown report format(s): {', '.join(unknown)} (choose from {', '.join(EXPORT_FORMATS)})")
+        self.report = report
+        self.formats = tuple(dict.fromkeys(formats))
+        self.workers = workers
+        self.stats = {}
+
+    def export(self, stamp=None, head=None, tail=None):
+        """Write every format in one pass over the findings - returns {format: path}"""
+        stamp = stamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        context = {'head': head or {}, 'tail': tail or {}}
+        store = self.report.store
+        started = time.perf_counter()
+        cache = []
+        writers = []
+        rendered = 0
+
+        try:
+            for fmt in self.formats:
+                writer = WRITERS[fmt]
+                path = self.report.workspace.reports / f"{writer.prefix}_{stamp}.{writer.extension}"
+                if writer is HTMLWriter:
+                    writers.append(writer(self.report, path, context, cache, self.workers))
+                else:
+                    writers.append(writer(self.report, path, context, cache))
+
+            total = store.count()
+            for writer in writers:
+                writer.begin(total)
+
+            keys = [key for writer in writers for key in writer.keys]
+            for number, (finding_id, digest, cached) in enumerate(store.iter_cached(keys), 1):
+                finding = None
+                for writer in writers:
+                    blocks = tuple(cached[key] for key in writer.keys)
+                    if None in blocks:
+                        if finding is None:
+                            finding = store.get_finding(finding_id)
+                            rendered += 1
+                        writer.miss(number, finding_id, digest, finding)
+                    else:
+                        writer.add(number, blocks)
+                if len(cache) >= 1000:
+                    store.save_blocks(cache)
+                    cache.clear()
+
+            for writer in writers:
+                writer.end()
+            if cache:
+                store.save_blocks(cache)
+        finally:
+            for writer in writers:
+                writer.close()
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            'findings': total,
+            'rendered': rendered,
+            'cached': total - rendered,
+            'formats': len(writers),
+            'elapsed': elapsed
+        }
+        return {fmt: writer.path for fmt, writer in zip(self.formats, writers)}
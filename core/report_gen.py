@@ -6,24 +6,50 @@ Creates professional penetration test reports
 
 from datetime import datetime
 from pathlib import Path
-import json
+from core.findings_store import FindingsStore
+from core.report_export import ReportExporter, DEFAULT_FORMATS, RENDER_VERSION
+from core.report_templates import load_template
+
+SEVERITY_ORDER = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+SECTION_BREAK = "\n\n---\n\n"
 
 class ReportGenerator:
-    def __init__(self, workspace, logger):
+    def __init__(self, workspace, logger, store=None):
         self.workspace = workspace
         self.logger = logger
-        self.findings = []
-        self.targets = []
-        self.credentials = []
-        self.screenshots = []
+        # Everything lands in the workspace database, so a later --report run sees earlier findings
+        self.store = store if store is not None else FindingsStore(workspace.root / "findings.db")
+        self.export_stats = {}
+
+    @property
+    def findings(self):
+        return list(self.store.iter_findings())
+
+    @property
+    def targets(self):
+        return self.store.targets()
+
+    @property
+    def credentials(self):
+        return self.store.credentials()
+
+    @property
+    def screenshots(self):
+        return self.store.screenshots()
+
+    def batch(self):
+        """Commit everything added inside the block as one transaction"""
+        return self.store.batch()
 
     def add_finding(self, title, severity, affected_systems, description,
-                    impact, poc, remediation, cvss=None, cve=None):
-        """Add a finding to the report"""
+                    impact, poc, remediation, cvss=None, cve=None, service=None):
+        """Add a finding to the report - repeats of the same title, CVE and service merge into one finding"""
+        systems = affected_systems if isinstance(affected_systems, list) else [affected_systems]
         finding = {
             'title': title,
             'severity': severity.upper(),
-            'affected_systems': affected_systems if isinstance(affected_systems, list) else [affected_systems],
+            'affected_systems': systems,
             'description': description,
             'impact': impact,
             'proof_of_concept': poc,
@@ -32,8 +58,10 @@ class ReportGenerator:
             'cve': cve,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
-        self.findings.append(finding)
+        if not self.store.add_finding(finding, service=service):
+            return None
         self.logger.log_finding(severity, affected_systems, title)
+        return finding
 
     def add_target(self, ip, hostname=None, os=None, services=None):
         """Add a target system"""
@@ -43,7 +71,17 @@ class ReportGenerator:
             'os': os or 'Unknown',
             'services': services or []
         }
-        self.targets.append(target)
+        self.store.add_target(target)
+
+    def add_scan_result(self, result):
+        """Register every scanned host and its open services as targets"""
+        with self.batch():
+            for host in result:
+                services = [
+                    f"{port.number}/{port.protocol} {port.service.name} {port.service.banner}".strip()
+                    for port in host.open_ports()
+                ]
+                self.add_target(host.address, hostname=host.hostname, services=services)
 
     def add_credential(self, system, username, password, service=None, notes=None):
         """Add discovered credentials"""
@@ -54,7 +92,7 @@ class ReportGenerator:
             'service': service or 'Unknown',
             'notes': notes or ''
         }
-        self.credentials.append(cred)
+        self.store.add_credential(cred)
 
     def add_screenshot(self, filename, description):
         """Add screenshot reference"""
@@ -63,29 +101,21 @@ class ReportGenerator:
             'description': description,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
-        self.screenshots.append(screenshot)
+        self.store.add_screenshot(screenshot)
 
-    def generate_executive_summary(self, custom_summary=None):
-        """Generate executive summary"""
+    def iter_executive_summary(self, custom_summary=None):
+        """Executive summary section, chunk by chunk"""
         if custom_summary:
-            return custom_summary
+            yield custom_summary
+            return
 
         # Count findings by severity
-        severity_counts = {
-            'CRITICAL': 0,
-            'HIGH': 0,
-            'MEDIUM': 0,
-            'LOW': 0
-        }
-
-        for finding in self.findings:
-            severity = finding['severity'].upper()
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+        counts = self.store.severity_counts()
+        severity_counts = {severity: counts.get(severity, 0) for severity in SEVERITY_ORDER}
 
         total = sum(severity_counts.values())
 
-        summary = f"""## EXECUTIVE SUMMARY
+        yield f"""## EXECUTIVE SUMMARY
 
 A comprehensive penetration test was conducted against the target environment from {datetime.now().strftime('%B %d, %Y')}.
 
@@ -103,12 +133,12 @@ A comprehensive penetration test was conducted against the target environment fr
 """
 
         if severity_counts['CRITICAL'] > 0:
-            summary += f"⚠️ **CRITICAL RISK**: {severity_counts['CRITICAL']} critical vulnerabilities require immediate attention. These vulnerabilities pose severe risk to the organization and could lead to complete system compromise, data breach, or significant operational impact.\n\n"
+            yield f"⚠️ **CRITICAL RISK**: {severity_counts['CRITICAL']} critical vulnerabilities require immediate attention. These vulnerabilities pose severe risk to the organization and could lead to complete system compromise, data breach, or significant operational impact.\n\n"
 
         if severity_counts['HIGH'] > 0:
-            summary += f"⚠️ **HIGH RISK**: {severity_counts['HIGH']} high-severity vulnerabilities were identified. These should be addressed within 30 days to prevent potential exploitation.\n\n"
+            yield f"⚠️ **HIGH RISK**: {severity_counts['HIGH']} high-severity vulnerabilities were identified. These should be addressed within 30 days to prevent potential exploitation.\n\n"
 
-        summary += """### Recommendations
+        yield """### Recommendations
 
 **Immediate Actions (0-7 days):**
 - Address all critical vulnerabilities
@@ -126,14 +156,17 @@ A comprehensive penetration test was conducted against the target environment fr
 - Implement regular penetration testing schedule
 
 """
-        return summary
 
-    def generate_scope_section(self, in_scope, out_scope, start_date=None, end_date=None):
-        """Generate scope section"""
+    def generate_executive_summary(self, custom_summary=None):
+        """Generate executive summary"""
+        return ''.join(self.iter_executive_summary(custom_summary))
+
+    def iter_scope_section(self, in_scope, out_scope, start_date=None, end_date=None):
+        """Scope section, chunk by chunk"""
         start = start_date or datetime.now().strftime('%Y-%m-%d')
         end = end_date or datetime.now().strftime('%Y-%m-%d')
 
-        scope = f"""## SCOPE AND METHODOLOGY
+        yield f"""## SCOPE AND METHODOLOGY
 
 ### Testing Timeline
 
@@ -145,13 +178,13 @@ A comprehensive penetration test was conducted against the target environment fr
 
 """
         for item in in_scope:
-            scope += f"- {item}\n"
+            yield f"- {item}\n"
 
-        scope += "\n### Out of Scope\n\n"
+        yield "\n### Out of Scope\n\n"
         for item in out_scope:
-            scope += f"- {item}\n"
+            yield f"- {item}\n"
 
-        scope += """
+        yield """
 ### Methodology
 
 The assessment followed industry-standard penetration testing methodologies including:
@@ -188,61 +221,117 @@ The assessment followed industry-standard penetration testing methodologies incl
    - Remediation recommendations
 
 """
-        return scope
 
-    def generate_findings_section(self):
-        """Generate technical findings section"""
-        if not self.findings:
-            return "## TECHNICAL FINDINGS\n\nNo vulnerabilities were identified during testing.\n"
+    def generate_scope_section(self, in_scope, out_scope, start_date=None, end_date=None):
+        """Generate scope section"""
+        return ''.join(self.iter_scope_section(in_scope, out_scope, start_date, end_date))
+
+    def finding_template(self):
+        return load_template('findings.md')
+
+    def markdown_keys(self):
+        """Render cache formats of the summary row and detail block - a template edit invalidates the blocks"""
+        return f"row/{RENDER_VERSION}", f"md/{RENDER_VERSION}/{self.finding_template().digest}"
+
+    def render_finding(self, number, finding):
+        """Markdown for one detailed finding"""
+        template = self.finding_template()
+        return f"{template.head}{number}{self.render_finding_block(finding)}"
+
+    def render_finding_block(self, finding):
+        """templates/findings.md after the finding number - the part cached per finding, since numbers shift"""
+        cvss, cve = finding.get('cvss'), finding.get('cve')
+        return self.finding_template().render_body(
+            title=finding['title'],
+            severity=finding['severity'],
+            cvss_line=f"**CVSS Score:** {cvss}\n\n" if cvss else '',
+            cve_line=f"**CVE:** {cve}\n\n" if cve else '',
+            affected_systems=''.join(f"- {system}\n" for system in finding['affected_systems']),
+            description=finding['description'],
+            impact=finding['impact'],
+            proof_of_concept=finding['proof_of_concept'],
+            remediation=finding['remediation']
+        )
 
-        # Sort findings by severity
-        severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-        sorted_findings = sorted(self.findings, key=lambda x: severity_order.get(x['severity'], 4))
+    def render_summary_row(self, finding):
+        """A findings summary table row after its number"""
+        systems = ', '.join(finding['affected_systems'][:2])
+        if len(finding['affected_systems']) > 2:
+            systems += f" (+{len(finding['affected_systems'])-2} more)"
+        return f" | {finding['severity']} | {finding['title']} | {systems} |\n"
 
-        findings_md = "## TECHNICAL FINDINGS\n\n"
+    def iter_findings_header(self, total):
+        """Findings section up to the first summary table row"""
+        if not total:
+            yield "## TECHNICAL FINDINGS\n\nNo vulnerabilities were identified during testing.\n"
+            return
+
+        yield "## TECHNICAL FINDINGS\n\n"
 
         # Summary table
-        findings_md += "### Findings Summary\n\n"
-        findings_md += "| # | Severity | Vulnerability | Affected Systems |\n"
-        findings_md += "|---|----------|---------------|------------------|\n"
+        yield "### Findings Summary\n\n"
+        yield "| # | Severity | Vulnerability | Affected Systems |\n"
+        yield "|---|----------|---------------|------------------|\n"
 
-        for i, finding in enumerate(sorted_findings, 1):
-            systems = ', '.join(finding['affected_systems'][:2])
-            if len(finding['affected_systems']) > 2:
-                systems += f" (+{len(finding['affected_systems'])-2} more)"
-            findings_md += f"| {i} | {finding['severity']} | {finding['title']} | {systems} |\n"
+    def iter_findings_section(self):
+        """Technical findings section - one chunk per table row and per finding"""
+        total = self.store.count()
+        yield from self.iter_findings_header(total)
+        if not total:
+            return
 
-        findings_md += "\n---\n\n"
+        row_key, block_key = self.markdown_keys()
+        for i, row in enumerate(self.store.rendered(row_key, self.render_summary_row), 1):
+            yield f"| {i}{row}"
 
-        # Detailed findings
-        for i, finding in enumerate(sorted_findings, 1):
-            findings_md += f"### Finding #{i}: {finding['title']}\n\n"
-            findings_md += f"**Severity:** {finding['severity']}\n\n"
+        yield "\n---\n\n"
 
-            if finding.get('cvss'):
-                findings_md += f"**CVSS Score:** {finding['cvss']}\n\n"
+        # Detailed findings - only new or changed findings are rendered, the rest come from the cache
+        head = self.finding_template().head
+        for i, block in enumerate(self.store.rendered(block_key, self.render_finding_block), 1):
+            yield f"{head}{i}{block}"
 
-            if finding.get('cve'):
-                findings_md += f"**CVE:** {finding['cve']}\n\n"
+    def generate_findings_section(self):
+        """Generate technical findings section"""
+        return ''.join(self.iter_findings_section())
 
-            findings_md += f"**Affected Systems:**\n\n"
-            for system in finding['affected_systems']:
-                findings_md += f"- {system}\n"
+    def iter_conclusion(self):
+        """Conclusion section, chunk by chunk"""
+        yield """## CONCLUSION
 
-            findings_md += f"\n**Description:**\n\n{finding['description']}\n\n"
-            findings_md += f"**Impact:**\n\n{finding['impact']}\n\n"
-            findings_md += f"**Proof of Concept:**\n\n```\n{finding['proof_of_concept']}\n```\n\n"
-            findings_md += f"**Remediation:**\n\n{finding['remediation']}\n\n"
-            findings_md += "---\n\n"
+"""
 
-        return findings_md
+        total = self.store.count()
+        if total:
+            counts = self.store.severity_counts()
+            critical_count = counts.get('CRITICAL', 0)
+            high_count = counts.get('HIGH', 0)
 
-    def generate_appendix(self, tools_used=None):
-        """Generate appendix section"""
-        appendix = "## APPENDICES\n\n"
+            if critical_count > 0 or high_count > 0:
+                yield f"""The security assessment revealed {total} vulnerabilities requiring remediation.
+
+**Priority Actions:**
+
+The identified critical and high-severity vulnerabilities pose significant risk and should be addressed immediately. Implementing the recommended security controls will substantially improve the organization's security posture.
+
+**Next Steps:**
+
+1. Review and prioritize findings with stakeholders
+2. Develop remediation plan with timelines
+3. Implement security fixes
+4. Request re-assessment to validate remediations
+5. Establish ongoing vulnerability management program
+
+"""
+        else:
+            yield "No significant vulnerabilities were identified during testing. The tested systems demonstrated adequate security controls.\n\n"
+
+    def iter_appendix(self, tools_used=None):
+        """Appendix section, chunk by chunk"""
+        yield "## APPENDICES\n\n"
 
         # Tools
-        appendix += "### Appendix A: Tools Used\n\n"
+        yield "### Appendix A: Tools Used\n\n"
         default_tools = [
             "Nmap 7.94 - Network scanning and service enumeration",
             "Metasploit Framework 6.3 - Exploitation framework",
@@ -255,26 +344,28 @@ The assessment followed industry-standard penetration testing methodologies incl
 
         tools = tools_used or default_tools
         for tool in tools:
-            appendix += f"- {tool}\n"
+            yield f"- {tool}\n"
 
         # Credentials
-        if self.credentials:
-            appendix += "\n### Appendix B: Discovered Credentials\n\n"
-            appendix += "| System | Service | Username | Password | Notes |\n"
-            appendix += "|--------|---------|----------|----------|-------|\n"
-            for cred in self.credentials:
-                appendix += f"| {cred['system']} | {cred['service']} | {cred['username']} | {cred['password']} | {cred['notes']} |\n"
+        credentials = self.credentials
+        if credentials:
+            yield "\n### Appendix B: Discovered Credentials\n\n"
+            yield "| System | Service | Username | Password | Notes |\n"
+            yield "|--------|---------|----------|----------|-------|\n"
+            for cred in credentials:
+                yield f"| {cred['system']} | {cred['service']} | {cred['username']} | {cred['password']} | {cred['notes']} |\n"
 
         # Screenshots
-        if self.screenshots:
-            appendix += "\n### Appendix C: Screenshots\n\n"
-            for screenshot in self.screenshots:
-                appendix += f"**{screenshot['filename']}**\n"
-                appendix += f"- Description: {screenshot['description']}\n"
-                appendix += f"- Timestamp: {screenshot['timestamp']}\n\n"
+        screenshots = self.screenshots
+        if screenshots:
+            yield "\n### Appendix C: Screenshots\n\n"
+            for screenshot in screenshots:
+                yield f"**{screenshot['filename']}**\n"
+                yield f"- Description: {screenshot['description']}\n"
+                yield f"- Timestamp: {screenshot['timestamp']}\n\n"
 
         # References
-        appendix += """
+        yield """
 ### Appendix D: References
 
 - OWASP Top 10: https://owasp.org/www-project-top-ten/
@@ -284,91 +375,59 @@ The assessment followed industry-standard penetration testing methodologies incl
 - CVE Database: https://cve.mitre.org/
 
 """
-        return appendix
 
-    def generate_full_report(self, client_name="Client", test_type="Penetration Test",
-                           in_scope=None, out_scope=None, custom_summary=None,
-                           tools_used=None):
-        """Generate complete report"""
+    def generate_appendix(self, tools_used=None):
+        """Generate appendix section"""
+        return ''.join(self.iter_appendix(tools_used))
 
+    def iter_report_head(self, client_name="Client", test_type="Penetration Test",
+                         in_scope=None, out_scope=None, custom_summary=None):
+        """Title page from templates/report.md, executive summary and scope"""
         in_scope = in_scope or ["Target network and systems as specified"]
         out_scope = out_scope or ["Physical security testing", "Social engineering", "Denial of Service attacks"]
 
-        report = f"""# PENETRATION TEST REPORT
-
-**Client:** {client_name}
-**Assessment Type:** {test_type}
-**Report Date:** {datetime.now().strftime('%B %d, %Y')}
-**Prepared By:** eJPT Certified Tester
-
----
-
-## TABLE OF CONTENTS
-
-1. Executive Summary
-2. Scope and Methodology
-3. Technical Findings
-4. Conclusion
-5. Appendices
-
----
-
-"""
-
-        # Add sections
-        report += self.generate_executive_summary(custom_summary) + "\n\n---\n\n"
-        report += self.generate_scope_section(in_scope, out_scope) + "\n\n---\n\n"
-        report += self.generate_findings_section() + "\n\n---\n\n"
-
-        # Conclusion
-        report += """## CONCLUSION
-
-"""
-
-        if self.findings:
-            critical_count = sum(1 for f in self.findings if f['severity'] == 'CRITICAL')
-            high_count = sum(1 for f in self.findings if f['severity'] == 'HIGH')
-
-            if critical_count > 0 or high_count > 0:
-                report += f"""The security assessment revealed {len(self.findings)} vulnerabilities requiring remediation.
-
-**Priority Actions:**
-
-The identified critical and high-severity vulnerabilities pose significant risk and should be addressed immediately. Implementing the recommended security controls will substantially improve the organization's security posture.
-
-**Next Steps:**
-
-1. Review and prioritize findings with stakeholders
-2. Develop remediation plan with timelines
-3. Implement security fixes
-4. Request re-assessment to validate remediations
-5. Establish ongoing vulnerability management program
-
-"""
-        else:
-            report += "No significant vulnerabilities were identified during testing. The tested systems demonstrated adequate security controls.\n\n"
-
-        report += "\n\n---\n\n"
-        report += self.generate_appendix(tools_used)
+        yield load_template('report.md').render(
+            client_name=client_name,
+            test_type=test_type,
+            report_date=datetime.now().strftime('%B %d, %Y')
+        )
 
-        # Save report
-        report_file = self.workspace.reports / f"pentest_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        with open(report_file, 'w') as f:
-            f.write(report)
+        for section in (self.iter_executive_summary(custom_summary), self.iter_scope_section(in_scope, out_scope)):
+            yield from section
+            yield SECTION_BREAK
+
+    def iter_report_tail(self, tools_used=None):
+        """Everything after the findings section"""
+        yield SECTION_BREAK
+        yield from self.iter_conclusion()
+        yield SECTION_BREAK
+        yield from self.iter_appendix(tools_used)
+
+    def iter_report(self, client_name="Client", test_type="Penetration Test",
+                    in_scope=None, out_scope=None, custom_summary=None,
+                    tools_used=None):
+        """The complete markdown report as a stream of chunks"""
+        yield from self.iter_report_head(client_name, test_type, in_scope, out_scope, custom_summary)
+        yield from self.iter_findings_section()
+        yield from self.iter_report_tail(tools_used)
 
-        print(f"[+] Report generated: {report_file}")
+    def generate_full_report(self, client_name="Client", test_type="Penetration Test",
+                           in_scope=None, out_scope=None, custom_summary=None,
+                           tools_used=None, formats=DEFAULT_FORMATS, workers=None):
+        """Generate complete report"""
+        # Every format is written in the same pass over the findings, straight to disk
+        exporter = ReportExporter(self, formats, workers=workers)
+        outputs = exporter.export(
+            head={'client_name': client_name, 'test_type': test_type, 'in_scope': in_scope,
+                  'out_scope': out_scope, 'custom_summary': custom_summary},
+            tail={'tools_used': tools_used}
+        )
 
-        # Also save JSON version
-        json_file = self.workspace.reports / f"findings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(json_file, 'w') as f:
-            json.dump({
-                'findings': self.findings,
-                'targets': self.targets,
-                'credentials': self.credentials,
-                'screenshots': self.screenshots
-            }, f, indent=2)
+        for path in outputs.values():
+            print(f"[+] Report generated: {path}")
 
-        return report_file
+        self.export_stats = exporter.stats
+        return outputs.get('md', next(iter(outputs.values()), None))
 
     def quick_finding(self, title, severity, target, description, commands, result, fix):
         """Quick method to add finding with minimal input"""
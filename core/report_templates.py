@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Report templates
+string.Template files from templates/, compiled once and reused until the file changes
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from string import Template
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+class CompiledTemplate:
+    """A template split at its $number placeholder
+
+    Everything after the number only depends on the finding, so it can be rendered once and cached
+    while numbering changes from report to report.
+    """
+
+    def __init__(self, text):
+        self.digest = hashlib.sha1(text.encode()).hexdigest()[:12]
+        head, marker, body = text.partition('$number')
+        if not marker:
+            head, body = '', text
+        self.head = head
+        self.body = Template(body)
+        self.template = Template(text)
+
+    def render(self, **values):
+        return self.template.safe_substitute(values)
+
+    def render_body(self, **values):
+        """The part after $number"""
+        return self.body.safe_substitute(values)
+
+_compiled = {}
+_lock = threading.Lock()
+
+def load_template(name, directory=TEMPLATE_DIR):
+    """Compiled template for templates/<name> - recompiled only when the file changes"""
+    path = Path(directory) / name
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        compiled = _compiled.get(str(path))
+        if compiled is None or compiled[0] != key:
+            compiled = _compiled[str(path)] = (key, CompiledTemplate(path.read_text(encoding='utf-8')))
+    return compiled[1]
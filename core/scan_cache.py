@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Persistent scan result cache
+Remembers per-host results between runs so repeat visits skip the rescan
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import time
+from pathlib import Path
+from core.scan_model import Host, ScanResult
+from utils.workspace import STATE_DIR
+
+DEFAULT_TTL = 24 * 60 * 60
+
+# Options that consume the following token as their value
+VALUE_OPTIONS = {
+    '-p', '-e', '-S', '-g', '-iL', '-oN', '-oX', '-oG', '-oA', '-oS',
+    '--script', '--script-args', '--top-ports', '--min-rate', '--max-rate',
+    '--exclude-ports', '--source-port', '--max-retries', '--host-timeout',
+    '--stats-every', '--resume', '--exclude', '--excludefile'
+}
+
+# Options that only affect where or how verbosely results are written
+IGNORED_OPTIONS = {
+    '-oN', '-oX', '-oG', '-oA', '-oS', '-v', '-vv', '-d', '--reason',
+    '--open', '--stats-every', '--resume', '-iL'
+}
+
+class ScanCache:
+    def __init__(self, cache_dir=None, ttl=DEFAULT_TTL, incremental=False):
+        self.root = Path(cache_dir) if cache_dir else STATE_DIR / "scan_cache"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.incremental = incremental
+
+    @staticmethod
+    def normalize_args(args):
+        """Canonical form of an nmap argument string, independent of order and output options"""
+        tokens = shlex.split(args)
+        groups = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            name = token.split('=', 1)[0]
+            if name in VALUE_OPTIONS and '=' not in token and i + 1 < len(tokens):
+                group = f"{token} {tokens[i + 1]}"
+                i += 2
+            else:
+                group = token
+                i += 1
+            if name not in IGNORED_OPTIONS:
+                groups.append(group)
+        return ' '.join(sorted(groups))
+
+    def _entry_path(self, host, args):
+        profile = hashlib.sha1(self.normalize_args(args).encode()).hexdigest()[:16]
+        name = hashlib.sha1(host.encode()).hexdigest()
+        return self.root / profile / f"{name}.json"
+
+    def get(self, host, args, ttl=None):
+        """Return (Host or None, fresh) for a cached host entry"""
+        path = self._entry_path(host, args)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, False
+
+        ttl = self.ttl if ttl is None else ttl
+        fresh = time.time() - entry['scanned_at'] < ttl
+        record = Host.from_dict(entry['record']) if entry.get('record') else None
+        return record, fresh
+
+    def put(self, host, args, record=None):
+        """Store a host result - a missing record remembers the host as down"""
+        path = self._entry_path(host, args)
+        path.parent.mkdir(exist_ok=True)
+
+        entry = {
+            'host': host,
+            'args': self.normalize_args(args),
+            'scanned_at': time.time(),
+            'record': record.to_dict() if record is not None else None
+        }
+
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def lookup(self, hosts, args):
+        """Split hosts into a cached result and the hosts that need scanning"""
+        cached = ScanResult()
+        stale = []
+
+        for host in hosts:
+            record, fresh = self.get(host, args)
+            if not fresh:
+                stale.append(host)
+            elif record is not None:
+                cached.add_host(record)
+
+        return cached, stale
+
+    def store(self, hosts, args, result):
+        """Record a fresh scan of hosts, including the ones that never answered"""
+        index = {}
+        for record in result or []:
+            index[record.address] = record
+            if record.hostname:
+                index.setdefault(record.hostname, record)
+
+        for host in hosts:
+            record = index.get(host)
+            # A cut-short scan says nothing about the hosts it never reached
+            if record is None and result is not None and result.partial:
+                continue
+            self.put(host, args, record)
+
+    def clear(self):
+        for path in self.root.glob('*/*.json'):
+            path.unlink()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Cross-workspace scan history index
+SQLite index of every host/port observation across all workspaces
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from core.nmap_parser import parse_file, parse_normal, is_normal_output
+from core.scan_model import Host, Port, Service, ScanResult
+from utils.workspace import STATE_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    workspace TEXT NOT NULL,
+    scan_type TEXT NOT NULL,
+    target TEXT NOT NULL,
+    scanned_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workspaces (
+    root TEXT PRIMARY KEY,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    protocol TEXT NOT NULL,
+    state TEXT NOT NULL,
+    service TEXT,
+    product TEXT,
+    version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_obs_host_port ON observations(host, port, protocol);
+CREATE INDEX IF NOT EXISTS idx_obs_port ON observations(port, protocol, state);
+CREATE INDEX IF NOT EXISTS idx_obs_service ON observations(service);
+CREATE INDEX IF NOT EXISTS idx_obs_run ON observations(run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs(scanned_at);
+"""
+
+class ScanIndex:
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else STATE_DIR / "scan_index.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_workspace(self, root):
+        """Remember a workspace so later refreshes find it wherever it lives"""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO workspaces (root, added) VALUES (?, ?)",
+                              (str(Path(root).resolve()), time.time()))
+
+    def workspaces(self):
+        return [row['root'] for row in self._query("SELECT root FROM workspaces ORDER BY added")]
+
+    def discover(self, search_root):
+        """Record search_root, if it is a workspace, or every ejpt_workspace_* directly under it"""
+        search_root = Path(search_root)
+        roots = [search_root] if (search_root / "scans").is_dir() else \
+            [path for path in sorted(search_root.glob('ejpt_workspace_*')) if (path / "scans").is_dir()]
+        for root in roots:
+            self.add_workspace(root)
+        return roots
+
+    def refresh(self):
+        """Index new or changed scan files - XML and -oN logs - from every recorded workspace"""
+        indexed = 0
+        for root in self.workspaces():
+            scans = Path(root) / "scans"
+            for path in sorted(scans.glob('*.xml')) + sorted(scans.glob('*.txt')):
+                if path.suffix == '.txt' and path.with_suffix('.xml').exists():
+                    # The XML twin carries versions and scripts - don't count the run twice
+                    continue
+                if self.index_file(path):
+                    indexed += 1
+        return indexed
+
+    def index_file(self, path):
+        """Index a single scan file - skipped when unchanged since the last pass"""
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT scanned_at, size FROM runs WHERE path = ?", (str(path),)
+            ).fetchone()
+            if row and row['scanned_at'] == stat.st_mtime and row['size'] == stat.st_size:
+                return False
+
+        if path.suffix == '.xml':
+            result = parse_file(path)
+        elif is_normal_output(path):
+            result = parse_normal(path)
+        else:
+            # Wordlists, nikto logs and other text that lives next to the scans
+            return False
+
+        # quick_10_0_0_1.xml -> ('quick', '10_0_0_1')
+        scan_type, _, target = path.stem.partition('_')
+        self._store(result, path, scan_type, target, stat.st_mtime, stat.st_size)
+        return True
+
+    def add_result(self, result, path, scan_type):
+        """Index a ScanResult under the file it was saved to - for backends that write no nmap XML"""
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+            scanned_at, size = stat.st_mtime, stat.st_size
+        except OSError:
+            scanned_at, size = time.time(), 0
+        _, _, target = path.stem.partition('_')
+        self._store(result, path, scan_type, target, scanned_at, size)
+
+    def _store(self, result, path, scan_type, target, scanned_at, size):
+        """Replace the run recorded for path with the hosts and ports of result"""
+        workspace = path.parent.parent.name
+        rows = [
+            (host.address, port.number, port.protocol, port.state,
+             port.service.name, port.service.product, port.service.version)
+            for host in result for port in host.ports.values()
+        ]
+
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM runs WHERE path = ?", (str(path),))
+            run_id = self.conn.execute(
+                "INSERT INTO runs (path, workspace, scan_type, target, scanned_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(path), workspace, scan_type, target, scanned_at, size)
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO observations (run_id, host, port, protocol, state, service, product, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + r for r in rows]
+            )
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def runs(self, host=None):
+        """Indexed scan runs, newest first"""
+        if host:
+            return self._query(
+                "SELECT DISTINCT r.* FROM runs r JOIN observations o ON o.run_id = r.id "
+                "WHERE o.host = ? ORDER BY r.scanned_at DESC", (host,)
+            )
+        return self._query("SELECT * FROM runs ORDER BY scanned_at DESC")
+
+    def host_history(self, host):
+        """Every port observation for a host, oldest first"""
+        return self._query(
+            "SELECT r.id AS run_id, r.scanned_at, r.workspace, r.scan_type, o.port, o.protocol, o.state, "
+            "o.service, o.product, o.version FROM observations o JOIN runs r ON r.id = o.run_id "
+            "WHERE o.host = ? ORDER BY r.scanned_at, o.port", (host,)
+        )
+
+    def port_history(self, port, protocol='tcp'):
+        """Hosts seen with a port open, with first and last sighting"""
+        return self._query(
+            "SELECT o.host, MIN(r.scanned_at) AS first_seen, MAX(r.scanned_at) AS last_seen, "
+            "COUNT(*) AS sightings FROM observations o JOIN runs r ON r.id = o.run_id "
+            "WHERE o.port = ? AND o.protocol = ? AND o.state = 'open' GROUP BY o.host ORDER BY o.host",
+            (port, protocol)
+        )
+
+    def service_history(self, service):
+        """Where a service has been seen open"""
+        return self._query(
+            "SELECT o.host, o.port, o.protocol, o.product, o.version, MAX(r.scanned_at) AS last_seen "
+            "FROM observations o JOIN runs r ON r.id = o.run_id "
+            "WHERE o.service = ? AND o.state = 'open' GROUP BY o.host, o.port, o.protocol "
+            "ORDER BY o.host, o.port", (service,)
+        )
+
+    def new_ports(self, since):
+        """Host/ports whose first open sighting is at or after the since timestamp"""
+        return self._query(
+            "SELECT o.host, o.port, o.protocol, MIN(r.scanned_at) AS first_seen, "
+            "MAX(o.service) AS service FROM observations o JOIN runs r ON r.id = o.run_id "
+            "WHERE o.state = 'open' GROUP BY o.host, o.port, o.protocol "
+            "HAVING first_seen >= ? ORDER BY first_seen, o.host, o.port", (since,)
+        )
+
+    def run_result(self, run_id):
+        """Rebuild the ScanResult recorded for a run"""
+        result = ScanResult()
+        rows = self._query(
+            "SELECT host, port, protocol, state, service, product, version FROM observations "
+            "WHERE run_id = ? ORDER BY rowid", (run_id,)
+        )
+        for row in rows:
+            host = result.get(row['host']) or result.add_host(Host(row['host']))
+            host.add_port(Port(row['port'], row['protocol'], row['state'],
+                               Service.get(row['service'] or '', row['product'] or '', row['version'] or '')))
+        return result
+
+    def diff_runs(self, old_run, new_run):
+        """ScanResult.diff between two recorded runs - opened, closed and changed ports, new and missing hosts"""
+        return self.run_result(old_run).diff(self.run_result(new_run))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Structured scan result model
+Compact host/port/service records decoded once from nmap output
+"""
+
+import sys
+
+class Service:
+    """Service fingerprint shared between every port that reports it"""
+    __slots__ = ('name', 'product', 'version', 'extrainfo')
+
+    _cache = {}
+
+    def __init__(self, name, product='', version='', extrainfo=''):
+        self.name = name
+        self.product = product
+        self.version = version
+        self.extrainfo = extrainfo
+
+    @classmethod
+    def get(cls, name='', product='', version='', extrainfo=''):
+        """Return a shared instance - /16 sweeps repeat the same banners endlessly"""
+        key = (name, product, version, extrainfo)
+        service = cls._cache.get(key)
+        if service is None:
+            service = cls._cache.setdefault(key, cls(
+                sys.intern(name), sys.intern(product), sys.intern(version), sys.intern(extrainfo)
+            ))
+        return service
+
+    @property
+    def banner(self):
+        return ' '.join(filter(None, [self.product, self.version, self.extrainfo]))
+
+    def __repr__(self):
+        return f"Service({self.name!r}, {self.banner!r})"
+
+class ScriptOutput:
+    """NSE script result"""
+    __slots__ = ('id', 'output')
+
+    def __init__(self, id, output):
+        self.id = sys.intern(id)
+        self.output = output
+
+    def __repr__(self):
+        return f"ScriptOutput({self.id!r})"
+
+class Port:
+    """Single port observation"""
+    __slots__ = ('number', 'protocol', 'state', 'service', 'scripts')
+
+    def __init__(self, number, protocol='tcp', state='open', service=None, scripts=None):
+        self.number = int(number)
+        self.protocol = sys.intern(protocol)
+        self.state = sys.intern(state)
+        self.service = service or Service.get()
+        self.scripts = scripts or ()
+
+    @property
+    def key(self):
+        return (self.number, self.protocol)
+
+    @property
+    def is_open(self):
+        return self.state == 'open'
+
+    def __repr__(self):
+        return f"Port({self.number}/{self.protocol} {self.state} {self.service.name})"
+
+class Host:
+    """Scanned host with per-host port and service indexes"""
+    __slots__ = ('address', 'hostname', 'status', 'ports', 'services', 'scripts')
+
+    def __init__(self, address, hostname=None, status='up'):
+        self.address = address
+        self.hostname = hostname
+        self.status = sys.intern(status)
+        self.ports = {}       # (number, protocol) -> Port
+        self.services = {}    # service name -> [open Port]
+        self.scripts = ()     # host-level NSE output
+
+    def add_port(self, port):
+        """Index a port, replacing any earlier observation of it"""
+        previous = self.ports.get(port.key)
+        if previous is not None and previous.is_open:
+            same_service = self.services[previous.service.name]
+            same_service.remove(previous)
+            if not same_service:
+                del self.services[previous.service.name]
+
+        self.ports[port.key] = port
+        if port.is_open:
+            self.services.setdefault(port.service.name, []).append(port)
+
+    def port(self, number, protocol='tcp'):
+        return self.ports.get((number, protocol))
+
+    def is_open(self, number, protocol='tcp'):
+        port = self.ports.get((number, protocol))
+        return port is not None and port.is_open
+
+    def has_service(self, name, number=None):
+        """Check for an open service, optionally pinned to a port number"""
+        ports = self.services.get(name)
+        if not ports:
+            return False
+        return number is None or any(p.number == number for p in ports)
+
+    def open_ports(self):
+        return [p for p in self.ports.values() if p.is_open]
+
+    def to_dict(self):
+        """Plain-data form for caches and indexes"""
+        return {
+            'address': self.address,
+            'hostname': self.hostname,
+            'status': self.status,
+            'scripts': [[s.id, s.output] for s in self.scripts],
+            'ports': [
+                [p.number, p.protocol, p.state,
+                 [p.service.name, p.service.product, p.service.version, p.service.extrainfo],
+                 [[s.id, s.output] for s in p.scripts]]
+                for p in self.ports.values()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        host = cls(data['address'], data.get('hostname'), data.get('status', 'up'))
+        host.scripts = tuple(ScriptOutput(*s) for s in data.get('scripts', []))
+        for number, protocol, state, service, scripts in data.get('ports', []):
+            host.add_port(Port(
+                number, protocol, state,
+                Service.get(*service),
+                tuple(ScriptOutput(*s) for s in scripts)
+            ))
+        return host
+
+    def __repr__(self):
+        return f"Host({self.address!r}, {len(self.ports)} ports)"
+
+class ScanResult:
+    """Collection of hosts indexed by address"""
+    __slots__ = ('hosts', 'partial')
+
+    def __init__(self, hosts=None):
+        self.hosts = {}
+        self.partial = False    # scan was cut short, missing hosts are unknown
+        for host in hosts or []:
+            self.add_host(host)
+
+    def add_host(self, host):
+        """Add a host, merging ports into an existing record"""
+        existing = self.hosts.get(host.address)
+        if existing is None:
+            self.hosts[host.address] = host
+            return host
+
+        existing.hostname = existing.hostname or host.hostname
+        existing.status = host.status
+        for port in host.ports.values():
+            existing.add_port(port)
+        if host.scripts:
+            existing.scripts = host.scripts
+        return existing
+
+    def merge(self, other):
+        for host in other:
+            self.add_host(host)
+        self.partial = self.partial or other.partial
+        return self
+
+    def get(self, address):
+        return self.hosts.get(address)
+
+    def __iter__(self):
+        return iter(self.hosts.values())
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def __bool__(self):
+        return bool(self.hosts)
+
+    def __contains__(self, address):
+        return address in self.hosts
+
+    def diff(self, newer):
+        """Compare against a newer result"""
+        changes = {
+            'new_hosts': [],
+            'missing_hosts': [],
+            'opened': [],
+            'closed': [],
+            'changed': []
+        }
+
+        for address, host in newer.hosts.items():
+            old = self.hosts.get(address)
+            if old is None:
+                changes['new_hosts'].append(host)
+                changes['opened'].extend((address, p) for p in host.open_ports())
+                continue
+
+            for key, port in host.ports.items():
+                before = old.ports.get(key)
+                if port.is_open and (before is None or not before.is_open):
+                    changes['opened'].append((address, port))
+                elif port.is_open and before.service is not port.service:
+                    changes['changed'].append((address, before, port))
+
+            for key, before in old.ports.items():
+                port = host.ports.get(key)
+                if before.is_open and (port is None or not port.is_open):
+                    changes['closed'].append((address, before))
+
+        for address, old in self.hosts.items():
+            if address not in newer.hosts:
+                changes['missing_hosts'].append(old)
+                changes['closed'].extend((address, p) for p in old.open_ports())
+
+        return changes
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Progress-aware scan watchdog
+Moves a running scan's deadline based on the throughput nmap reports
+"""
+
+import threading
+import time
+from collections import deque
+
+class ScanWatchdog:
+    def __init__(self, proc, timeout=600, max_timeout=None, stall_timeout=300, poll_interval=1.0):
+        self.proc = proc
+        self.started = time.monotonic()
+        self.base_deadline = self.started + timeout
+        self.deadline = self.base_deadline
+        self.hard_deadline = self.started + (max_timeout or timeout * 3)
+        self.stall_timeout = stall_timeout
+        self.poll_interval = poll_interval
+
+        self.percent = 0.0
+        self.eta = None
+        self.last_progress = self.started
+        self.expired = False
+        self.reason = None
+
+        self._samples = deque(maxlen=12)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def progress(self, percent, remaining=None):
+        """Record a <taskprogress> sample from nmap"""
+        now = time.monotonic()
+        with self._lock:
+            if percent > self.percent:
+                self.last_progress = now
+            self.percent = percent
+            self._samples.append((now, percent))
+            self.eta = self._estimate(remaining)
+            self._adjust(now)
+
+    def host_done(self):
+        """A finished host is progress even when no stats line arrived"""
+        with self._lock:
+            self.last_progress = time.monotonic()
+
+    def _estimate(self, remaining):
+        """Seconds left, from measured throughput or nmap's own estimate"""
+        if len(self._samples) >= 2:
+            (t0, p0), (t1, p1) = self._samples[0], self._samples[-1]
+            if p1 > p0 and t1 > t0:
+                rate = (p1 - p0) / (t1 - t0)
+                return (100.0 - p1) / rate
+        return remaining
+
+    def _adjust(self, now):
+        if self.eta is None:
+            return
+
+        projected = now + self.eta * 1.1 + 5
+        if projected <= self.deadline:
+            return
+
+        if projected <= self.hard_deadline:
+            # Nearly there - let it finish instead of throwing the work away
+            self.deadline = projected
+        else:
+            # Can't finish inside the hard limit - drop any extension and stop at the base deadline
+            # (straight away if that has passed) so the partial results are saved and resumable
+            self.deadline = self.base_deadline
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            now = time.monotonic()
+            with self._lock:
+                if now >= self.deadline:
+                    self.reason = 'deadline reached'
+                elif now - self.last_progress > self.stall_timeout:
+                    self.reason = f'no progress for {self.stall_timeout}s'
+                else:
+                    continue
+                self.expired = True
+
+            self._terminate()
+            return
+
+    def _terminate(self):
+        """Ask nmap to stop so its logs stay resumable, then force it"""
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=5)
+        except Exception:
+            self.proc.kill()
@@ -4,14 +4,56 @@ Network reconnaissance module
 Scans target infrastructure using advanced protocols
 """
 
+import ipaddress
+import os
+import re
+import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from itertools import chain, islice
 from pathlib import Path
+from core.connect_scan import ConnectScanner
+from core.nmap_parser import iter_hosts, parse_file
+from core.scan_model import ScanResult
+from core.scan_watchdog import ScanWatchdog
 from utils.colors import Colors
 
+# nmap arguments for each scan profile
+SCAN_PROFILES = {
+    'quick': "-T4 -F --min-rate=1000",
+    'full': "-sC -sV -p- --min-rate=1000",
+    'discovery': "-T4 -p- --open --min-rate=1000",
+    'service': "-sC -sV",
+    # nmap equivalent of the native connect backend, used as its cache key
+    'connect': "-sT -F"
+}
+
+DEFAULT_WORKERS = 8
+
+# Sweep hosts queued per worker - the rest of the range is generated as slots free up
+IN_FLIGHT_PER_WORKER = 4
+
+def _covers(network, ip):
+    """Whether network.hosts() yields ip"""
+    if ip not in network:
+        return False
+    if network.version == 4 and network.prefixlen < 31:
+        return ip != network.network_address and ip != network.broadcast_address
+    if network.version == 6 and network.prefixlen < 127:
+        return ip != network.network_address
+    return True
+
 class Scanner:
-    def __init__(self, workspace, logger):
+    def __init__(self, workspace, logger, workers=DEFAULT_WORKERS, cache=None, backend='nmap', index=None):
         self.workspace = workspace
         self.logger = logger
+        self.workers = workers
+        self.cache = cache
+        self.backend = backend
+        self.index = index
+        self._output_lock = threading.Lock()
 
     def quick_scan(self, target):
         """Rapid reconnaissance protocol"""
@@ -20,74 +62,468 @@ class Scanner:
         print(f"{Colors.NEON_CYAN}[TARGET]{Colors.END} {Colors.NEON_GREEN}{target}{Colors.END}")
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
 
+        if self.backend == 'connect' or not shutil.which('nmap'):
+            return self.connect_scan(target)
+
         output_file = self.workspace.get_scan_file(target, "quick")
-        cmd = f"nmap -T4 -F --min-rate=1000 -oN {output_file} {target}"
+        xml_file = self.workspace.get_scan_file(target, "quick", ext="xml")
 
-        self.logger.log_command(cmd, target)
+        def _run(spec):
+            cmd = f"nmap {SCAN_PROFILES['quick']} -oN {output_file} {spec}"
+            self.logger.log_command(cmd, target)
+
+            print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Probing network infrastructure...\n")
+            return self._run_nmap(cmd, xml_file, on_host=self._print_host)
+
+        result = self._cached(target, 'quick', _run, on_host=self._print_host)
+
+        print(f"\n{Colors.cyber_success('Scan matrix compiled')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+
+        return result
 
-        print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Probing network infrastructure...")
-        result = self._run_nmap(cmd)
+    def connect_scan(self, target, ports=None):
+        """Native asyncio TCP connect scan - no nmap required"""
+        if self.backend != 'connect':
+            print(f"{Colors.cyber_warning('nmap not found - falling back to native connect scan')}\n")
+
+        output_file = self.workspace.get_scan_file(target, "connect")
+        engine = ConnectScanner()
+
+        def _run(spec):
+            hosts = self.expand_targets(spec)
+            self.logger.log_command(f"connect-scan {len(hosts)} hosts x {len(ports) if ports else 'top 100'} ports", target)
+
+            print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Native connect scan across {len(hosts)} hosts...\n")
+            result = engine.scan(hosts, ports, on_host=self._print_host)
+
+            stats = engine.stats
+            print(f"\n{Colors.NEON_CYAN}[THROUGHPUT]{Colors.END} {Colors.NEON_GREEN}{stats['probes']} probes in {stats['elapsed']:.2f}s ({stats['rate']:.0f}/s){Colors.END} {Colors.GRAY}open={stats['open']} closed={stats['closed']} filtered={stats['filtered']} window={stats['final_concurrency']}{Colors.END}")
+            return result
+
+        if ports:
+            result = _run(target)
+        else:
+            result = self._cached(target, 'connect', _run, on_host=self._print_host)
+
+        if result is not None:
+            # Written from the merged result, so cached and rescanned hosts both land in the file
+            with open(output_file, 'w') as f:
+                for host in result:
+                    f.write(f"Host: {host.address}\n")
+                    for port in host.open_ports():
+                        f.write(f"{port.number}/{port.protocol}\topen\t{port.service.name}\n")
+                    f.write("\n")
+            if self.index:
+                # No XML to pick up later - index the result itself
+                self.index.add_result(result, output_file, 'connect')
 
         print(f"\n{Colors.cyber_success('Scan matrix compiled')}")
         print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
 
         return result
 
-    def full_scan(self, target):
+    def full_scan(self, target, pipelined=False, workers=None):
         """Comprehensive reconnaissance matrix"""
+        if pipelined:
+            return self.pipelined_scan(target, workers)
+
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
         print(f"{Colors.cyber_scan('DEEP SCAN PROTOCOL ENGAGED')}")
         print(f"{Colors.NEON_CYAN}[TARGET]{Colors.END} {Colors.NEON_GREEN}{target}{Colors.END}")
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
 
         output_file = self.workspace.get_scan_file(target, "full")
-        cmd = f"nmap -sC -sV -p- --min-rate=1000 -oN {output_file} {target}"
+        xml_file = self.workspace.get_scan_file(target, "full", ext="xml")
 
-        self.logger.log_command(cmd, target)
+        def _on_host(host):
+            self._print_host(host)
+            self._cyber_analyze_host(host)
+
+        def _run(spec):
+            cmd = f"nmap {SCAN_PROFILES['full']} -oN {output_file} {spec}"
+            self.logger.log_command(cmd, target)
 
-        print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Deploying comprehensive analysis protocols...")
-        print(f"{Colors.NEON_CYAN}[STATUS]{Colors.END} This may take several cycles...\n")
+            print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Deploying comprehensive analysis protocols...")
+            print(f"{Colors.NEON_CYAN}[STATUS]{Colors.END} This may take several cycles...\n")
 
-        result = self._run_nmap(cmd)
+            # Each host is analyzed as soon as nmap finishes with it
+            return self._run_nmap(cmd, xml_file, on_host=_on_host)
 
-        if result:
-            self._cyber_analyze_scan(result, target)
+        result = self._cached(target, 'full', _run, on_host=_on_host)
 
         print(f"\n{Colors.cyber_success('Neural scan complete')}")
         print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
 
         return result
 
-    def _run_nmap(self, cmd):
-        """Execute reconnaissance command"""
+    def pipelined_scan(self, target, workers=None):
+        """Two-stage discovery -> targeted service scan pipeline"""
+        workers = max(1, workers or self.workers)
+
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_scan('PIPELINED DEEP SCAN ENGAGED')}")
+        print(f"{Colors.NEON_CYAN}[TARGET]{Colors.END} {Colors.NEON_GREEN}{target}{Colors.END}")
+        print(f"{Colors.NEON_CYAN}[WORKERS]{Colors.END} {Colors.NEON_GREEN}{workers}{Colors.END}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+
+        def _on_host(host):
+            self._print_host(host)
+            self._cyber_analyze_host(host)
+
+        # Pipelined results are equivalent to a single-pass full scan
+        results = self._cached(target, 'full', lambda spec: self._run_pipeline(target, spec, workers), on_host=_on_host)
+
+        print(f"\n{Colors.cyber_success('Pipelined scan complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{self.workspace.scans}{Colors.END}\n")
+
+        return results
+
+    def _run_pipeline(self, target, spec, workers):
+        """Overlap the discovery and service stages for spec"""
+        discovery_file = self.workspace.get_scan_file(target, "discovery")
+        xml_file = self.workspace.get_scan_file(target, "discovery", ext="xml")
+        cmd = f"nmap {SCAN_PROFILES['discovery']} -oN {discovery_file} {spec}"
+
+        self.logger.log_command(cmd, target)
+
+        print(f"{Colors.NEON_CYAN}[STAGE 1]{Colors.END} Port discovery sweep running...")
+        print(f"{Colors.NEON_CYAN}[STAGE 2]{Colors.END} Service fingerprinting follows each discovered host...\n")
+
+        results = ScanResult()
+        pending = []
+
+        def _on_scanned(future):
+            result = future.result()
+            if not result:
+                return
+            with self._output_lock:
+                results.merge(result)
+                for host in result:
+                    self._print_host(host)
+                    self._cyber_analyze_host(host)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def _on_discovered(host):
+                ports = ','.join(str(p.number) for p in host.open_ports() if p.protocol == 'tcp')
+                if not ports:
+                    return
+                with self._output_lock:
+                    print(f"{Colors.NEON_CYAN}[DISCOVERED]{Colors.END} {Colors.NEON_GREEN}{host.address}{Colors.END} {Colors.GRAY}-> {ports}{Colors.END}")
+
+                # Hand the host to stage 2 while discovery keeps running
+                future = pool.submit(self._service_scan, host.address, ports)
+                future.add_done_callback(_on_scanned)
+                pending.append(future)
+
+            discovered = self._run_nmap(cmd, xml_file, on_host=_on_discovered)
+
+            with self._output_lock:
+                print(f"\n{Colors.cyber_info(f'Discovery complete - awaiting {len(pending)} service scans')}\n")
+
+        if discovered is None and not results:
+            return None
+
+        return results
+
+    def _service_scan(self, host, ports):
+        """Stage 2: scripts and version detection against known-open ports only"""
+        output_file = self.workspace.get_scan_file(host, "full")
+        xml_file = self.workspace.get_scan_file(host, "full", ext="xml")
+        cmd = f"nmap {SCAN_PROFILES['service']} -p {ports} -oN {output_file} {host}"
+
+        self.logger.log_command(cmd, host)
+
+        return self._run_nmap(cmd, xml_file)
+
+    def sweep(self, targets, scan_type='quick', workers=None):
+        """Parallel multi-target sweep matrix"""
+        total = self.count_targets(targets)
+        hosts = self.iter_targets(targets)
+        first = next(hosts, None)
+        if first is None:
+            print(f"{Colors.cyber_error('No targets to sweep')}")
+            return ScanResult()
+        hosts = chain((first,), hosts)
+
+        workers = max(1, min(workers or self.workers, total))
+
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_scan('PARALLEL SWEEP MATRIX ENGAGED')}")
+        print(f"{Colors.NEON_CYAN}[TARGETS]{Colors.END} {Colors.NEON_GREEN}{total} hosts{Colors.END}")
+        print(f"{Colors.NEON_CYAN}[WORKERS]{Colors.END} {Colors.NEON_GREEN}{workers}{Colors.END}")
+        print(f"{Colors.NEON_CYAN}[PROFILE]{Colors.END} {Colors.NEON_GREEN}{scan_type}{Colors.END}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+
+        results = ScanResult()
+        done = 0
+
+        # One nmap worker per host shard, results land as each host finishes. Hosts are drawn from the
+        # range a shard at a time, so a /8 never sits in memory as strings or queued futures.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+
+            def _fill():
+                for host in islice(hosts, workers * IN_FLIGHT_PER_WORKER - len(pending)):
+                    pending[pool.submit(self._scan_host, host, scan_type)] = host
+
+            _fill()
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    host = pending.pop(future)
+                    output_file, result = future.result()
+                    done += 1
+
+                    progress = f"{Colors.GRAY}[{done}/{total}]{Colors.END}"
+                    if result is None:
+                        print(f"{progress} {Colors.cyber_error(f'{host} - scan failed')}")
+                    else:
+                        results.merge(result)
+                        open_count = sum(len(h.open_ports()) for h in result)
+                        print(f"{progress} {Colors.cyber_success(host)} {Colors.GRAY}{open_count} open ports -> {output_file}{Colors.END}")
+                _fill()
+
+        print(f"\n{Colors.cyber_success('Sweep matrix compiled')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{self.workspace.scans}{Colors.END}\n")
+
+        return results
+
+    @staticmethod
+    def _target_specs(targets):
+        """Target specs with target files read line by line"""
+        if isinstance(targets, str):
+            targets = targets.replace(',', ' ').split()
+        for spec in targets:
+            if spec == '-iL':
+                continue
+            if Path(spec).is_file():
+                with open(spec) as f:
+                    lines = (line.strip() for line in f)
+                    yield from Scanner._target_specs(line for line in lines if line and not line.startswith('#'))
+            else:
+                yield spec
+
+    @staticmethod
+    def iter_targets(targets):
+        """Hosts of target lists, files and CIDR ranges, generated as they are needed
+
+        Ranges are never materialised - overlaps are skipped by checking earlier ranges, so only
+        single hosts and hostnames are remembered.
+        """
+        seen = set()
+        networks = []
+        for spec in Scanner._target_specs(targets):
+            try:
+                network = ipaddress.ip_network(spec, strict=False)
+            except ValueError:
+                # Hostname - let nmap resolve it
+                if spec not in seen:
+                    seen.add(spec)
+                    yield spec
+                continue
+
+            if network.num_addresses == 1:
+                host = str(network.network_address)
+                if host not in seen and not any(_covers(earlier, network.network_address) for earlier in networks):
+                    seen.add(host)
+                    yield host
+                continue
+
+            for ip in network.hosts():
+                if any(_covers(earlier, ip) for earlier in networks):
+                    continue
+                host = str(ip)
+                if host not in seen:
+                    yield host
+            networks.append(network)
+
+    @staticmethod
+    def count_targets(targets):
+        """Host count of a target spec without expanding it - overlapping ranges count twice"""
+        total = 0
+        for spec in Scanner._target_specs(targets):
+            try:
+                network = ipaddress.ip_network(spec, strict=False)
+            except ValueError:
+                total += 1
+                continue
+            if network.num_addresses == 1:
+                total += 1
+            elif network.version == 4:
+                # hosts() leaves out the network and broadcast addresses below /31
+                total += network.num_addresses - (2 if network.prefixlen < 31 else 0)
+            else:
+                total += network.num_addresses - (1 if network.prefixlen < 127 else 0)
+        return total
+
+    @staticmethod
+    def expand_targets(targets):
+        """Expand target lists, files and CIDR ranges into individual hosts"""
+        return list(Scanner.iter_targets(targets))
+
+    def _scan_host(self, host, scan_type):
+        """Run a single sweep shard against one host"""
+        output_file = self.workspace.get_scan_file(host, scan_type)
+        xml_file = self.workspace.get_scan_file(host, scan_type, ext="xml")
+
+        def _run(spec):
+            cmd = f"nmap {SCAN_PROFILES[scan_type]} -oN {output_file} {spec}"
+            self.logger.log_command(cmd, host)
+            return self._run_nmap(cmd, xml_file)
+
+        return output_file, self._cached(host, scan_type, _run, quiet=True)
+
+    def _cached(self, target, scan_type, run, on_host=None, quiet=False):
+        """Route a scan through the result cache when one is configured"""
+        if not self.cache:
+            return run(target)
+
+        hosts = self.expand_targets(target)
+        args = SCAN_PROFILES[scan_type]
+        cached, stale = self.cache.lookup(hosts, args)
+
+        if stale and not self.cache.incremental:
+            cached, stale = ScanResult(), hosts
+
+        for host in cached:
+            if on_host:
+                on_host(host)
+
+        if not stale:
+            if not quiet:
+                print(f"{Colors.cyber_success(f'Cache hit - {len(cached)} hosts served without rescanning')}")
+            return cached
+
+        if cached and not quiet:
+            print(f"{Colors.cyber_info(f'{len(cached)} hosts served from cache, rescanning {len(stale)} expired')}\n")
+
+        if len(stale) == len(hosts):
+            spec = target
+        else:
+            # Only the expired hosts go back to nmap
+            target_list = self.workspace.scans / f"rescan_{scan_type}_targets.txt"
+            target_list.write_text('\n'.join(stale) + '\n')
+            spec = f"-iL {target_list}"
+
+        result = run(spec)
+        if result is None:
+            return cached or None
+
+        self.cache.store(stale, args, result)
+        return cached.merge(result)
+
+    def _run_nmap(self, cmd, xml_file=None, on_host=None, timeout=600, resume=False):
+        """Execute reconnaissance command, streaming hosts as they complete"""
+        # --resume replays the original arguments, which already stream XML
+        full_cmd = cmd if resume else f"{cmd} -oX - --stats-every 10s"
+        if os.name == 'posix':
+            # Replace the shell so the watchdog signals nmap itself
+            full_cmd = f"exec {full_cmd}"
+
         try:
-            result = subprocess.run(
-                cmd,
+            proc = subprocess.Popen(
+                full_cmd,
                 shell=True,
-                capture_output=True,
-                text=True,
-                timeout=600
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
             )
-            return result.stdout
-        except subprocess.TimeoutExpired:
-            print(f"{Colors.cyber_error('Scan timeout - target may be protected')}")
+        except Exception as e:
+            print(f"{Colors.cyber_error(f'Scan failure: {e}')}")
             return None
+
+        watchdog = ScanWatchdog(proc, timeout=timeout).start()
+        hosts = ScanResult()
+
+        def _on_host(host):
+            watchdog.host_done()
+            hosts.add_host(host)
+            if on_host:
+                on_host(host)
+
+        try:
+            with open(xml_file, 'wb') if xml_file else nullcontext() as tee:
+                for host in iter_hosts(proc.stdout, tee, on_progress=watchdog.progress):
+                    _on_host(host)
+            proc.wait()
         except Exception as e:
+            proc.kill()
             print(f"{Colors.cyber_error(f'Scan failure: {e}')}")
             return None
+        finally:
+            watchdog.stop()
+            proc.stdout.close()
+
+        if xml_file and self.index:
+            # Land the new scan in the cross-workspace history right away
+            self.index.index_file(xml_file)
+
+        if watchdog.expired:
+            # Keep everything nmap finished before the cut
+            hosts.partial = True
+            print(f"{Colors.cyber_warning(f'Scan stopped ({watchdog.reason}) at {watchdog.percent:.0f}% - salvaged {len(hosts)} hosts')}")
+
+            log_file = re.search(r'-oN\s+(\S+)', cmd)
+            if log_file and not resume:
+                print(f"{Colors.NEON_CYAN}[RESUME]{Colors.END} {Colors.NEON_GREEN}python3 ejpt_helper.py --resume {log_file.group(1)}{Colors.END}")
+
+        return hosts
+
+    def resume_scan(self, log_file):
+        """Continue an interrupted scan from its -oN log"""
+        log_file = Path(log_file)
 
-    def _cyber_analyze_scan(self, output, target):
-        """Analyze scan results and generate attack vectors"""
-        if not output:
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_scan('SCAN RESUMPTION PROTOCOL')}")
+        print(f"{Colors.NEON_CYAN}[LOG]{Colors.END} {Colors.NEON_GREEN}{log_file}{Colors.END}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+
+        # Hosts salvaged by the interrupted run
+        result = ScanResult()
+        partial_xml = log_file.with_suffix('.xml')
+        if partial_xml.exists():
+            result = parse_file(partial_xml)
+            print(f"{Colors.cyber_info(f'{len(result)} hosts recovered from {partial_xml}')}\n")
+            for host in result:
+                self._print_host(host)
+
+        cmd = f"nmap --resume {log_file}"
+        self.logger.log_command(cmd)
+
+        print(f"\n{Colors.NEON_CYAN}[SCANNING]{Colors.END} Continuing from the last completed host...\n")
+        resumed = self._run_nmap(cmd, log_file.with_suffix('.resume.xml'), on_host=self._print_host, resume=True)
+        if resumed is not None:
+            result.merge(resumed)
+            result.partial = resumed.partial
+
+        print(f"\n{Colors.cyber_success('Resumed scan complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{log_file}{Colors.END}\n")
+
+        return result
+
+    def _print_host(self, host):
+        """Display open ports for a completed host"""
+        open_ports = host.open_ports()
+        label = host.address + (f" ({host.hostname})" if host.hostname else '')
+
+        print(f"{Colors.NEON_CYAN}[HOST]{Colors.END} {Colors.NEON_GREEN}{label}{Colors.END} {Colors.GRAY}{len(open_ports)} open ports{Colors.END}")
+        for port in open_ports:
+            print(f"  {Colors.NEON_GREEN}►{Colors.END} {port.number}/{port.protocol} {Colors.NEON_CYAN}{port.service.name}{Colors.END} {Colors.GRAY}{port.service.banner}{Colors.END}")
+
+    def _cyber_analyze_host(self, host):
+        """Analyze a host's open ports and generate attack vectors"""
+        if not host.services:
             return
 
+        target = host.address
+
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
-        print(f"{Colors.NEON_CYAN}[NEURAL ANALYSIS]{Colors.END} Computing attack vectors...\n")
+        print(f"{Colors.NEON_CYAN}[NEURAL ANALYSIS]{Colors.END} Computing attack vectors for {Colors.NEON_GREEN}{target}{Colors.END}...\n")
 
         suggestions = []
 
         # FTP Detection
-        if "21/tcp" in output and "ftp" in output.lower():
+        if host.has_service('ftp', 21):
             suggestions.append({
                 'service': 'FTP',
                 'port': '21',
@@ -99,7 +535,7 @@ class Scanner:
             })
 
         # SSH Detection
-        if "22/tcp" in output and "ssh" in output.lower():
+        if host.has_service('ssh', 22):
             suggestions.append({
                 'service': 'SSH',
                 'port': '22',
@@ -111,12 +547,12 @@ class Scanner:
             })
 
         # HTTP/HTTPS Detection
-        if any(port in output for port in ["80/tcp", "443/tcp", "8080/tcp"]):
-            port = '80' if '80/tcp' in output else ('443' if '443/tcp' in output else '8080')
-            protocol = 'https' if port == '443' else 'http'
+        web_port = next((port for port in (80, 443, 8080) if host.is_open(port)), None)
+        if web_port:
+            protocol = 'https' if web_port == 443 else 'http'
             suggestions.append({
                 'service': 'WEB',
-                'port': port,
+                'port': str(web_port),
                 'priority': 'CRITICAL',
                 'vectors': [
                     f'curl {protocol}://{target}/robots.txt',
@@ -128,7 +564,7 @@ class Scanner:
             })
 
         # SMB Detection
-        if "445/tcp" in output:
+        if host.is_open(445):
             suggestions.append({
                 'service': 'SMB',
                 'port': '445',
@@ -141,7 +577,7 @@ class Scanner:
             })
 
         # MySQL Detection
-        if "3306/tcp" in output and "mysql" in output.lower():
+        if host.has_service('mysql', 3306):
             suggestions.append({
                 'service': 'MYSQL',
                 'port': '3306',
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Soft-404 detection
+Per-host fingerprints of responses to paths that cannot exist
+"""
+
+import hashlib
+import re
+import secrets
+import threading
+from urllib.parse import quote, urlsplit
+
+# Body bytes that go into a fingerprint - matches the Range prefix WebHunter fetches
+PREFIX_BYTES = 512
+
+# One random path per suffix - servers often route by extension
+BASELINE_SUFFIXES = ('', '.php', '.html', '.txt', '.zip', '/')
+
+_DIGITS = re.compile(rb'\d+')
+_SPACE = re.compile(rb'\s+')
+
+def host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+def random_paths(suffixes=BASELINE_SUFFIXES):
+    for suffix in suffixes:
+        yield f"{secrets.token_hex(12)}{suffix}"
+
+class Soft404Cache:
+    def __init__(self):
+        self._baselines = {}    # host key -> {fingerprint}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(status, length, body, path='', location=None):
+        """(status, length bucket, normalized body hash) - stable across paths on one host"""
+        status = 200 if status == 206 else status
+        text = (body or b'')[:PREFIX_BYTES].lower()
+        if location:
+            text += b'\n' + location.lower().encode('latin-1', 'ignore')
+
+        # Error pages echo the requested path and timestamps - take both out
+        path = path.strip('/')
+        for token in {path, quote(path), path.rsplit('/', 1)[-1]}:
+            token = token.lower().encode('latin-1', 'ignore')
+            if len(token) > 1:
+                length -= text.count(token) * len(token)
+                text = text.replace(token, b'')
+        text = _SPACE.sub(b' ', _DIGITS.sub(b'0', text)).strip()
+
+        digest = hashlib.sha1(text).hexdigest()[:16]
+        return status, max(0, length).bit_length(), digest
+
+    def has_baseline(self, url):
+        with self._lock:
+            return host_key(url) in self._baselines
+
+    def learn(self, url, fingerprints):
+        """Record the baseline for a host - an empty one means it answers 404 properly"""
+        with self._lock:
+            self._baselines.setdefault(host_key(url), set()).update(fingerprints)
+
+    def is_wildcard(self, url, fingerprint):
+        with self._lock:
+            return fingerprint in self._baselines.get(host_key(url), ())
+
+    def catch_all_statuses(self, url):
+        """Statuses the host returns for nonexistent paths"""
+        with self._lock:
+            return {fp[0] for fp in self._baselines.get(host_key(url), ())}
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+External tool output parsers
+Tails gobuster/nikto output files while the tools run, line by line
+"""
+
+import re
+import time
+from urllib.parse import urljoin
+from core.dir_enum import DirHit
+
+# /admin                (Status: 301) [Size: 312] [--> http://10.0.0.5/admin/]
+GOBUSTER_LINE = re.compile(
+    r'^(?P<path>\S+)\s+\(Status:\s*(?P<status>\d+)\)'
+    r'(?:\s+\[Size:\s*(?P<size>\d+)\])?'
+    r'(?:\s+\[-->\s*(?P<redirect>[^\]]+)\])?'
+)
+
+# + OSVDB-3092: GET /admin/: This might be interesting...
+NIKTO_LINE = re.compile(
+    r'^\+\s+(?:(?P<reference>(?:OSVDB|CVE)-[\d-]+):\s+)?'
+    r'(?:(?P<method>GET|HEAD|POST|PUT|DELETE|OPTIONS|TRACE|PROPFIND)\s+)?'
+    r'(?:(?P<path>/\S*?):\s+)?(?P<message>.+)$'
+)
+
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,}')
+
+# Banner and run-summary lines, not findings
+NIKTO_METADATA = (
+    'Target IP', 'Target Hostname', 'Target Port', 'Start Time', 'End Time',
+    'SSL Info', 'Subject', 'Ciphers', 'Issuer', 'Server:', 'No CGI Directories found',
+    'Root page / redirects to'
+)
+NIKTO_SUMMARY = re.compile(r'^\+\s+\d+ (?:host\(s\) tested|requests:)')
+
+# Message keywords -> severity, checked in order
+NIKTO_SEVERITY = (
+    ('HIGH', ('remote code', 'command execution', 'shell', 'sql injection', 'file inclusion',
+              'arbitrary file', 'password', 'credentials')),
+    ('MEDIUM', ('directory indexing', 'backup', 'default file', 'default account', 'xss',
+                'cross-site', 'phpinfo', 'config', 'outdated', 'appears to be outdated',
+                'put method', 'delete method', 'webdav')),
+    ('LOW', ('header', 'cookie', 'etag', 'allowed http methods', 'banner')),
+)
+
+# Path fragments that make a discovered directory worth more than an inventory line
+SENSITIVE_PATHS = (
+    '.git', '.svn', '.env', '.htpasswd', 'backup', '.bak', '.old', '.sql', 'config',
+    'phpinfo', 'admin', 'phpmyadmin', 'manager', 'console', 'upload', 'wp-config'
+)
+
+class NiktoItem:
+    __slots__ = ('url', 'reference', 'method', 'path', 'message')
+
+    def __init__(self, url, reference, method, path, message):
+        self.url = url
+        self.reference = reference
+        self.method = method
+        self.path = path
+        self.message = message
+
+    @property
+    def severity(self):
+        text = self.message.lower()
+        for severity, keywords in NIKTO_SEVERITY:
+            if any(keyword in text for keyword in keywords):
+                return severity
+        return 'LOW' if self.reference else 'INFO'
+
+    @property
+    def cve(self):
+        found = CVE_PATTERN.search(f"{self.reference or ''} {self.message}")
+        return found.group(0) if found else None
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'reference': self.reference,
+            'method': self.method,
+            'path': self.path,
+            'message': self.message
+        }
+
+def parse_gobuster_line(line, base_url):
+    """DirHit for one gobuster dir result line, or None"""
+    match = GOBUSTER_LINE.match(line.strip())
+    if not match:
+        return None
+    path = match.group('path')
+    url = path if '://' in path else urljoin(base_url.rstrip('/') + '/', path.lstrip('/'))
+    size = match.group('size')
+    redirect = match.group('redirect')
+    return DirHit(url, path, int(match.group('status')), int(size) if size else None,
+                  redirect.strip() if redirect else None)
+
+def parse_nikto_line(line, base_url):
+    """NiktoItem for one nikto text-report line, or None for banners and summaries"""
+    line = line.strip()
+    if not line.startswith('+ '):
+        return None
+    if line[2:].lstrip().startswith(NIKTO_METADATA) or NIKTO_SUMMARY.match(line):
+        return None
+    match = NIKTO_LINE.match(line)
+    if not match:
+        return None
+    path = match.group('path')
+    url = urljoin(base_url.rstrip('/') + '/', path.lstrip('/')) if path else base_url
+    return NiktoItem(url, match.group('reference'), match.group('method'), path,
+                     match.group('message').strip())
+
+def is_sensitive_path(path):
+    path = path.lower()
+    return any(fragment in path for fragment in SENSITIVE_PATHS)
+
+def follow(path, proc, timeout=None, poll_interval=0.25):
+    """Yield lines appended to path while proc runs, then the rest once it exits
+
+    The process is killed if it outlives timeout seconds; lines already written still come through.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    position = 0
+    pending = ''
+
+    while True:
+        running = proc.poll() is None
+        if running and deadline and time.monotonic() > deadline:
+            proc.kill()
+            proc.wait()
+            running = False
+
+        try:
+            with open(path, errors='replace') as f:
+                f.seek(position)
+                data = f.read()
+                position = f.tell()
+        except FileNotFoundError:
+            data = ''
+
+        if data:
+            pending += data
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                yield line.rstrip('\r')
+        elif not running:
+            break
+        else:
+            time.sleep(poll_interval)
+
+    if pending.strip():
+        yield pending.rstrip('\r')
@@ -5,14 +5,81 @@ Probes web infrastructure for security vulnerabilities
 """
 
 import subprocess
+import threading
 import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from core.crawler import Crawler, DEFAULT_MAX_PAGES
+from core.dir_enum import DirEnumerator, DEFAULT_EXTENSIONS
+from core.fuzzer import Fuzzer, DEFAULT_TYPES as FUZZ_TYPES
+from core.loot_store import LootStore, DEFAULT_MAX_BYTES
+from core.soft404 import Soft404Cache, PREFIX_BYTES, random_paths
+from core.tool_output import follow, parse_gobuster_line, parse_nikto_line, is_sensitive_path
+from core.wordlist import Wordlist
 from utils.colors import Colors
 
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Sensitive paths probed by quick_check - extend per instance with add_probe()
+DEFAULT_PROBES = {
+    'robots.txt': 'robots.txt',
+    'sitemap.xml': 'sitemap.xml',
+    '.git/HEAD': '.git/HEAD',
+    '.env': '.env',
+    'backup.zip': 'backup.zip',
+    'phpinfo.php': 'phpinfo.php',
+    'config.php': 'config.php'
+}
+
+# Leading bytes that confirm a probe really is the file it claims to be
+PROBE_SIGNATURES = {
+    '.git/HEAD': (b'ref: ',),
+    'backup.zip': (b'PK\x03\x04', b'PK\x05\x06'),
+    'sitemap.xml': (b'<?xml', b'<urlset', b'<sitemapindex')
+}
+
+# Probes whose full body is worth downloading - the rest are only reported
+LOOT_PROBES = {'robots.txt', '.git/HEAD', '.env', 'backup.zip', 'config.php'}
+
+DEFAULT_WORKERS = 16
+
+def build_session(pool_size=DEFAULT_WORKERS):
+    """Keep-alive session with a connection pool sized for the probe workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.verify = False
+    return session
+
 class WebHunter:
-    def __init__(self, workspace, logger):
+    def __init__(self, workspace, logger, workers=DEFAULT_WORKERS, probes=None, loot_max_bytes=DEFAULT_MAX_BYTES,
+                 report=None):
         self.workspace = workspace
         self.logger = logger
+        self.report = report
+        self.workers = workers
+        self.probes = dict(DEFAULT_PROBES)
+        self.probes.update(probes or {})
+        self.signatures = dict(PROBE_SIGNATURES)
+        self.loot_probes = set(LOOT_PROBES) | set(probes or {})
+        self.session = build_session(workers)
+        self.loot = LootStore(workspace.loot, max_bytes=loot_max_bytes)
+        self.soft404 = Soft404Cache()
+        self.transferred = 0
+        self._transfer_lock = threading.Lock()
+    
+    def add_probe(self, name, path, signatures=None, loot=True):
+        """Register an extra path for quick_check"""
+        self.probes[name] = path.lstrip('/')
+        if signatures:
+            self.signatures[name] = tuple(signatures)
+        if loot:
+            self.loot_probes.add(name)
+        else:
+            self.loot_probes.discard(name)
     
     def quick_check(self, url):
         """Rapid web application reconnaissance"""
@@ -21,64 +88,299 @@ class WebHunter:
         print(f"{Colors.NEON_CYAN}[TARGET]{Colors.END} {Colors.NEON_GREEN}{url}{Colors.END}")
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
         
-        checks = {
-            'robots.txt': f'{url}/robots.txt',
-            'sitemap.xml': f'{url}/sitemap.xml',
-            '.git/HEAD': f'{url}/.git/HEAD',
-            '.env': f'{url}/.env',
-            'backup.zip': f'{url}/backup.zip',
-            'phpinfo.php': f'{url}/phpinfo.php',
-            'config.php': f'{url}/config.php'
-        }
+        print(f"{Colors.NEON_CYAN}[PROBING]{Colors.END} Scanning web infrastructure...\n")
         
-        findings = []
+        findings = self._run_probes([url])[url]
+        
+        print(f"\n{Colors.cyber_success('Web reconnaissance complete')}")
+        print(f"{Colors.NEON_CYAN}[FINDINGS]{Colors.END} {Colors.NEON_GREEN}{len(findings)} vulnerable endpoints located{Colors.END} {Colors.GRAY}({self.transferred} body bytes fetched){Colors.END}\n")
+        
+        return findings
+    
+    def quick_check_many(self, urls):
+        """Rapid reconnaissance across many web applications at once"""
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_scan('WEB APPLICATION ANALYSIS PROTOCOL')}")
+        print(f"{Colors.NEON_CYAN}[TARGETS]{Colors.END} {Colors.NEON_GREEN}{len(urls)} applications{Colors.END}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
         
         print(f"{Colors.NEON_CYAN}[PROBING]{Colors.END} Scanning web infrastructure...\n")
         
-        for name, check_url in checks.items():
-            try:
-                response = requests.get(check_url, timeout=5, verify=False)
-                if response.status_code == 200:
-                    print(f"{Colors.cyber_success(f'Located: {name}')}")
-                    findings.append(name)
-                    
-                    # Save content
-                    output_file = self.workspace.loot / f"{name.replace('/', '_')}.txt"
-                    with open(output_file, 'w') as f:
-                        f.write(response.text)
+        results = self._run_probes(urls)
+        
+        total = sum(len(found) for found in results.values())
+        print(f"\n{Colors.cyber_success('Web reconnaissance complete')}")
+        print(f"{Colors.NEON_CYAN}[FINDINGS]{Colors.END} {Colors.NEON_GREEN}{total} vulnerable endpoints located across {len(urls)} applications{Colors.END} {Colors.GRAY}({self.transferred} body bytes fetched){Colors.END}\n")
+        
+        return results
+    
+    def _run_probes(self, urls):
+        """Fire every probe against every base URL concurrently over the shared pool"""
+        results = {url: [] for url in urls}
+        tagged = len(urls) > 1
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Learn how each host answers for paths that cannot exist before trusting any 200
+            for url in pool.map(self._baseline, urls):
+                statuses = self.soft404.catch_all_statuses(url)
+                if statuses:
+                    codes = ', '.join(str(code) for code in sorted(statuses))
+                    print(f"{Colors.cyber_warning(f'{urlparse(url).netloc} answers nonexistent paths with {codes} - filtering soft-404s')}")
+            
+            futures = {
+                pool.submit(self._probe, f"{url.rstrip('/')}/{path}", name, path): (url, name)
+                for url in urls
+                for name, path in self.probes.items()
+            }
+            
+            for future in as_completed(futures):
+                url, name = futures[future]
+                label = f"{urlparse(url).netloc} {name}" if tagged else name
+                status, hit, record = future.result()
+                
+                if status is None:
+                    print(f"{Colors.GRAY}[TIMEOUT] {label}{Colors.END}")
+                elif hit:
+                    if record is not None:
+                        size = f"{record.size}b{' (truncated)' if record.truncated else ''}"
+                        print(f"{Colors.cyber_success(f'Located: {label}')} {Colors.GRAY}{size} sha256:{record.sha256[:12]}{Colors.END}")
+                    else:
+                        print(f"{Colors.cyber_success(f'Located: {label}')}")
+                    results[url].append(name)
                     
                     self.logger.log_finding("Exposed File", url, name)
                 else:
-                    print(f"{Colors.GRAY}[{response.status_code}] {name}{Colors.END}")
-            except:
-                print(f"{Colors.GRAY}[TIMEOUT] {name}{Colors.END}")
+                    print(f"{Colors.GRAY}[{status}] {label}{Colors.END}")
         
-        print(f"\n{Colors.cyber_success('Web reconnaissance complete')}")
-        print(f"{Colors.NEON_CYAN}[FINDINGS]{Colors.END} {Colors.NEON_GREEN}{len(findings)} vulnerable endpoints located{Colors.END}\n")
+        return results
+    
+    def _baseline(self, url):
+        """Fingerprint the host's answers to random paths, once per host"""
+        if self.soft404.has_baseline(url):
+            return url
         
-        return findings
+        fingerprints = set()
+        for path in random_paths():
+            response = self._request('GET', f"{url.rstrip('/')}/{path}", headers={'Range': f'bytes=0-{PREFIX_BYTES - 1}'})
+            if response is None:
+                continue
+            try:
+                if response.status_code not in (404, 410):
+                    prefix = response.raw.read(PREFIX_BYTES, decode_content=True)
+                    fingerprints.add(self.soft404.fingerprint(
+                        response.status_code, self._body_length(response, prefix), prefix,
+                        path, response.headers.get('Location')
+                    ))
+            except requests.RequestException:
+                pass
+            finally:
+                response.close()
+        
+        self.soft404.learn(url, fingerprints)
+        return url
     
-    def directory_enum(self, url, wordlist='/usr/share/wordlists/dirb/common.txt'):
+    def _probe(self, check_url, name, path=''):
+        """HEAD, then a Range GET for the body prefix - the full body only for loot"""
+        head = self._request('HEAD', check_url)
+        if head is not None and head.status_code in (404, 410):
+            return head.status_code, None, None
+        
+        signatures = self.signatures.get(name)
+        loot = name in self.loot_probes
+        trusted = 200 not in self.soft404.catch_all_statuses(check_url)
+        if head is not None and head.status_code == 200 and trusted and not signatures and not loot:
+            return 200, True, None
+        
+        # HEAD unsupported, inconclusive or not enough - look at the first bytes
+        response = self._request('GET', check_url, headers={'Range': f'bytes=0-{PREFIX_BYTES - 1}'})
+        if response is None:
+            return None, None, None
+        
+        status = response.status_code
+        try:
+            if status not in (200, 206):
+                return status, None, None
+            
+            prefix = response.raw.read(PREFIX_BYTES, decode_content=True)
+            self._count(len(prefix))
+            fingerprint = self.soft404.fingerprint(
+                status, self._body_length(response, prefix), prefix, path, response.headers.get('Location')
+            )
+            if self.soft404.is_wildcard(check_url, fingerprint):
+                return 'soft-404', None, None
+            if signatures and not prefix.lstrip().startswith(signatures):
+                return status, None, None
+            if not loot:
+                return 200, True, None
+            
+            # Small files are already complete - no second request needed
+            complete = status == 206 and self._range_total(response) == len(prefix)
+            if status == 200 and len(prefix) < PREFIX_BYTES:
+                complete = True
+            if complete:
+                record = self.loot.save(check_url, [prefix], name, response.headers.get('Content-Type'))
+                return 200, True, record
+        finally:
+            response.close()
+        
+        response = self._request('GET', check_url)
+        if response is None or response.status_code != 200:
+            if response is not None:
+                response.close()
+            return None, None, None
+        try:
+            record = self.loot.save_response(check_url, response, name)
+        except (requests.RequestException, OSError):
+            return None, None, None
+        self._count(record.size)
+        return 200, True, record
+    
+    def _count(self, size):
+        with self._transfer_lock:
+            self.transferred += size
+    
+    @staticmethod
+    def _range_total(response):
+        """Full length from a Content-Range header (bytes 0-511/1234)"""
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    
+    def _body_length(self, response, prefix):
+        """Full body length of a ranged response, falling back to what was read"""
+        if response.status_code == 206:
+            total = self._range_total(response)
+        else:
+            total = response.headers.get('Content-Length', '')
+            total = int(total) if total.isdigit() else None
+        return len(prefix) if total is None else total
+    
+    def _request(self, method, check_url, headers=None):
+        try:
+            return self.session.request(method, check_url, headers=headers, timeout=5,
+                                        stream=True, allow_redirects=False)
+        except requests.RequestException:
+            return None
+    
+    def directory_enum(self, url, wordlist='/usr/share/wordlists/dirb/common.txt', engine='native',
+                       extensions=DEFAULT_EXTENSIONS, concurrency=50, rate_limit=None):
         """Directory structure enumeration"""
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
         print(f"{Colors.cyber_scan('DIRECTORY ENUMERATION PROTOCOL')}")
         print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
         
+        if engine == 'gobuster':
+            return self._gobuster_enum(url, wordlist, extensions)
+        
+        parsed = urlparse(url)
+        output_file = self.workspace.scans / f"dirs_{parsed.netloc.replace(':', '_')}.jsonl"
+        enumerator = DirEnumerator(concurrency=concurrency, rate_limit=rate_limit, extensions=extensions,
+                                   soft404=self.soft404)
+        
+        self.logger.log_command(f"dir-enum {url} -w {getattr(wordlist, 'path', wordlist)} -x {','.join(extensions)} -c {concurrency}", url)
+        
+        print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Mapping directory structure...\n")
+        
+        def _on_hit(hit):
+            self._print_dir_hit(hit)
+            self._report_dir_hit(hit, 'native enumerator')
+        
+        try:
+            hits = enumerator.run(url, wordlist, output_file, on_hit=_on_hit)
+        except OSError as e:
+            print(f"{Colors.cyber_error(f'Enumeration protocol failed: {e}')}\n")
+            return []
+        
+        stats = enumerator.stats
+        print(f"\n{Colors.NEON_CYAN}[THROUGHPUT]{Colors.END} {Colors.NEON_GREEN}{stats['requests']} requests in {stats['elapsed']:.2f}s ({stats['rate']:.0f}/s){Colors.END} {Colors.GRAY}connections={stats['connections']} soft404={stats['soft404']} errors={stats['errors']}{Colors.END}")
+        print(f"{Colors.cyber_success('Directory mapping complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        
+        return hits
+    
+    def crawl(self, url, max_pages=DEFAULT_MAX_PAGES, concurrency=20, rate_limit=None):
+        """Crawl a web application from its root, robots.txt and sitemap.xml"""
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_scan('WEB CRAWL PROTOCOL')}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+        
+        parsed = urlparse(url)
+        output_file = self.workspace.scans / f"crawl_{parsed.netloc.replace(':', '_')}.jsonl"
+        crawler = Crawler(concurrency=concurrency, rate_limit=rate_limit, max_pages=max_pages)
+        
+        self.logger.log_command(f"crawl {url} --max-pages {max_pages} -c {concurrency}", url)
+        
+        print(f"{Colors.NEON_CYAN}[CRAWLING]{Colors.END} Following links from robots.txt, sitemap.xml and /...\n")
+        
+        def _on_page(page):
+            if page['status'] != 404:
+                print(f"{Colors.GRAY}[{page['status']}] {page['url']} ({page['length']}b, {page['links']} links){Colors.END}")
+        
+        try:
+            stats = crawler.run(url, output_file, on_page=_on_page)
+        except OSError as e:
+            print(f"{Colors.cyber_error(f'Crawl failed: {e}')}\n")
+            return None
+        
+        print(f"\n{Colors.NEON_CYAN}[THROUGHPUT]{Colors.END} {Colors.NEON_GREEN}{stats['pages']} pages in {stats['elapsed']:.2f}s ({stats['rate']:.0f} pages/s){Colors.END} {Colors.GRAY}unique={stats['unique_urls']} dropped={stats['dropped']} errors={stats['errors']}{Colors.END}")
+        print(f"{Colors.cyber_success('Crawl complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        
+        return stats
+    
+    def _gobuster_enum(self, url, wordlist, extensions):
         parsed = urlparse(url)
         output_file = self.workspace.scans / f"gobuster_{parsed.netloc}.txt"
         
-        cmd = f"gobuster dir -u {url} -w {wordlist} -x php,html,txt -o {output_file}"
+        if isinstance(wordlist, Wordlist):
+            # gobuster reads plain files - a filtered view is written out once for it
+            wordlist = wordlist.write(self.workspace.scans / f"wordlist_{parsed.netloc}.txt") if wordlist.spec else wordlist.path
         
-        self.logger.log_command(cmd, url)
+        cmd = ['gobuster', 'dir', '-u', url, '-w', str(wordlist), '-x', ','.join(extensions), '-o', str(output_file)]
+        
+        self.logger.log_command(' '.join(cmd), url)
         
         print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Mapping directory structure...\n")
         
+        hits = []
+        output_file.unlink(missing_ok=True)
         try:
-            subprocess.run(cmd, shell=True, timeout=300)
-            print(f"\n{Colors.cyber_success('Directory mapping complete')}")
-            print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
-        except:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
             print(f"{Colors.cyber_error('Enumeration protocol failed')}\n")
+            return hits
+        
+        # Results become findings as gobuster writes them, not after it exits
+        for line in follow(output_file, proc, timeout=300):
+            hit = parse_gobuster_line(line, url)
+            if hit is None:
+                continue
+            hits.append(hit)
+            self._print_dir_hit(hit)
+            self._report_dir_hit(hit, 'gobuster')
+        
+        print(f"\n{Colors.cyber_success('Directory mapping complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        return hits
+    
+    def _print_dir_hit(self, hit):
+        redirect = f" -> {hit.redirect}" if hit.redirect else ''
+        length = f" {hit.length}b" if hit.length is not None else ''
+        print(f"{Colors.cyber_success(f'Located: {hit.path}')} {Colors.GRAY}[{hit.status}]{length}{redirect}{Colors.END}")
+    
+    def _report_dir_hit(self, hit, tool):
+        if self.report is None:
+            return
+        sensitive = is_sensitive_path(hit.path)
+        self.report.add_finding(
+            title=f"{'Sensitive' if sensitive else 'Discovered'} web path: {hit.path}",
+            severity='LOW' if sensitive and hit.status < 400 else 'INFO',
+            affected_systems=hit.url,
+            description=f"Directory enumeration ({tool}) found {hit.path} answering HTTP {hit.status}.",
+            impact="Unlinked content widens the attack surface and may expose administrative functions or sensitive files.",
+            poc=f"GET {hit.url} -> {hit.status}" + (f" (redirects to {hit.redirect})" if hit.redirect else ''),
+            remediation="Remove content that should not be deployed and restrict administrative paths to trusted networks.",
+            service='http'
+        )
     
     def nikto_scan(self, url):
         """Nikto web server scan"""
@@ -89,15 +391,87 @@ class WebHunter:
         parsed = urlparse(url)
         output_file = self.workspace.scans / f"nikto_{parsed.netloc}.txt"
         
-        cmd = f"nikto -h {url} -o {output_file}"
+        cmd = ['nikto', '-h', url, '-o', str(output_file), '-Format', 'txt']
         
-        self.logger.log_command(cmd, url)
+        self.logger.log_command(' '.join(cmd), url)
         
         print(f"{Colors.NEON_CYAN}[SCANNING]{Colors.END} Probing web server vulnerabilities...\n")
         
+        items = []
+        output_file.unlink(missing_ok=True)
         try:
-            subprocess.run(cmd, shell=True, timeout=300)
-            print(f"\n{Colors.cyber_success('Nikto scan complete')}")
-            print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
-        except:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
             print(f"{Colors.cyber_error('Nikto scan failed')}\n")
+            return items
+        
+        for line in follow(output_file, proc, timeout=300):
+            item = parse_nikto_line(line, url)
+            if item is None:
+                continue
+            items.append(item)
+            print(f"{Colors.NEON_ORANGE}[{item.severity}]{Colors.END} {item.path or '/'}: {item.message}")
+            self._report_nikto_item(item)
+        
+        print(f"\n{Colors.cyber_success('Nikto scan complete')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        return items
+    
+    def _report_nikto_item(self, item):
+        if self.report is None:
+            return
+        summary = item.message.split('. ')[0].rstrip('.')
+        self.report.add_finding(
+            title=summary if len(summary) <= 90 else summary[:87] + '...',
+            severity=item.severity,
+            affected_systems=item.url,
+            description=item.message,
+            impact="Reported by nikto - verify manually before relying on it.",
+            poc=f"nikto -h {item.url}\n{item.reference + ': ' if item.reference else ''}{item.method + ' ' if item.method else ''}{item.path or '/'}: {item.message}",
+            remediation="Review the web server configuration for the reported issue and apply vendor hardening guidance.",
+            cve=item.cve,
+            service='http'
+        )
+    
+    def fuzz(self, url, data=None, params=None, types=FUZZ_TYPES, dbms=None, tag=None, concurrency=20, rate_limit=None):
+        """Fire catalog payloads at URL/form parameters"""
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_exploit('PARAMETER FUZZING PROTOCOL')}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+        
+        parsed = urlparse(url)
+        endpoint = parsed._replace(query='', fragment='').geturl()
+        output_file = self.workspace.scans / f"fuzz_{parsed.netloc.replace(':', '_')}.jsonl"
+        fuzzer = Fuzzer(concurrency=concurrency, rate_limit=rate_limit)
+        
+        self.logger.log_command(f"fuzz {url}" + (f" -d {data}" if data else '') + f" -t {','.join(types)} -c {concurrency}", url)
+        
+        print(f"{Colors.NEON_CYAN}[FUZZING]{Colors.END} Injecting {', '.join(types)} payloads with a rolling latency baseline...\n")
+        
+        def _on_hit(hit):
+            print(f"{Colors.RED}[{hit.severity}]{Colors.END} {hit.title} {Colors.NEON_CYAN}{hit.param}{Colors.END} {Colors.GRAY}{hit.payload} -> {hit.evidence}{Colors.END}")
+            if self.report is not None:
+                self.report.add_finding(
+                    title=f"{hit.title} in parameter '{hit.param}'",
+                    severity=hit.severity,
+                    affected_systems=endpoint,
+                    description=f"The {hit.method} parameter '{hit.param}' of {endpoint} is vulnerable to {hit.title.lower()} ({hit.detection} detection).",
+                    impact="Attacker-controlled input reaches an interpreter unsanitised, allowing data theft or code execution depending on the sink.",
+                    poc=f"{hit.method} {hit.url}\nPayload: {hit.payload}\nEvidence: {hit.evidence}",
+                    remediation="Validate input against an allow-list and use parameterised queries, output encoding or safe APIs for the affected sink.",
+                    service='http'
+                )
+        
+        try:
+            hits = fuzzer.run(url, data, params=params, types=types, dbms=dbms, tag=tag,
+                              output_file=output_file, on_hit=_on_hit)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.cyber_error(f'Fuzzing failed: {e}')}\n")
+            return []
+        
+        stats = fuzzer.stats
+        print(f"\n{Colors.NEON_CYAN}[THROUGHPUT]{Colors.END} {Colors.NEON_GREEN}{stats['requests']} requests in {stats['elapsed']:.2f}s ({stats['rate']:.0f}/s){Colors.END} {Colors.GRAY}baseline={stats['baseline_mean'] * 1000:.0f}±{stats['baseline_stdev'] * 1000:.0f}ms timing-candidates={stats['timing_candidates']} repeats={stats['repeats']} errors={stats['errors']}{Colors.END}")
+        print(f"{Colors.cyber_success(f'Fuzzing complete - {len(hits)} injection hits')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        
+        return hits
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Wordlist index
+Memory-mapped wordlists with a cached line-offset index - random access without loading the list
+"""
+
+import hashlib
+import mmap
+import os
+import string
+import struct
+from array import array
+from itertools import accumulate, count
+from operator import add
+from pathlib import Path
+from utils.workspace import STATE_DIR
+
+INDEX_MAGIC = b'NRWLIDX1'
+SELECTION_MAGIC = b'NRWLSEL1'
+
+# magic, item width, source size, source mtime_ns, item count - padded to HEADER_SIZE
+HEADER = struct.Struct('<8sIQqQ')
+HEADER_SIZE = 64
+
+# Bytes split per pass while indexing
+CHUNK_SIZE = 16 * 1024 * 1024
+
+CHARSETS = {
+    'lower': string.ascii_lowercase.encode(),
+    'upper': string.ascii_uppercase.encode(),
+    'digits': string.digits.encode(),
+    'special': string.punctuation.encode(),
+    'space': b' ',
+    'alpha': string.ascii_letters.encode(),
+    'alnum': (string.ascii_letters + string.digits).encode(),
+    'printable': (string.ascii_letters + string.digits + string.punctuation + ' ').encode()
+}
+
+def charset_bytes(names):
+    """Allowed bytes for a comma separated list of CHARSETS names"""
+    names = names.split(',') if isinstance(names, str) else names
+    unknown = [name for name in names if name not in CHARSETS]
+    if unknown:
+        raise ValueError(f"unknown charset(s): {', '.join(unknown)} (choose from {', '.join(CHARSETS)})")
+    return b''.join(CHARSETS[name] for name in names)
+
+def _cache_dir():
+    return STATE_DIR / "wordlists"
+
+class Wordlist:
+    """A wordlist file, or a filtered/deduplicated/sharded view of one
+
+    Line numbers, offsets and selections live in arrays or mapped index files, never in per-line objects.
+    """
+
+    def __init__(self, path, index_dir=None):
+        self.path = Path(path)
+        self.index_dir = Path(index_dir) if index_dir else None
+        self.spec = ()
+        self._select = None         # None = every line, else a range or sequence of line numbers
+        self._maps = []             # mmaps this list owns
+
+        stat = os.stat(self.path)
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+        if stat.st_size:
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(self._mm)
+        else:
+            self._mm = b''
+        self._offsets = self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A view still exports part of the map - it goes away with the last reference
+                pass
+        self._maps = []
+
+    def _index_file(self):
+        if self.index_dir:
+            return self.index_dir / f"{self.path.name}.idx"
+        beside = self.path.with_name(self.path.name + '.idx')
+        if os.access(self.path.parent, os.W_OK):
+            return beside
+        key = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()[:16]
+        return _cache_dir() / f"{self.path.name}.{key}.idx"
+
+    def _load_index(self):
+        """Offsets of every line start plus a final sentinel - from the cache, or built once"""
+        index_file = self._index_file()
+        offsets = self._map_array(index_file, INDEX_MAGIC)
+        if offsets is not None:
+            return offsets
+
+        size = self._signature[0]
+        offsets = array('I' if size < 2 ** 32 - 1 else 'Q', [0])
+        pos = 0
+        while pos < size:
+            end = min(pos + CHUNK_SIZE, size)
+            if end < size:
+                newline = self._mm.rfind(b'\n', pos, end)
+                end = newline + 1 if newline >= 0 else (self._mm.find(b'\n', end) + 1 or size)
+            chunk = self._mm[pos:end]
+            lines = chunk.split(b'\n')
+            if chunk.endswith(b'\n'):
+                lines.pop()
+            # Start of line i+1 = chunk start + lengths of lines 0..i + i+1 newlines
+            offsets.extend(map(add, accumulate(map(len, lines)), count(pos + 1)))
+            pos = end
+
+        self._save_array(index_file, INDEX_MAGIC, offsets, len(offsets) - 1)
+        return offsets
+
+    def _map_array(self, path, magic):
+        """Zero-copy view of a cached array file, or None when it is missing or stale"""
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) < HEADER_SIZE:
+            mapped.close()
+            return None
+        found, width, size, mtime, items = HEADER.unpack_from(mapped)
+        total = items + 1 if magic == INDEX_MAGIC else items
+        if found != magic or (size, mtime) != self._signature or len(mapped) != HEADER_SIZE + total * width:
+            mapped.close()
+            return None
+        self._maps.append(mapped)
+        return memoryview(mapped)[HEADER_SIZE:].cast('I' if width == 4 else 'Q')
+
+    def _save_array(self, path, magic, values, items):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + '.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(HEADER.pack(magic, values.itemsize, *self._signature, items).ljust(HEADER_SIZE, b'\0'))
+                values.tofile(f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _line_numbers(self):
+        return range(len(self._offsets) - 1) if self._select is None else self._select
+
+    def _bounds(self, line):
+        start, end = self._offsets[line], self._offsets[line + 1] - 1
+        if end > start and self._mm[end - 1] == 13:
+            end -= 1
+        return start, end
+
+    def _raw(self, line):
+        start, end = self._bounds(line)
+        return self._mm[start:end]
+
+    def __len__(self):
+        return len(self._line_numbers())
+
+    def raw(self, i):
+        """Entry i as bytes"""
+        return self._raw(self._line_numbers()[i])
+
+    def __getitem__(self, i):
+        return self.raw(i).decode('utf-8', 'replace')
+
+    def __iter__(self):
+        for line in self._line_numbers():
+            yield self._raw(line).decode('utf-8', 'replace')
+
+    def _derive(self, step, select):
+        view = object.__new__(Wordlist)
+        view.__dict__.update(self.__dict__)
+        view.spec = self.spec + (step,)
+        view._select = select
+        view._maps = []     # the parent owns the maps
+        return view
+
+    def _cached_selection(self, step, build):
+        """Selection for a derived view - reused across runs while the file is unchanged"""
+        spec = self.spec + (step,)
+        key = hashlib.sha1(repr((str(self.path.resolve()), self._signature, spec)).encode()).hexdigest()[:20]
+        cache_file = _cache_dir() / f"{key}.sel"
+        select = self._map_array(cache_file, SELECTION_MAGIC)
+        if select is None:
+            select = build()
+            self._save_array(cache_file, SELECTION_MAGIC, select, len(select))
+        return self._derive(step, select)
+
+    def filter(self, min_length=None, max_length=None, charset=None):
+        """Entries whose byte length and characters fit - e.g. a password policy"""
+        allowed = charset_bytes(charset) if charset else None
+
+        def _build():
+            keep = array('I')
+            for line in self._line_numbers():
+                start, end = self._bounds(line)
+                length = end - start
+                if min_length is not None and length < min_length:
+                    continue
+                if max_length is not None and length > max_length:
+                    continue
+                if allowed is not None and self._mm[start:end].translate(None, allowed):
+                    continue
+                keep.append(line)
+            return keep
+
+        step = ('filter', min_length, max_length, ','.join(sorted(charset.split(','))) if charset else None)
+        return self._cached_selection(step, _build)
+
+    def unique(self):
+        """First occurrence of every entry, in file order"""
+        def _build():
+            total = len(self)
+            capacity = 1 << max(4, (2 * total).bit_length())
+            mask = capacity - 1
+            # Open addressing over line numbers + 1; collisions compare the mapped bytes
+            table = memoryview(bytearray(4 * capacity)).cast('I')
+            keep = array('I')
+            for line in self._line_numbers():
+                word = self._raw(line)
+                slot = hash(word) & mask
+                while True:
+                    stored = table[slot]
+                    if not stored:
+                        table[slot] = line + 1
+                        keep.append(line)
+                        break
+                    if self._raw(stored - 1) == word:
+                        break
+                    slot = (slot + 1) & mask
+            return keep
+
+        return self._cached_selection(('unique',), _build)
+
+    def shard(self, index, total):
+        """Contiguous slice index of total - disjoint across shards, together covering the list"""
+        if not 0 <= index < total:
+            raise ValueError(f"shard {index} outside 0..{total - 1}")
+        lines = self._line_numbers()
+        size = len(lines)
+        return self._derive(('shard', index, total), lines[index * size // total:(index + 1) * size // total])
+
+    def write(self, path):
+        """Write the entries of this view to a plain wordlist file"""
+        with open(path, 'wb') as f:
+            for line in self._line_numbers():
+                f.write(self._raw(line) + b'\n')
+        return path
+
+    def __repr__(self):
+        return f"Wordlist({str(self.path)!r}, {len(self)} entries)"
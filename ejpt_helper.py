@@ -5,7 +5,10 @@ Neural interface for security assessment operations
 """
 
 import argparse
+import shutil
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
 # Import modules
@@ -13,20 +16,83 @@ from utils.colors import Colors
 from utils.workspace import Workspace
 from utils.logger import EJPTLogger
 from core.scanner import Scanner
+from core.connect_scan import raise_fd_limit
+from core.scan_cache import ScanCache, DEFAULT_TTL
+from core.scan_index import ScanIndex
 from core.web_hunter import WebHunter
+from core.fuzzer import DEFAULT_TYPES as FUZZ_TYPES
 from core.exploit_gen import ExploitGenerator
 from core.report_gen import ReportGenerator
+from core.report_export import EXPORT_FORMATS, DEFAULT_FORMATS
+from core.cred_spray import CredentialSprayer, DEFAULT_ATTEMPTS
+from core.nmap_parser import parse_file
+from core.wordlist import Wordlist, CHARSETS
 
 class NetRunner:
-    def __init__(self):
-        self.workspace = Workspace()
+    def __init__(self, workspace_dir=None):
+        self.workspace = Workspace(workspace_dir)
         self.logger = EJPTLogger(self.workspace.root / "logs")
+        self._scan_index = None
         self.scanner = Scanner(self.workspace, self.logger)
-        self.web_hunter = WebHunter(self.workspace, self.logger)
-        self.exploit_gen = ExploitGenerator(self.workspace)
         self.report_gen = ReportGenerator(self.workspace, self.logger)
+        self.web_hunter = WebHunter(self.workspace, self.logger, report=self.report_gen)
+        self.exploit_gen = ExploitGenerator(self.workspace)
+
+    @property
+    def scan_index(self):
+        """Cross-workspace scan history - opened on first use, so payload listings never touch it"""
+        if self._scan_index is None:
+            self._scan_index = ScanIndex()
+            self._scan_index.add_workspace(self.workspace.root)
+        return self._scan_index
+
+    def load_wordlist(self, path, min_length=None, max_length=None, charset=None, dedup=False):
+        """Indexed wordlist view, filtered and deduplicated without loading it into memory"""
+        wordlist = Wordlist(path)
+        total = len(wordlist)
+        if dedup:
+            wordlist = wordlist.unique()
+        if min_length is not None or max_length is not None or charset:
+            wordlist = wordlist.filter(min_length, max_length, charset)
+        print(f"{Colors.NEON_CYAN}[WORDLIST]{Colors.END} {path} {Colors.NEON_GREEN}{len(wordlist)}/{total} entries{Colors.END}")
+        return wordlist
+
+    def spray_credentials(self, result, workers=16, lockout_attempts=DEFAULT_ATTEMPTS, delay=0.0, passwords=None):
+        """Try default credentials against every open service of a scan result"""
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}")
+        print(f"{Colors.cyber_exploit('DEFAULT CREDENTIAL SPRAY')}")
+        print(f"{Colors.NEON_PURPLE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.END}\n")
+
+        sprayer = CredentialSprayer(workers=workers, lockout_attempts=lockout_attempts, delay=delay, passwords=passwords)
+        targets = sprayer.targets(result)
+        if not targets:
+            print(f"{Colors.cyber_warning('No open services with a credential handler')}\n")
+            return []
+
+        for target in targets:
+            print(f"{Colors.NEON_CYAN}[TARGET]{Colors.END} {target.host}:{target.port} {Colors.GRAY}{target.service}{Colors.END}")
+        print()
 
-        def cyber_banner(self):
+        def _on_hit(hit):
+            note = f" {Colors.GRAY}({hit.note}){Colors.END}" if hit.note else ''
+            print(f"  {Colors.NEON_GREEN}►{Colors.END} {hit.host}:{hit.port} {Colors.NEON_CYAN}{hit.service}{Colors.END} {Colors.NEON_YELLOW}{hit.username or '<blank>'}{Colors.END} : {Colors.NEON_PINK}{hit.password or '<blank>'}{Colors.END}{note}")
+            self.report_gen.add_credential(f"{hit.host}:{hit.port}", hit.username, hit.password,
+                                           service=hit.service, notes=hit.note)
+
+        self.logger.log_command(f"spray {len(targets)} services -w {workers} --lockout-attempts {lockout_attempts}", 'credentials')
+        output_file = self.workspace.loot / "credentials.jsonl"
+        hits = sprayer.run(targets, output_file, on_hit=_on_hit)
+
+        for (host, port, service), reason in sprayer.skipped.items():
+            print(f"{Colors.GRAY}[SKIPPED] {host}:{port} {service} - {reason}{Colors.END}")
+
+        stats = sprayer.stats
+        print(f"\n{Colors.NEON_CYAN}[THROUGHPUT]{Colors.END} {Colors.NEON_GREEN}{stats['attempts']} attempts in {stats['elapsed']:.2f}s ({stats['rate']:.0f}/s){Colors.END} {Colors.GRAY}connections={stats['connections']} paced={stats['paced']:.0f}s locked={stats['locked']} errors={stats['errors']}{Colors.END}")
+        print(f"{Colors.cyber_success(f'Credential spray complete - {len(hits)} valid logins')}")
+        print(f"{Colors.NEON_CYAN}[OUTPUT]{Colors.END} {Colors.NEON_GREEN}{output_file}{Colors.END}\n")
+        return hits
+
+    def cyber_banner(self):
         """Display cyberpunk-themed banner - Night City Edition"""
         banner = f"""
 {Colors.NEON_PINK}    ╔═══════════════════════════════════════════════════════════════════════╗{Colors.END}
@@ -73,47 +139,195 @@ def main():
 NEURAL INTERFACE COMMANDS:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   -t, --target          Designate target node for scanning
+  --workspace           Reuse a workspace - findings accumulate across runs
   --quick               Execute rapid reconnaissance protocol
   --full                Deploy comprehensive scan matrix
+  --sweep               Split targets into parallel per-host scans
+  --workers             Parallel scan worker cap for sweeps
+  --pipeline            Pipelined discovery -> service scan for --full
+  --cache               Serve repeat scans from the persistent result cache
+  --cache-ttl           Seconds before a cached host result expires
+  --incremental         Rescan only hosts whose cache entries expired
+  --backend             Quick scan engine: nmap or native connect
+  --resume              Continue an interrupted scan from its -oN log
+  --history             Port history of a host across all workspaces
+  --new-since           Ports first seen open in the last N days
+  --diff                Ports opened/closed between two runs from --history
+  --index-dir           Add existing workspaces to the scan history
   --web                 Initialize web application analysis
+  --dir-enum            Brute-force directories with --web
+  --nikto               Nikto web server scan with --web
+  --crawl               Crawl the application with --web
+  --max-pages           Page budget for a crawl
+  --fuzz                Fuzz URL/form parameters with --web
+  --data                Form body to fuzz (switches to POST)
+  --params              Only fuzz these parameters
+  --wordlist            Wordlist for directory enumeration
+  --extensions          Extensions tried for every word
+  --concurrency         Concurrent requests per host
+  --rate-limit          Requests per second cap per host
+  --dir-engine          Directory engine: native or gobuster
+  --loot-max-size       Per-file cap on downloaded loot (MB)
   --shell               Generate reverse neural link payload
   --sqli                Load SQL injection exploit database
   --xss                 Access XSS payload archives
   --lfi                 Retrieve file inclusion vectors
+  --dbms                Filter --sqli by database engine
+  --tag                 Filter payloads by tag
+  --mutate              Generate encoded/mutated payload variants
+  --mutate-depth        Encodings stacked per variant
   --creds               Query default credential matrix
+  --spray               Try default credentials on scanned services
+  --lockout-attempts    Guesses per account per 5 minutes
+  --spray-delay         Seconds between guesses per service
+  --passlist            Password wordlist sprayed after the defaults
+  --min-length          Drop wordlist entries shorter than this
+  --max-length          Drop wordlist entries longer than this
+  --charset             Keep entries built only from these classes
+  --dedup               Drop repeated wordlist entries
   --report              Compile security assessment dossier
+  --formats             Report outputs: md, html, csv, json, jsonl
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 {Colors.END}'''
     )
 
     parser.add_argument('-t', '--target', help='Target IP or network designation')
+    parser.add_argument('--workspace', help='Reuse this workspace directory, so findings accumulate across runs (default: new ejpt_workspace_<timestamp>)')
     parser.add_argument('--quick', action='store_true', help='Rapid scan protocol')
     parser.add_argument('--full', action='store_true', help='Deep scan protocol')
-    parser.add_argument('--web', help='Web application analysis target')
+    parser.add_argument('--sweep', action='store_true', help='Parallel per-host sweep of a target list or CIDR')
+    parser.add_argument('--workers', type=int, default=8, help='Maximum parallel scan workers (default: 8)')
+    parser.add_argument('--pipeline', action='store_true', help='Run --full as discovery followed by targeted service scans')
+    parser.add_argument('--cache', action='store_true', help='Reuse cached scan results for repeat targets')
+    parser.add_argument('--cache-ttl', type=int, default=DEFAULT_TTL, help='Cache entry lifetime in seconds (default: 86400)')
+    parser.add_argument('--incremental', action='store_true', help='With --cache, rescan only expired hosts')
+    parser.add_argument('--backend', choices=['nmap', 'connect'], default='nmap', help='Quick scan engine (default: nmap)')
+    parser.add_argument('--resume', help='Resume an interrupted scan from its workspace .txt log')
+    parser.add_argument('--history', help='Show scan history for a host across all workspaces')
+    parser.add_argument('--new-since', type=float, metavar='DAYS', help='List ports first seen open in the last N days')
+    parser.add_argument('--diff', nargs=2, type=int, metavar=('OLD_RUN', 'NEW_RUN'), help='Ports opened and closed between two indexed runs (run numbers from --history)')
+    parser.add_argument('--index-dir', metavar='DIR', help='Add the workspace DIR, or every ejpt_workspace_* in it, to the scan history')
+    parser.add_argument('--web', help='Web application analysis target(s), comma separated')
+    parser.add_argument('--dir-enum', action='store_true', help='With --web, brute-force directories and files')
+    parser.add_argument('--nikto', action='store_true', help='With --web, run a nikto web server scan')
+    parser.add_argument('--crawl', action='store_true', help='With --web, crawl the application from robots.txt and sitemap.xml')
+    parser.add_argument('--fuzz', action='store_true', help='With --web, inject catalog payloads into URL/form parameters')
+    parser.add_argument('--data', help='With --fuzz, form body to send and fuzz (e.g. "user=a&pass=b"), implies POST')
+    parser.add_argument('--params', help='With --fuzz, comma separated parameter names to fuzz (default: all)')
+    parser.add_argument('--max-pages', type=int, default=10000, help='Page budget for --crawl (default: 10000)')
+    parser.add_argument('--wordlist', default='/usr/share/wordlists/dirb/common.txt', help='Wordlist for --dir-enum')
+    parser.add_argument('--extensions', default='php,html,txt', help='Extensions tried per word (default: php,html,txt)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent requests per host for --dir-enum and --fuzz (default: 50)')
+    parser.add_argument('--rate-limit', type=float, help='Maximum requests per second per host for --dir-enum, --crawl and --fuzz')
+    parser.add_argument('--loot-max-size', type=float, default=50, metavar='MB', help='Largest loot download kept per file, in MB (default: 50)')
+    parser.add_argument('--dir-engine', choices=['native', 'gobuster'], default='native', help='Directory enumeration engine (default: native)')
     parser.add_argument('--shell', help='Reverse shell generator (LHOST:LPORT:TYPE)')
     parser.add_argument('--sqli', action='store_true', help='SQL injection payloads')
     parser.add_argument('--xss', action='store_true', help='XSS payload database')
     parser.add_argument('--lfi', action='store_true', help='File inclusion vectors')
+    parser.add_argument('--dbms', choices=['mysql', 'mssql', 'postgresql', 'oracle', 'sqlite', 'generic'], help='With --sqli, only payloads for one database engine')
+    parser.add_argument('--tag', help='With --sqli/--xss/--lfi, only payloads carrying a tag (e.g. time, union, cookie, wrapper)')
+    parser.add_argument('--mutate', nargs='?', const='default', metavar='TRANSFORMS', help='With --sqli/--xss/--lfi, stream encoded/mutated variants (e.g. case,comment,url,double_url)')
+    parser.add_argument('--mutate-depth', type=int, default=1, help='Maximum stacked encodings per variant (default: 1)')
     parser.add_argument('--creds', help='Default credentials lookup')
+    parser.add_argument('--spray', nargs='?', const='scan', metavar='NMAP_XML', help='Spray default credentials at the services of this scan (with --quick/--full/--sweep) or of a saved nmap XML file')
+    parser.add_argument('--lockout-attempts', type=int, default=DEFAULT_ATTEMPTS, help='Guesses per account per 5 minutes before --spray waits (default: 5, 0 = no limit)')
+    parser.add_argument('--spray-delay', type=float, default=0.0, help='Seconds between --spray guesses against one service (default: 0)')
+    parser.add_argument('--passlist', help='With --spray, password wordlist tried for every default username')
+    parser.add_argument('--min-length', type=int, help='Skip --wordlist/--passlist entries shorter than this (bytes)')
+    parser.add_argument('--max-length', type=int, help='Skip --wordlist/--passlist entries longer than this (bytes)')
+    parser.add_argument('--charset', help=f"Keep --wordlist/--passlist entries made only of these classes, comma separated ({', '.join(CHARSETS)})")
+    parser.add_argument('--dedup', action='store_true', help='Drop repeated --wordlist/--passlist entries')
     parser.add_argument('--report', action='store_true', help='Generate assessment report')
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS), help=f"With --report, comma separated outputs written in one pass ({', '.join(EXPORT_FORMATS)}; default: {','.join(DEFAULT_FORMATS)})")
 
     args = parser.parse_args()
 
-    netrunner = NetRunner()
+    netrunner = NetRunner(args.workspace)
     netrunner.cyber_banner()
 
+    netrunner.scanner.backend = args.backend
+    if args.quick and (args.backend == 'connect' or not shutil.which('nmap')):
+        # The native backend keeps thousands of sockets open at once
+        raise_fd_limit()
+    netrunner.web_hunter.loot.max_bytes = int(args.loot_max_size * 1024 * 1024)
+    if args.cache or args.incremental:
+        netrunner.scanner.cache = ScanCache(ttl=args.cache_ttl, incremental=args.incremental)
+
+    filters = dict(min_length=args.min_length, max_length=args.max_length, charset=args.charset, dedup=args.dedup)
+    result = None
     try:
-        if args.quick and args.target:
+        passwords = netrunner.load_wordlist(args.passlist, **filters) if args.spray and args.passlist else None
+
+        if args.index_dir:
+            roots = netrunner.scan_index.discover(args.index_dir)
+            indexed = netrunner.scan_index.refresh()
+            print(f"\n{Colors.NEON_PURPLE}[HISTORY]{Colors.END} {Colors.NEON_GREEN}{len(roots)} workspaces recorded, {indexed} scan files indexed{Colors.END}")
+
+        scanning = args.resume or ((args.sweep or args.quick or args.full) and args.target)
+        if scanning:
+            # New scans land in the cross-workspace history as they finish
+            netrunner.scanner.index = netrunner.scan_index
+
+        if args.spray == 'scan' and not scanning:
+            print(f"\n{Colors.cyber_error('--spray needs --quick/--full/--sweep with -t TARGET, or a saved nmap XML file')}")
+
+        elif args.resume:
+            print(f"\n{Colors.NEON_PURPLE}[SCANNING]{Colors.END} Reattaching to interrupted scan...")
+            result = netrunner.scanner.resume_scan(args.resume)
+            if result:
+                netrunner.report_gen.add_scan_result(result)
+
+        elif args.sweep and args.target:
+            scan_type = 'full' if args.full else 'quick'
+            print(f"\n{Colors.NEON_PURPLE}[SCANNING]{Colors.END} Initiating parallel sweep matrix...")
+            result = netrunner.scanner.sweep(args.target, scan_type, args.workers)
+            if result:
+                netrunner.report_gen.add_scan_result(result)
+
+        elif args.quick and args.target:
             print(f"\n{Colors.NEON_PURPLE}[SCANNING]{Colors.END} Initiating rapid reconnaissance protocol...")
-            netrunner.scanner.quick_scan(args.target)
+            result = netrunner.scanner.quick_scan(args.target)
+            if result:
+                netrunner.report_gen.add_scan_result(result)
 
         elif args.full and args.target:
             print(f"\n{Colors.NEON_PURPLE}[SCANNING]{Colors.END} Deploying comprehensive scan matrix...")
-            netrunner.scanner.full_scan(args.target)
+            result = netrunner.scanner.full_scan(args.target, pipelined=args.pipeline, workers=args.workers)
+            if result:
+                netrunner.report_gen.add_scan_result(result)
 
         elif args.web:
             print(f"\n{Colors.NEON_PURPLE}[WEB ANALYSIS]{Colors.END} Probing web application infrastructure...")
-            netrunner.web_hunter.quick_check(args.web)
+            urls = args.web.replace(',', ' ').split()
+            if args.dir_enum:
+                extensions = [e for e in args.extensions.split(',') if e]
+                wordlist = args.wordlist
+                if any(filters.values()):
+                    wordlist = netrunner.load_wordlist(args.wordlist, **filters)
+                for url in urls:
+                    netrunner.web_hunter.directory_enum(
+                        url, wordlist, engine=args.dir_engine, extensions=extensions,
+                        concurrency=args.concurrency, rate_limit=args.rate_limit
+                    )
+            elif args.nikto:
+                for url in urls:
+                    netrunner.web_hunter.nikto_scan(url)
+            elif args.fuzz:
+                types = [t for t, wanted in (('sqli', args.sqli), ('xss', args.xss), ('lfi', args.lfi)) if wanted]
+                params = [p for p in args.params.split(',') if p] if args.params else None
+                for url in urls:
+                    netrunner.web_hunter.fuzz(
+                        url, args.data, params=params, types=types or FUZZ_TYPES, dbms=args.dbms, tag=args.tag,
+                        concurrency=args.concurrency, rate_limit=args.rate_limit
+                    )
+            elif args.crawl:
+                for url in urls:
+                    netrunner.web_hunter.crawl(url, args.max_pages, rate_limit=args.rate_limit)
+            elif len(urls) > 1:
+                netrunner.web_hunter.quick_check_many(urls)
+            else:
+                netrunner.web_hunter.quick_check(urls[0])
 
         elif args.shell:
             parts = args.shell.split(':')
@@ -123,29 +337,27 @@ NEURAL INTERFACE COMMANDS:
             print(f"\n{Colors.NEON_PURPLE}[PAYLOAD GEN]{Colors.END} Compiling reverse neural link...")
             netrunner.exploit_gen.reverse_shell(lhost, lport, shell_type)
 
+        elif args.mutate and (args.sqli or args.xss or args.lfi):
+            payload_type = 'sqli' if args.sqli else 'xss' if args.xss else 'lfi'
+            transforms = None if args.mutate == 'default' else [t for t in args.mutate.split(',') if t]
+            print(f"\n{Colors.NEON_PURPLE}[DATABASE]{Colors.END} Compiling payload variants...")
+            netrunner.exploit_gen.payload_variants(payload_type, transforms, args.mutate_depth, dbms=args.dbms, tag=args.tag)
+
         elif args.sqli:
             print(f"\n{Colors.NEON_PURPLE}[DATABASE]{Colors.END} Loading SQL injection exploit vectors...")
-            netrunner.exploit_gen.sqli_payloads()
+            netrunner.exploit_gen.sqli_payloads(dbms=args.dbms, tag=args.tag)
 
         elif args.xss:
             print(f"\n{Colors.NEON_PURPLE}[DATABASE]{Colors.END} Accessing XSS payload archives...")
-            import json
-            with open('data/payloads.json') as f:
-                payloads = json.load(f)
-            for category, payload_list in payloads['xss'].items():
-                print(f"\n{Colors.NEON_CYAN}[{category.upper()}]{Colors.END}")
-                for p in payload_list:
-                    print(f"  {Colors.NEON_GREEN}>{Colors.END} {p}")
+            netrunner.exploit_gen.xss_payloads(tag=args.tag)
 
         elif args.lfi:
             print(f"\n{Colors.NEON_PURPLE}[DATABASE]{Colors.END} Retrieving file inclusion vectors...")
-            import json
-            with open('data/payloads.json') as f:
-                payloads = json.load(f)
-            for category, payload_list in payloads['lfi'].items():
-                print(f"\n{Colors.NEON_CYAN}[{category.upper()}]{Colors.END}")
-                for p in payload_list:
-                    print(f"  {Colors.NEON_GREEN}>{Colors.END} {p}")
+            netrunner.exploit_gen.lfi_payloads(tag=args.tag)
+
+        elif args.spray and args.spray != 'scan':
+            print(f"\n{Colors.NEON_PURPLE}[CREDENTIAL DB]{Colors.END} Loading services from {args.spray}...")
+            netrunner.spray_credentials(parse_file(args.spray), args.workers, args.lockout_attempts, args.spray_delay, passwords)
 
         elif args.creds:
             print(f"\n{Colors.NEON_PURPLE}[CREDENTIAL DB]{Colors.END} Querying authentication matrix...")
@@ -162,13 +374,63 @@ NEURAL INTERFACE COMMANDS:
                 print(f"{Colors.cyber_error('Unknown service protocol')}")
                 print(f"  Available: {Colors.NEON_CYAN}{', '.join(all_creds.keys())}{Colors.END}")
 
+        elif args.history:
+            print(f"\n{Colors.NEON_PURPLE}[HISTORY]{Colors.END} Indexing workspace archives...")
+            netrunner.scan_index.refresh()
+            rows = netrunner.scan_index.host_history(args.history)
+            if not rows:
+                print(f"{Colors.cyber_error('No recorded scans for this host')}")
+            last_run = None
+            for row in rows:
+                if row['run_id'] != last_run:
+                    stamp = datetime.fromtimestamp(row['scanned_at']).strftime('%Y-%m-%d %H:%M')
+                    print(f"\n{Colors.NEON_CYAN}[{stamp}]{Colors.END} {Colors.GRAY}run #{row['run_id']} {row['workspace']} ({row['scan_type']}){Colors.END}")
+                    last_run = row['run_id']
+                state_color = Colors.NEON_GREEN if row['state'] == 'open' else Colors.GRAY
+                banner = ' '.join(filter(None, [row['product'], row['version']]))
+                print(f"  {state_color}►{Colors.END} {row['port']}/{row['protocol']} {state_color}{row['state']}{Colors.END} {Colors.NEON_CYAN}{row['service']}{Colors.END} {Colors.GRAY}{banner}{Colors.END}")
+
+        elif args.new_since is not None:
+            print(f"\n{Colors.NEON_PURPLE}[HISTORY]{Colors.END} Indexing workspace archives...")
+            netrunner.scan_index.refresh()
+            since = time.time() - args.new_since * 86400
+            rows = netrunner.scan_index.new_ports(since)
+            print(f"\n{Colors.NEON_CYAN}[NEW PORTS]{Colors.END} {Colors.NEON_GREEN}{len(rows)} first seen in the last {args.new_since:g} days{Colors.END}\n")
+            for row in rows:
+                stamp = datetime.fromtimestamp(row['first_seen']).strftime('%Y-%m-%d %H:%M')
+                print(f"  {Colors.NEON_GREEN}►{Colors.END} {row['host']:<16} {row['port']}/{row['protocol']} {Colors.NEON_CYAN}{row['service']}{Colors.END} {Colors.GRAY}{stamp}{Colors.END}")
+
+        elif args.diff:
+            old_run, new_run = args.diff
+            print(f"\n{Colors.NEON_PURPLE}[HISTORY]{Colors.END} Comparing run #{old_run} against run #{new_run}...")
+            known = {run['id'] for run in netrunner.scan_index.runs()}
+            missing = [str(run) for run in args.diff if run not in known]
+            if missing:
+                print(f"{Colors.cyber_error(f'Unknown run #{missing[0]} - see --history for run numbers')}")
+            else:
+                changes = netrunner.scan_index.diff_runs(old_run, new_run)
+                for label, color in (('new_hosts', Colors.NEON_GREEN), ('missing_hosts', Colors.RED)):
+                    if changes[label]:
+                        print(f"\n{Colors.NEON_CYAN}[{label.replace('_', ' ').upper()}]{Colors.END} {color}{', '.join(host.address for host in changes[label])}{Colors.END}")
+                for label, color in (('opened', Colors.NEON_GREEN), ('closed', Colors.RED)):
+                    print(f"\n{Colors.NEON_CYAN}[{label.upper()}]{Colors.END} {color}{len(changes[label])} ports{Colors.END}")
+                    for address, port in changes[label]:
+                        print(f"  {color}►{Colors.END} {address:<16} {port.number}/{port.protocol} {Colors.NEON_CYAN}{port.service.name}{Colors.END}")
+                if changes['changed']:
+                    print(f"\n{Colors.NEON_CYAN}[CHANGED]{Colors.END} {Colors.NEON_YELLOW}{len(changes['changed'])} services{Colors.END}")
+                    for address, before, port in changes['changed']:
+                        print(f"  {Colors.NEON_YELLOW}►{Colors.END} {address:<16} {port.number}/{port.protocol} {Colors.GRAY}{before.service.name} {before.service.banner} ->{Colors.END} {Colors.NEON_CYAN}{port.service.name} {port.service.banner}{Colors.END}")
+
         elif args.report:
             print(f"\n{Colors.NEON_PURPLE}[REPORT GEN]{Colors.END} Compiling security assessment dossier...")
-            netrunner.report_gen.generate_full_report()
+            netrunner.report_gen.generate_full_report(formats=[f for f in args.formats.split(',') if f])
 
-        else:
+        elif not args.index_dir:
             parser.print_help()
 
+        if args.spray == 'scan' and result:
+            netrunner.spray_credentials(result, args.workers, args.lockout_attempts, args.spray_delay, passwords)
+
     except KeyboardInterrupt:
         print(f"\n\n{Colors.NEON_PINK}[INTERRUPT]{Colors.END} Neural link severed by operator")
         sys.exit(0)
@@ -4,6 +4,9 @@
 from pathlib import Path
 from datetime import datetime
 
+# Engagement state that outlives individual workspaces (caches, indexes)
+STATE_DIR = Path.home() / ".netrunner"
+
 class Workspace:
     def __init__(self, base_dir=None):
         if base_dir:
@@ -26,9 +29,10 @@ class Workspace:
                          self.screenshots, self.loot, self.reports]:
             directory.mkdir(exist_ok=True, parents=True)
 
-    def get_scan_file(self, target, scan_type="nmap"):
+    def get_scan_file(self, target, scan_type="nmap", ext="txt"):
         """Get path for scan output file"""
-        filename = f"{scan_type}_{target.replace('.', '_')}.txt"
+        safe_target = target.replace('.', '_').replace('/', '_').replace(':', '_')
+        filename = f"{scan_type}_{safe_target}.{ext}"
         return self.scans / filename
 
     def get_exploit_file(self, exploit_name):